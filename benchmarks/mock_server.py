@@ -0,0 +1,356 @@
+"""
+Offline stand-in for codeforces.com.
+
+Serves synthetic API payloads (contest.list, contest.standings,
+contest.status, contest.ratingChanges, user.status, user.info,
+user.rating, user.ratedList, problemset.problems) plus the login, submit and
+statement pages that cfcli scrapes. Latency and the API call limit are
+configurable, and request/byte counters are exposed at /__stats.
+
+Point cfcli at it with CFCLI_BASE_URL=http://127.0.0.1:<port>/
+
+Usage: python benchmarks/mock_server.py [--port 8000] [--latency 0.05] [--rate 0]
+"""
+import json
+import time
+import zlib
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+CONTEST_COUNT = 2000
+STATUS_ROWS = 120000
+STANDINGS_ROWS = 30000
+HANDLES = 5000
+PROBLEM_INDEXES = ["A", "B", "C", "D", "E", "F", "G", "H", "I", "J"]
+VERDICTS = ["OK", "OK", "OK", "WRONG_ANSWER", "WRONG_ANSWER", "TIME_LIMIT_EXCEEDED",
+            "RUNTIME_ERROR", "MEMORY_LIMIT_EXCEEDED", "COMPILATION_ERROR"]
+LANGUAGES = ["GNU C++17", "GNU C++20 (64)", "PyPy 3", "Python 3", "Java 21", "Rust 2021"]
+TAGS = ["dp", "greedy", "graphs", "math", "implementation", "strings", "trees",
+        "binary search", "constructive algorithms", "data structures"]
+CSRF_TOKEN = "0123456789abcdef0123456789abcdef"
+
+
+def contest(contest_id, now):
+    """Synthetic contest: the newest ten are upcoming, the next one is running"""
+    rank = CONTEST_COUNT - contest_id
+    if rank < 10:
+        phase, start = "BEFORE", now + (10 - rank) * 86400
+    elif rank == 10:
+        phase, start = "CODING", now - 1800
+    else:
+        phase, start = "FINISHED", now - rank * 3 * 86400
+    division = ["Div. 1", "Div. 2", "Div. 3", "Div. 4", "Div. 1 + Div. 2"][contest_id % 5]
+    return {
+        "id": contest_id,
+        "name": f"Codeforces Round {contest_id} ({division})",
+        "type": "CF",
+        "phase": phase,
+        "frozen": False,
+        "durationSeconds": 7200,
+        "startTimeSeconds": start,
+        "relativeTimeSeconds": now - start
+    }
+
+
+def problem(contest_id, index):
+    rng = random.Random(contest_id * 100 + PROBLEM_INDEXES.index(index))
+    return {
+        "contestId": contest_id,
+        "index": index,
+        "name": f"Problem {contest_id}{index}",
+        "type": "PROGRAMMING",
+        "points": 500.0 * (PROBLEM_INDEXES.index(index) + 1),
+        "rating": 800 + 200 * PROBLEM_INDEXES.index(index),
+        "tags": rng.sample(TAGS, 2)
+    }
+
+
+def rating(handle):
+    return 1200 + zlib.crc32(handle.encode("utf-8")) % 1500
+
+
+def submission(contest_id, position):
+    """The submission at a position of contest.status (0 is the newest)"""
+    rng = random.Random(contest_id * 1000003 + position)
+    index = PROBLEM_INDEXES[position % 6]
+    handle = f"user{position % HANDLES}"
+    return {
+        "id": 200000000 + STATUS_ROWS - position,
+        "contestId": contest_id,
+        "creationTimeSeconds": 1700000000 + STATUS_ROWS - position,
+        "relativeTimeSeconds": (STATUS_ROWS - position) % 7200,
+        "problem": problem(contest_id, index),
+        "author": {"contestId": contest_id, "members": [{"handle": handle}],
+                   "participantType": "CONTESTANT", "ghost": False},
+        "programmingLanguage": rng.choice(LANGUAGES),
+        "verdict": rng.choice(VERDICTS),
+        "testset": "TESTS",
+        "passedTestCount": rng.randint(0, 60),
+        "timeConsumedMillis": rng.randint(15, 2000),
+        "memoryConsumedBytes": rng.randint(1, 256) * 1024 * 1024
+    }
+
+
+def standings_row(contest_id, rank, problem_count):
+    rng = random.Random(contest_id * 7919 + rank)
+    solved = max(0, problem_count - rank * problem_count // STANDINGS_ROWS - rng.randint(0, 1))
+    return {
+        "party": {"contestId": contest_id, "members": [{"handle": f"user{rank % HANDLES}"}],
+                  "participantType": "CONTESTANT", "ghost": False},
+        "rank": rank,
+        "points": float(solved * 1000 - rank % 500),
+        "penalty": 0,
+        "successfulHackCount": 0,
+        "unsuccessfulHackCount": 0,
+        "problemResults": [
+            {"points": 500.0 * (i + 1) if i < solved else 0.0, "rejectedAttemptCount": rng.randint(0, 2),
+             "type": "FINAL", "bestSubmissionTimeSeconds": 600 * (i + 1)}
+            for i in range(problem_count)
+        ]
+    }
+
+
+class MockState:
+    def __init__(self, latency, rate):
+        self.latency = latency
+        self.rate = rate
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.api_requests = 0
+        self.bytes_sent = 0
+        self.limited = 0
+        self.last_api_call = 0.0
+        self.next_submission = 300000000
+
+    def reset(self):
+        with self.lock:
+            self.requests = self.api_requests = self.bytes_sent = self.limited = 0
+
+    def snapshot(self):
+        with self.lock:
+            return {"requests": self.requests, "api_requests": self.api_requests,
+                    "bytes": self.bytes_sent, "limited": self.limited}
+
+    def allow_api_call(self):
+        """Emulate the per-client API call limit"""
+        if not self.rate:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            if now - self.last_api_call < 1.0 / self.rate:
+                self.limited += 1
+                return False
+            self.last_api_call = now
+            return True
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: MockState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/json", headers=None):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        with self.state.lock:
+            self.state.bytes_sent += len(body)
+
+    def _send_json(self, payload, status=200):
+        self._send(status, json.dumps(payload, separators=(",", ":")))
+
+    def _count(self):
+        with self.state.lock:
+            self.state.requests += 1
+        if self.state.latency:
+            time.sleep(self.state.latency)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if url.path == "/__stats":
+            return self._send_json(self.state.snapshot())
+        if url.path == "/__reset":
+            self.state.reset()
+            return self._send_json({"status": "OK"})
+
+        self._count()
+        if url.path.startswith("/api/"):
+            return self._api(url.path[len("/api/"):], query)
+
+        parts = url.path.strip("/").split("/")
+        if parts == ["enter"]:
+            return self._send(200, f'<meta name="X-Csrf-Token" content="{CSRF_TOKEN}"/>', "text/html")
+        if len(parts) == 3 and parts[0] == "contest" and parts[2] == "submit":
+            return self._send(200, f'<meta name="X-Csrf-Token" content="{CSRF_TOKEN}"/>', "text/html")
+        if len(parts) == 3 and parts[0] == "contest" and parts[2] == "my":
+            return self._send(200, f'<tr data-submission-id="{self.state.next_submission}" '
+                                   f'submissionId="{self.state.next_submission}"></tr>', "text/html")
+        if len(parts) == 4 and parts[0] == "contest" and parts[2] == "problem":
+            return self._send(200, self._statement(int(parts[1]), parts[3]), "text/html")
+        if parts == ["data", "submitSource"]:
+            return self._send_json({"verdict": "OK", "timeConsumedMillis": 46,
+                                    "memoryConsumedBytes": 102400, "testCount": 12, "passedTestCount": 12})
+        self._send(404, "Not found", "text/plain")
+
+    def do_POST(self):
+        self._count()
+        length = int(self.headers.get("Content-Length", 0))
+        form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode("utf-8")).items()}
+        parts = urlparse(self.path).path.strip("/").split("/")
+
+        if form.get("csrf_token") != CSRF_TOKEN:
+            return self._send(403, "Invalid CSRF token", "text/plain")
+        if parts == ["enter"]:
+            return self._send(200, '<a href="/logout">Logout</a>', "text/html",
+                              {"Set-Cookie": "JSESSIONID=mock-session; Path=/; HttpOnly"})
+        if len(parts) == 3 and parts[0] == "contest" and parts[2] == "submit":
+            with self.state.lock:
+                self.state.next_submission += 1
+            return self._send(302, "", "text/html", {"Location": f"/contest/{parts[1]}/my"})
+        self._send(404, "Not found", "text/plain")
+
+    def _statement(self, contest_id, index):
+        tests = "".join(
+            f'<div class="input"><pre>{n} {n + 1}\n</pre></div><div class="output"><pre>{2 * n + 1}\n</pre></div>'
+            for n in range(1, 4)
+        )
+        return (f'<div class="problem-statement"><div class="title">{index}. Problem {contest_id}{index}</div>'
+                f'<div class="time-limit">time limit per test2 seconds</div>'
+                f'<div class="memory-limit">memory limit per test256 megabytes</div>'
+                f'<div class="sample-test">{tests}</div></div>')
+
+    def _api(self, method, query):
+        with self.state.lock:
+            self.state.api_requests += 1
+        if not self.state.allow_api_call():
+            return self._send_json({"status": "FAILED", "comment": "Call limit exceeded"}, 503)
+
+        now = int(time.time())
+        if method == "contest.list":
+            return self._send_json({"status": "OK", "result": [
+                contest(contest_id, now) for contest_id in range(CONTEST_COUNT, 0, -1)
+            ]})
+
+        if method == "contest.standings":
+            contest_id = int(query.get("contestId", 1))
+            problem_count = 6 if contest_id % 5 != 4 else 9
+            first = int(query.get("from", 1))
+            count = int(query.get("count", STANDINGS_ROWS))
+            handles = set(query["handles"].split(";")) if query.get("handles") else None
+            ranks = range(first, min(STANDINGS_ROWS, first + count - 1) + 1)
+            rows = [standings_row(contest_id, rank, problem_count) for rank in ranks]
+            if handles:
+                rows = [r for r in rows if r["party"]["members"][0]["handle"] in handles]
+            return self._send_json({"status": "OK", "result": {
+                "contest": contest(contest_id, now),
+                "problems": [problem(contest_id, i) for i in PROBLEM_INDEXES[:problem_count]],
+                "rows": rows
+            }})
+
+        if method in ("contest.status", "user.status"):
+            contest_id = int(query.get("contestId", 1))
+            first = int(query.get("from", 1)) - 1
+            count = int(query.get("count", STATUS_ROWS))
+            handle = query.get("handle")
+            if handle:
+                # Handles are assigned round-robin, so their rows are easy to locate
+                offset = int(handle[4:]) % HANDLES if handle.startswith("user") else 0
+                positions = range(offset, STATUS_ROWS, HANDLES)[first:first + count]
+            else:
+                positions = range(first, min(STATUS_ROWS, first + count))
+            return self._send_json({"status": "OK", "result": [
+                submission(contest_id, position) for position in positions
+            ]})
+
+        if method == "problemset.problems":
+            problems, statistics = [], []
+            for contest_id in range(CONTEST_COUNT - 10, 0, -1):
+                for index in PROBLEM_INDEXES[:6 if contest_id % 5 != 4 else 9]:
+                    problems.append(problem(contest_id, index))
+                    statistics.append({"contestId": contest_id, "index": index,
+                                       "solvedCount": zlib.crc32(f"{contest_id}{index}".encode()) % 40000})
+            return self._send_json({"status": "OK", "result": {"problems": problems, "problemStatistics": statistics}})
+
+        if method == "user.info":
+            handles = query.get("handles", "").split(";")
+            unknown = next((h for h in handles if h.startswith("missing")), None)
+            if unknown:
+                return self._send_json({"status": "FAILED", "comment": f"handles: User with handle {unknown} not found"}, 400)
+            return self._send_json({"status": "OK", "result": [
+                {"handle": h, "rating": rating(h), "maxRating": 2800,
+                 "rank": "expert", "lastOnlineTimeSeconds": now - 3600} for h in handles if h
+            ]})
+
+        if method == "user.rating":
+            handle = query.get("handle", "")
+            count = 1 + zlib.crc32(handle.encode("utf-8")) % 50
+            history = [rating(handle) - 5 * (count - i) for i in range(count + 1)]
+            return self._send_json({"status": "OK", "result": [
+                {"contestId": CONTEST_COUNT - 11 - 3 * (count - i), "handle": handle, "rank": 1000,
+                 "ratingUpdateTimeSeconds": now - (count - i + 1) * 7 * 86400,
+                 "oldRating": history[i], "newRating": history[i + 1]} for i in range(count)
+            ]})
+
+        if method == "user.ratedList":
+            return self._send_json({"status": "OK", "result": [
+                {"handle": f"user{i}", "rating": rating(f"user{i}"), "maxRating": 2800, "rank": "expert",
+                 "lastOnlineTimeSeconds": now - 3600} for i in range(HANDLES)
+            ]})
+
+        if method == "contest.ratingChanges":
+            contest_id = int(query.get("contestId", 1))
+            if contest(contest_id, now)["phase"] != "FINISHED":
+                return self._send_json({"status": "FAILED", "comment": "contestId: Rating changes are unavailable"}, 400)
+            seen, changes = set(), []
+            for rank in range(1, STANDINGS_ROWS + 1):
+                handle = f"user{rank % HANDLES}"
+                if handle in seen:
+                    continue
+                seen.add(handle)
+                old = rating(handle)
+                changes.append({"contestId": contest_id, "handle": handle, "rank": rank, "oldRating": old,
+                                "newRating": old + (HANDLES // 2 - rank) // 40})
+            return self._send_json({"status": "OK", "result": changes})
+
+        self._send_json({"status": "FAILED", "comment": f"Method {method} is not supported"}, 400)
+
+
+def start_server(port=0, latency=0.0, rate=0.0):
+    """Start the mock server in a background thread and return it"""
+    handler = type("Handler", (MockHandler,), {"state": MockState(latency, rate)})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every request")
+    parser.add_argument("--rate", type=float, default=0.0, help="API calls per second before 'Call limit exceeded' (0 = unlimited)")
+    args = parser.parse_args()
+
+    server = start_server(args.port, args.latency, args.rate)
+    print(f"Mock Codeforces listening on http://127.0.0.1:{server.server_address[1]}/")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
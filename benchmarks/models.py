@@ -0,0 +1,73 @@
+"""
+Memory and construction benchmark for the cfcli models.
+
+Builds a synthetic contest.status payload (100k submissions by default),
+parses it from JSON and compares what each representation keeps alive:
+the raw list of dicts, a list of Submission objects and a SubmissionBatch.
+Memory is measured with tracemalloc after the raw payload is released.
+
+Usage: python benchmarks/models.py [--rows 100000]
+"""
+import gc
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from mock_server import submission  # noqa: E402
+from cfcli.api.models import Submission, SubmissionBatch  # noqa: E402
+
+CONTEST_ID = 1900
+
+
+def measure(payload, build):
+    """Parse the payload, build a representation from it and return (seconds, retained bytes)"""
+    gc.collect()
+    tracemalloc.start()
+    rows = json.loads(payload)
+    started = time.perf_counter()
+    result = build(rows)
+    elapsed = time.perf_counter() - started
+    del rows
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return elapsed, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000, help="Number of submissions in the payload")
+    args = parser.parse_args()
+
+    payload = json.dumps([submission(CONTEST_ID, position) for position in range(args.rows)])
+    print(f"Payload: {args.rows} submissions, {len(payload) / 2 ** 20:.1f} MB of JSON\n")
+
+    representations = {
+        "list of dicts": lambda rows: rows,
+        "list of Submission": lambda rows: [Submission.from_json(row) for row in rows],
+        "SubmissionBatch": SubmissionBatch.from_json,
+    }
+
+    print(f"{'Representation':<20} {'Build (ms)':>11} {'Retained (MB)':>14} {'Bytes/row':>10}")
+    print("-" * 58)
+    for name, build in representations.items():
+        elapsed, retained = measure(payload, build)
+        print(f"{name:<20} {elapsed * 1000:>11.1f} {retained / 2 ** 20:>14.1f} {retained / args.rows:>10.0f}")
+
+    # Materializing rows from a batch is on demand; time a full pass over it
+    batch = SubmissionBatch.from_json(json.loads(payload))
+    started = time.perf_counter()
+    for item in batch:
+        item.verdict
+    print(f"\nIterating the batch as Submission objects: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
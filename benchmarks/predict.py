@@ -0,0 +1,104 @@
+"""
+Benchmark for the vectorized rating-change predictor.
+
+Checks the vectorized predictor against a straightforward pure-Python
+implementation of the Codeforces rating algorithm on a small synthetic
+contest, then times the vectorized one on contests up to a 30k-contestant
+round. The naive implementation is O(n^2) per binary-search step and is
+only run on the small contest.
+
+Usage: python benchmarks/predict.py [--naive-size 400] [--sizes 1000 10000 30000]
+"""
+import sys
+import math
+import time
+import random
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from cfcli.utils.rating import predict_deltas, tie_ranks, RATING_MIN, RATING_MAX  # noqa: E402
+
+
+def naive_deltas(ratings, ranks):
+    """Reference implementation following the published algorithm step by step"""
+    n = len(ratings)
+
+    def win_probability(a, b):
+        return 1.0 / (1.0 + 10 ** ((a - b) / 400.0))
+
+    def seed(rating, exclude):
+        return 1.0 + sum(win_probability(rating, other) for j, other in enumerate(ratings) if j != exclude)
+
+    deltas = []
+    for i in range(n):
+        target = math.sqrt(seed(ratings[i], i) * ranks[i])
+        left, right = RATING_MIN, RATING_MAX
+        while right - left > 1:
+            mid = (left + right) // 2
+            if seed(mid, i) < target:
+                right = mid
+            else:
+                left = mid
+        deltas.append(int((left - ratings[i]) / 2))
+
+    inc = int(-sum(deltas) / n) - 1
+    deltas = [d + inc for d in deltas]
+    top = min(n, 4 * round(math.sqrt(n)))
+    by_rating = sorted(range(n), key=lambda i: -ratings[i])
+    top_sum = sum(deltas[i] for i in by_rating[:top])
+    inc = min(max(int(-top_sum / top), -10), 0)
+    return [d + inc for d in deltas]
+
+
+def synthetic_contest(n, seed=1):
+    """Ratings around 1500 and ranks loosely following them, with some ties"""
+    rng = random.Random(seed)
+    ratings = [max(100, int(rng.gauss(1500, 350))) for _ in range(n)]
+    performance = sorted(range(n), key=lambda i: -(ratings[i] + rng.gauss(0, 400)))
+    ordered = [ratings[i] for i in performance]
+    standing_ranks = []
+    for position in range(n):
+        if position and rng.random() < 0.05:
+            standing_ranks.append(standing_ranks[-1])  # tied with the previous contestant
+        else:
+            standing_ranks.append(position + 1)
+    return ordered, standing_ranks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--naive-size", type=int, default=400, help="Contest size for the naive comparison")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[1000, 10000, 30000],
+                        help="Contest sizes for the vectorized timings")
+    args = parser.parse_args()
+
+    ratings, standing_ranks = synthetic_contest(args.naive_size)
+    ranks = tie_ranks(standing_ranks)
+    started = time.perf_counter()
+    expected = naive_deltas(ratings, list(ranks))
+    naive_time = time.perf_counter() - started
+    started = time.perf_counter()
+    actual = predict_deltas(ratings, ranks).tolist()
+    vectorized_time = time.perf_counter() - started
+    mismatches = sum(1 for a, b in zip(expected, actual) if a != b)
+    print(f"n={args.naive_size}: naive {naive_time * 1000:.1f} ms, vectorized {vectorized_time * 1000:.1f} ms, "
+          f"{mismatches} mismatched deltas")
+
+    print(f"\n{'Contestants':>11} {'Vectorized (ms)':>16}")
+    for n in args.sizes:
+        ratings, standing_ranks = synthetic_contest(n)
+        timings = []
+        for _ in range(5):
+            started = time.perf_counter()
+            predict_deltas(ratings, tie_ranks(standing_ranks))
+            timings.append(time.perf_counter() - started)
+        print(f"{n:>11} {min(timings) * 1000:>16.1f}")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
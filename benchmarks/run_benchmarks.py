@@ -0,0 +1,146 @@
+"""
+End-to-end benchmarks for the cfcli commands against the offline mock server.
+
+Every command runs in a fresh process, first with an empty ~/.cfcli (cold)
+and then again with the caches it left behind (warm). For each run the
+wall time, the number of HTTP/API requests, the bytes served and the peak
+RSS of the process are recorded. With --daemon, each command is served by
+a freshly started `cfcli daemon` instead (peak RSS is then the client's).
+
+Usage:
+    python benchmarks/run_benchmarks.py [--latency 0.05] [--json results.json]
+                                        [--baseline old.json] [--tolerance 0.2]
+                                        [--daemon]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from mock_server import start_server, CONTEST_COUNT  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+RUNNING_CONTEST = CONTEST_COUNT - 10
+FINISHED_CONTEST = CONTEST_COUNT - 20
+
+COMMANDS = {
+    "fetch upcoming": ["fetch", "upcoming"],
+    "fetch past": ["fetch", "past", "--limit", "50"],
+    "generate --all": ["generate", str(FINISHED_CONTEST), "--all"],
+    "status --contest-id": ["status", "--contest-id", str(FINISHED_CONTEST)],
+    "status --handle": ["status", "--contest-id", str(FINISHED_CONTEST), "--handle", "user42"],
+    "submit": ["submit", f"Contest{RUNNING_CONTEST}_A.cpp"],
+    "history": ["history", "--by", "tag", "--unsolved"],
+    "search": ["search", "--tags", "dp,graphs", "--rating", "1200-1800", "--unsolved"],
+    "cache stats": ["cache", "stats"],
+}
+
+
+def server_stats(base_url, reset=False):
+    with urllib.request.urlopen(base_url + ("__reset" if reset else "__stats")) as response:
+        return json.load(response)
+
+
+def run_command(args, env, cwd):
+    """Run one cfcli command and measure it with wait4 for a per-process peak RSS"""
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-m", "cfcli"] + args, cwd=cwd, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    elapsed = time.perf_counter() - started
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak_rss = usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    return elapsed, peak_rss, proc.returncode
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock server latency per request in seconds")
+    parser.add_argument("--api-rate", type=float, default=1000.0,
+                        help="Client API rate limit in calls per second (0.5 matches Codeforces)")
+    parser.add_argument("--server-rate", type=float, default=0.0,
+                        help="Server-side call limit in calls per second (0 = unlimited)")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write the results to this file")
+    parser.add_argument("--baseline", default=None, help="Compare against results saved with --json")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown against the baseline")
+    parser.add_argument("--daemon", action="store_true", help="Run the commands through a cfcli daemon")
+    parser.add_argument("commands", nargs="*", help=f"Subset of: {', '.join(COMMANDS)}")
+    args = parser.parse_args()
+
+    server = start_server(latency=args.latency, rate=args.server_rate)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+    home = tempfile.mkdtemp(prefix="cfcli-bench-home-")
+    workdir = tempfile.mkdtemp(prefix="cfcli-bench-cwd-")
+    Path(workdir, f"Contest{RUNNING_CONTEST}_A.cpp").write_text("int main() { return 0; }\n")
+
+    env = dict(os.environ, HOME=home, CFCLI_BASE_URL=base_url, CFCLI_API_RATE=str(args.api_rate),
+               CF_HANDLE="user42", CF_PASSWORD="password", PYTHONPATH=str(ROOT))
+    env.pop("CF_API_KEY", None)
+    env.pop("CF_API_SECRET", None)
+
+    results = {}
+    print(f"{'Command':<22} {'Run':<5} {'Wall (ms)':>10} {'Requests':>9} {'API':>5} {'KB sent':>9} {'Peak RSS (MB)':>14}")
+    print("-" * 80)
+    try:
+        for name in args.commands or COMMANDS:
+            # Cold runs start from an empty ~/.cfcli
+            shutil.rmtree(Path(home, ".cfcli"), ignore_errors=True)
+            if args.daemon:
+                subprocess.run([sys.executable, "-m", "cfcli", "daemon", "start"], cwd=workdir, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            for run in ("cold", "warm"):
+                server_stats(base_url, reset=True)
+                elapsed, peak_rss, returncode = run_command(COMMANDS[name], env, workdir)
+                stats = server_stats(base_url)
+                results[f"{name} [{run}]"] = {
+                    "wall": elapsed,
+                    "requests": stats["requests"],
+                    "api_requests": stats["api_requests"],
+                    "bytes": stats["bytes"],
+                    "peak_rss": peak_rss,
+                    "returncode": returncode
+                }
+                print(f"{name:<22} {run:<5} {elapsed * 1000:>10.1f} {stats['requests']:>9} "
+                      f"{stats['api_requests']:>5} {stats['bytes'] / 1024:>9.1f} {peak_rss / 2 ** 20:>14.1f}")
+            if args.daemon:
+                subprocess.run([sys.executable, "-m", "cfcli", "daemon", "stop"], cwd=workdir, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    finally:
+        server.shutdown()
+        shutil.rmtree(home, ignore_errors=True)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = []
+        for key, result in results.items():
+            old = baseline.get(key)
+            if old is None:
+                continue
+            for metric in ("wall", "requests", "bytes", "peak_rss"):
+                if old[metric] and result[metric] > old[metric] * (1 + args.tolerance):
+                    regressions.append(f"{key}: {metric} {old[metric]:.4g} -> {result[metric]:.4g}")
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
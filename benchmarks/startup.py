@@ -0,0 +1,167 @@
+"""
+Startup benchmark for the cfcli entry point.
+
+Measures cold and warm wall time of each subcommand and, with --imports,
+the slowest imports reported by ``python -X importtime``.
+
+Besides --help variants, real commands are run against the offline mock
+server after their data has been cached, so the numbers are what a user
+sees for a fully cached command. Cold runs start without bytecode, warm
+runs are repeated with it. A cached command that contacts the server is
+reported as an error.
+
+The target (100 ms by default) applies to the warm median of the cached
+commands, measured above the bare interpreter start (``python -c pass``)
+since site-packages imports outside cfcli vary between machines; use
+--absolute to compare raw wall time instead. The exit status is 1 when a
+command misses the target.
+
+Usage: python benchmarks/startup.py [--runs N] [--imports] [--target MS] [--absolute]
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import statistics
+import subprocess
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from mock_server import start_server, CONTEST_COUNT  # noqa: E402
+
+FINISHED_CONTEST = CONTEST_COUNT - 20
+
+# (arguments, served from the cache once warmed up)
+COMMANDS = [
+    (["--help"], False),
+    (["fetch", "--help"], False),
+    (["generate", "--help"], False),
+    (["submit", "--help"], False),
+    (["status", "--help"], False),
+    (["cache", "stats"], True),
+    (["fetch", "upcoming"], True),
+    (["fetch", "past", "--limit", "20"], True),
+    (["standings", str(FINISHED_CONTEST), "--count", "20"], True),
+    (["search", "--tags", "dp", "--limit", "10"], True),
+]
+
+DEFAULT_TARGET_MS = 100.0
+
+
+def run(args, env, importtime=False):
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += ["-m", "cfcli"] + args
+    started = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True)
+    return time.perf_counter() - started, proc.stderr
+
+
+def interpreter_baseline(env, runs):
+    """Median wall time of starting the interpreter without cfcli"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], cwd=ROOT, env=env, capture_output=True)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def api_requests(base_url):
+    with urllib.request.urlopen(base_url + "__stats") as response:
+        return json.load(response)["api_requests"]
+
+
+def clear_bytecode():
+    for cache_dir in (ROOT / "cfcli").rglob("__pycache__"):
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def slowest_imports(stderr, top=10):
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            rows.append((int(parts[1]), parts[2].strip()))
+        except ValueError:
+            continue
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Warm runs per command")
+    parser.add_argument("--imports", action="store_true", help="Show the slowest imports per command")
+    parser.add_argument("--target", type=float, default=DEFAULT_TARGET_MS,
+                        help="Warm median target in ms for cached commands")
+    parser.add_argument("--absolute", action="store_true",
+                        help="Check the target against raw wall time instead of time above the interpreter start")
+    args = parser.parse_args()
+
+    server = start_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    # Keep the benchmark away from the real ~/.cfcli
+    home = tempfile.mkdtemp(prefix="cfcli-bench-")
+    env = dict(os.environ, HOME=home, CFCLI_BASE_URL=base_url, CFCLI_API_RATE="100")
+    # Warm runs must load bytecode, which PYTHONDONTWRITEBYTECODE would prevent
+    for key in ("CF_HANDLE", "CF_API_KEY", "CF_API_SECRET", "CFCLI_SOCKET", "PYTHONDONTWRITEBYTECODE"):
+        env.pop(key, None)
+    env["CFCLI_SOCKET"] = os.path.join(home, "no-daemon.sock")
+
+    failures = []
+    try:
+        # Fill the caches the cached commands read from
+        for command, cached in COMMANDS:
+            if cached:
+                run(command, env)
+
+        baseline = interpreter_baseline(env, args.runs)
+        print(f"Interpreter start (python -c pass): {baseline * 1000:.1f} ms")
+        print(f"Target for cached commands: {args.target:.0f} ms "
+              f"{'wall time' if args.absolute else 'above the interpreter start'}\n")
+
+        print(f"{'Command':<32} {'Cold (ms)':>10} {'Warm p50 (ms)':>14} {'Warm min (ms)':>14} {'cfcli (ms)':>11}")
+        print("-" * 86)
+        for command, cached in COMMANDS:
+            requests_before = api_requests(base_url)
+            clear_bytecode()
+            cold, _ = run(command, env)
+            warm = [run(command, env)[0] for _ in range(args.runs)]
+            median = statistics.median(warm)
+            measured = median if args.absolute else median - baseline
+
+            note = ""
+            if cached and api_requests(base_url) != requests_before:
+                note = "  ERROR: contacted the server"
+                failures.append(command)
+            elif cached and measured * 1000 > args.target:
+                note = "  OVER TARGET"
+                failures.append(command)
+            print(f"{' '.join(command):<32} {cold * 1000:>10.1f} {median * 1000:>14.1f} "
+                  f"{min(warm) * 1000:>14.1f} {(median - baseline) * 1000:>11.1f}{note}")
+
+            if args.imports:
+                _, stderr = run(command, env, importtime=True)
+                for micros, module in slowest_imports(stderr):
+                    print(f"    {micros / 1000:>8.1f} ms  {module}")
+    finally:
+        server.shutdown()
+        shutil.rmtree(home, ignore_errors=True)
+
+    if failures:
+        print(f"\n{len(failures)} cached command(s) missed the target: "
+              + ", ".join(" ".join(command) for command in failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
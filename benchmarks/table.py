@@ -0,0 +1,108 @@
+"""
+Rendering benchmark for the shared table layer.
+
+Renders a synthetic 100k-row contest.status listing two ways and writes it
+to /dev/null through the same kind of stream the CLI prints to:
+
+- per-row print: one print per row with colorama codes, as the status
+  command used to do
+- Table: cfcli.commands.table, with column widths computed up front and
+  output written in large chunks
+
+"terminal" is a line-buffered stream that flushes every line, like a
+terminal. "pipe" is a block-buffered stream, as stdout is when redirected;
+colorama only wraps stdout on Windows, so nothing strips escape codes.
+
+Usage: python benchmarks/table.py [--rows 100000]
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from colorama import Style  # noqa: E402
+from mock_server import submission  # noqa: E402
+from cfcli.api.models import SubmissionBatch  # noqa: E402
+from cfcli.commands.cli import verdict_color  # noqa: E402
+from cfcli.commands.table import Column, Table  # noqa: E402
+
+CONTEST_ID = 1900
+
+
+class CountingStream(io.TextIOWrapper):
+    """Text stream to /dev/null that counts the writes reaching the file"""
+
+    def __init__(self, line_buffering):
+        self.raw_writes = 0
+        raw = open(os.devnull, "wb", buffering=0)
+        counter = self
+
+        class Raw(io.RawIOBase):
+            def writable(self):
+                return True
+
+            def write(self, data):
+                counter.raw_writes += 1
+                return raw.write(data)
+
+        super().__init__(io.BufferedWriter(Raw()), encoding="utf-8", line_buffering=line_buffering)
+
+
+def stream(kind):
+    """A fresh output stream and the object that counts its writes"""
+    target = CountingStream(line_buffering=kind == "terminal")
+    return target, target
+
+
+def per_row_print(rows, out, color):
+    print(f"{'ID':<12} {'Problem':<10} {'Verdict':<15}", file=out)
+    print("-" * 40, file=out)
+    for s in rows:
+        verdict = s.verdict or "IN QUEUE"
+        print(f"{s.id:<12} {s.problem_index:<10} {verdict_color(verdict)}{verdict}{Style.RESET_ALL}", file=out)
+
+
+def table_render(rows, out, color):
+    table = Table([
+        Column('ID', lambda s: s.id),
+        Column('Problem', lambda s: s.problem_index),
+        Column('Verdict', lambda s: s.verdict or "IN QUEUE", color=verdict_color),
+    ], rows)
+    for chunk in table.render(color):
+        out.write(chunk)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000, help="Number of rows to render")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the fastest is reported")
+    args = parser.parse_args()
+
+    payload = json.dumps([submission(CONTEST_ID, position) for position in range(args.rows)])
+    rows = list(SubmissionBatch.from_json(json.loads(payload)))
+    print(f"Rendering {args.rows} rows\n")
+
+    print(f"{'Output':<10} {'Renderer':<15} {'Time (ms)':>10} {'Writes':>8}")
+    print("-" * 46)
+    for kind in ("terminal", "pipe"):
+        # The CLI only emits color codes for terminals
+        color = kind == "terminal"
+        for name, render in (("per-row print", per_row_print), ("Table", table_render)):
+            timings = []
+            for _ in range(args.repeat):
+                out, counter = stream(kind)
+                started = time.perf_counter()
+                render(rows, out, color)
+                out.flush()
+                timings.append(time.perf_counter() - started)
+            print(f"{kind:<10} {name:<15} {min(timings) * 1000:>10.1f} {counter.raw_writes:>8}")
+
+
+if __name__ == "__main__":
+    main()
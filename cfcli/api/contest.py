@@ -1,39 +1,82 @@
-from typing import Dict, List, Optional
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from pathlib import Path
 from datetime import datetime
 from .session import CFSession
+from .models import Contest, StandingsRow, SubmissionBatch
+from ..utils.catalog import ContestCatalog
+from ..utils.trace import tracer
+
+STATUS_PAGE_SIZE = 5000
+STANDINGS_PAGE_SIZE = 50
+EXPORT_PAGE_SIZE = 5000
+
+PHASES = {
+    'upcoming': 'BEFORE',
+    'running': 'CODING',
+    'past': 'FINISHED'
+}
 
 class ContestAPI:
     def __init__(self, session: CFSession):
         self.session = session
+        self._catalog = None
 
-    def get_contests(self, type: str = 'upcoming', limit: int = 5) -> Dict:
-        """Fetch contest information"""
+    @property
+    def catalog(self) -> ContestCatalog:
+        """Get the local contest catalog, opening it on first use"""
+        if self._catalog is None:
+            self._catalog = ContestCatalog(Path.home() / ".cfcli" / "catalog.db")
+        return self._catalog
+
+    def refresh_catalog(self, force: bool = False) -> Dict:
+        """Merge new or changed contests into the local catalog when it is stale"""
         try:
-            response = self.session.call_api("contest.list")
+            if not force and not self.catalog.needs_refresh():
+                return {"status": "OK", "result": {"added": 0, "updated": 0}}
+
+            # A contest due to change phase needs the live list: the cached
+            # response predates the change and the stale catalog would show it
+            # in the wrong phase
+            phase_change = self.catalog.phase_change_due()
+
+            # Otherwise answer from the stale catalog and merge the new list in the background
+            if not force and not phase_change and self.session.use_stale_index(
+                    "contest.list", self.catalog.refreshed_at,
+                    lambda response: self.catalog.merge(response.get("result", []))):
+                return {"status": "OK", "result": {"added": 0, "updated": 0}}
+
+            response = self.session.call_api("contest.list", refresh=force or phase_change)
             if response.get("status") != "OK":
                 return {"status": "FAILED", "comment": response.get("comment", "Unknown error")}
-                
-            contests = response.get("result", [])
-            
-            # Filter contests based on type
-            current_time = int(time.time())
-            filtered_contests = []
-            
-            for contest in contests:
-                if type == 'upcoming' and contest.get('phase') == 'BEFORE':
-                    filtered_contests.append(contest)
-                elif type == 'running' and contest.get('phase') == 'CODING':
-                    filtered_contests.append(contest)
-                elif type == 'past' and contest.get('phase') == 'FINISHED':
-                    filtered_contests.append(contest)
-            
-            # Sort and limit
-            if type == 'upcoming':
-                filtered_contests.sort(key=lambda c: c.get('startTimeSeconds', 0))
-            else:
-                filtered_contests.sort(key=lambda c: c.get('startTimeSeconds', 0), reverse=True)
-            
-            return {"status": "OK", "result": filtered_contests[:limit]}
+
+            return {"status": "OK", "result": self.catalog.merge(response.get("result", []))}
+
+        except Exception as e:
+            return {"status": "FAILED", "comment": str(e)}
+
+    def get_contests(self, type: str = 'upcoming', limit: int = 5, since: Optional[datetime] = None,
+                     until: Optional[datetime] = None, name: Optional[str] = None,
+                     division: Optional[str] = None, refresh: bool = False) -> Dict:
+        """Fetch contest information"""
+        try:
+            with tracer.span("catalog.refresh"):
+                response = self.refresh_catalog(force=refresh)
+            if response.get("status") != "OK":
+                return response
+
+            # Upcoming contests are listed soonest first, others most recent first
+            with tracer.span("catalog.query"):
+                contests = self.catalog.query(
+                    phase=PHASES.get(type),
+                    limit=limit,
+                    newest_first=type != 'upcoming',
+                    since=int(since.timestamp()) if since else None,
+                    until=int(until.timestamp()) if until else None,
+                    name=name,
+                    division=division
+                )
+            return {"status": "OK", "result": contests}
             
         except Exception as e:
             return {"status": "FAILED", "comment": str(e)}
@@ -56,18 +99,260 @@ class ContestAPI:
         except Exception as e:
             return {"status": "FAILED", "comment": str(e)}
 
-    def get_contest_status(self, contest_id: int) -> Dict:
-        """Get contest status and submissions"""
+    def get_standings(self, contest_id: int, start: int = 1, count: int = STANDINGS_PAGE_SIZE,
+                      handles: Optional[List[str]] = None, unofficial: bool = False,
+                      live: bool = False) -> Dict:
+        """Fetch a page of standings as a Contest and compact StandingsRow objects"""
         try:
-            response = self.session.call_api("contest.status", {
-                "contestId": contest_id
-            })
+            params = {"contestId": contest_id, "from": start, "count": count}
+            if handles:
+                params["handles"] = ";".join(handles)
+            if unofficial:
+                params["showUnofficial"] = "true"
+
+            # Live refreshes always go to the network
+            response = self.session.call_api("contest.standings", params, cache=not live)
+            if response.get("status") != "OK":
+                return {"status": "FAILED", "comment": response.get("comment", "Unknown error")}
+
+            result = response.get("result", {})
+            return {"status": "OK", "result": {
+                "contest": Contest.from_json(result.get("contest", {})),
+                "problems": [p.get("index", "") for p in result.get("problems", [])],
+                "rows": [StandingsRow.from_json(row) for row in result.get("rows", [])]
+            }}
+
+        except Exception as e:
+            return {"status": "FAILED", "comment": str(e)}
+
+    def predict_rating_changes(self, contest_id: int, live: bool = False) -> Dict:
+        """Predict the rating change of every rated contestant from the current standings
+
+        Standings are paged and cached; live polls refresh every page.
+        """
+        try:
+            import numpy  # noqa: F401  NumPy is an optional dependency
+        except ImportError:
+            return {"status": "FAILED", "comment": "Rating prediction needs NumPy (pip install numpy)"}
+        from ..utils.rating import tie_ranks, predict_deltas, NEW_USER_RATING
+
+        try:
+            started = time.perf_counter()
+
+            # Only individual official contestants are rated; keep just their handles and ranks
+            contest, contestants = None, []
+            for page_contest, _, rows in self.iter_standings(contest_id, cache=True, refresh=live):
+                contest = contest or Contest.from_json(page_contest)
+                for row in rows:
+                    party = row.get("party", {})
+                    members = party.get("members", [])
+                    if party.get("participantType") == "CONTESTANT" and len(members) == 1:
+                        contestants.append((members[0].get("handle", ""), row.get("rank", 0)))
+            if contest is None:
+                return {"status": "FAILED", "comment": f"No standings found for contest {contest_id}"}
+
+            # Finished contests have exact old ratings; otherwise use everyone's current rating
+            old_ratings, actual = {}, {}
+            if contest.phase == "FINISHED":
+                try:
+                    changes = self.session.call_api("contest.ratingChanges", {"contestId": contest_id})
+                    for change in changes.get("result", []):
+                        old_ratings[change["handle"]] = change["oldRating"]
+                        actual[change["handle"]] = change["newRating"] - change["oldRating"]
+                except Exception:
+                    pass
+            if not old_ratings:
+                rated = self.session.call_api("user.ratedList", {"activeOnly": "false", "includeRetired": "true"})
+                old_ratings = {user["handle"]: user.get("rating", NEW_USER_RATING) for user in rated.get("result", [])}
+
+            if actual:
+                contestants = [(handle, rank) for handle, rank in contestants if handle in actual]
+
+            with tracer.span("rating.predict", contestants=len(contestants)):
+                ratings = [old_ratings.get(handle, NEW_USER_RATING) for handle, _ in contestants]
+                deltas = predict_deltas(ratings, tie_ranks([rank for _, rank in contestants]))
+
+            return {"status": "OK", "result": {
+                "contest": contest,
+                "predictions": [
+                    {"handle": handle, "rank": rank, "rating": rating, "delta": int(delta), "actual": actual.get(handle)}
+                    for (handle, rank), rating, delta in zip(contestants, ratings, deltas)
+                ],
+                "elapsed": time.perf_counter() - started
+            }}
+
+        except Exception as e:
+            return {"status": "FAILED", "comment": str(e)}
+
+    def get_contest_status(self, contest_id: int, handle: Optional[str] = None,
+                           start: int = 1, count: Optional[int] = None) -> Dict:
+        """Get contest submissions as an array-backed SubmissionBatch"""
+        try:
+            params = {"contestId": contest_id, "from": start}
+            if count is not None:
+                params["count"] = count
+            if handle:
+                params["handle"] = handle
+
+            response = self.session.call_api("contest.status", params)
             
             if response.get("status") != "OK":
                 return {"status": "FAILED", "comment": response.get("comment", "Unknown error")}
                 
-            submissions = response.get("result", [])
-            return {"status": "OK", "result": submissions}
+            return {"status": "OK", "result": SubmissionBatch.from_json(response.get("result", []))}
             
         except Exception as e:
-            return {"status": "FAILED", "comment": str(e)} 
\ No newline at end of file
+            return {"status": "FAILED", "comment": str(e)}
+
+    def iter_contest_status(self, contest_id: int, handle: Optional[str] = None, since: Optional[int] = None,
+                            page_size: int = STATUS_PAGE_SIZE, start: int = 1, before: Optional[int] = None,
+                            raw: bool = False) -> Iterator[SubmissionBatch]:
+        """Yield contest submissions as SubmissionBatch pages, newest first
+
+        Only one page is held in memory at a time. With ``since``, paging stops
+        at the first submission whose ID is not newer than it. ``start`` and
+        ``before`` resume from an offset, skipping submissions not older than
+        ``before``. With ``raw`` the pages are lists of submission dicts.
+        """
+        params = {"contestId": contest_id, "count": page_size}
+        if handle:
+            params["handle"] = handle
+
+        oldest = before
+        while True:
+            # Pages shift as new submissions arrive, so they are never cached
+            params["from"] = start
+            with tracer.span("contest.status page", start=start):
+                response = self.session.call_api("contest.status", params, cache=False)
+
+            if response.get("status") != "OK":
+                raise Exception(response.get("comment", "Unknown error"))
+
+            page = response.get("result", [])
+
+            # Drop rows repeated because new submissions pushed them onto this page
+            rows = [s for s in page if oldest is None or s.get("id", 0) < oldest]
+            if since is not None:
+                rows = [s for s in rows if s.get("id", 0) > since]
+            if rows:
+                oldest = rows[-1].get("id", 0)
+                yield rows if raw else SubmissionBatch.from_json(rows)
+            if since is not None and page and page[-1].get("id", 0) <= since:
+                return
+
+            if len(page) < page_size:
+                return
+            start += page_size
+
+    def iter_standings(self, contest_id: int, start: int = 1, page_size: int = EXPORT_PAGE_SIZE,
+                       unofficial: bool = False, cache: bool = False,
+                       refresh: bool = False) -> Iterator[Tuple[Dict, List[Dict], List[Dict]]]:
+        """Yield (contest, problems, rows) pages of the full standings, in rank order
+
+        Pages bypass the response cache unless cache is set; refresh fetches
+        them again but still stores them.
+        """
+        params = {"contestId": contest_id, "count": page_size}
+        if unofficial:
+            params["showUnofficial"] = "true"
+
+        while True:
+            params["from"] = start
+            with tracer.span("contest.standings page", start=start):
+                response = self.session.call_api("contest.standings", dict(params), cache=cache, refresh=refresh)
+
+            if response.get("status") != "OK":
+                raise Exception(response.get("comment", "Unknown error"))
+
+            result = response.get("result", {})
+            rows = result.get("rows", [])
+            if rows:
+                yield result.get("contest", {}), result.get("problems", []), rows
+            if len(rows) < page_size:
+                return
+            start += page_size
+
+    def export_contest(self, contest_id: int, what: str, fmt: str, output: Optional[Path] = None,
+                       compression: Optional[str] = None, page_size: int = EXPORT_PAGE_SIZE,
+                       unofficial: bool = False, restart: bool = False,
+                       progress: Optional[Callable[[int], None]] = None) -> Dict:
+        """Stream contest submissions, standings or problems into a JSONL, CSV or Parquet file
+
+        Pages are written and checkpointed as they arrive, so memory stays
+        bounded by one page. An export interrupted part way resumes from its
+        last checkpoint unless restart is set.
+        """
+        from ..utils import export
+
+        if fmt == "parquet":
+            try:
+                import pyarrow  # noqa: F401  pyarrow is an optional dependency
+            except ImportError:
+                return {"status": "FAILED", "comment": "Parquet export needs pyarrow (pip install pyarrow)"}
+
+        try:
+            started = time.perf_counter()
+            error = export.check_compression(fmt, compression)
+            if error:
+                return {"status": "FAILED", "comment": error}
+            output = Path(output) if output else export.default_output(contest_id, what, fmt, compression)
+
+            state = None if restart else export.ExportWriter.load_state(output)
+            if state and (state.get("contest_id") != contest_id or state.get("what") != what
+                          or state.get("format") != fmt):
+                return {"status": "FAILED", "comment": f"{output} belongs to a different export; use --restart"}
+            if not state and output.exists() and not restart:
+                return {"status": "FAILED", "comment": f"{output} already exists; use --restart to overwrite"}
+            if state:
+                compression = state.get("compression")
+            resumed = state["rows"] if state else 0
+
+            def report(writer: "export.ExportWriter") -> None:
+                if progress is not None:
+                    progress(writer.state["rows"])
+
+            if what == "problems":
+                response = self.session.call_api("contest.standings", {"contestId": contest_id, "from": 1, "count": 1})
+                if response.get("status") != "OK":
+                    return {"status": "FAILED", "comment": response.get("comment", "Unknown error")}
+                writer = export.ExportWriter(output, fmt, export.PROBLEM_COLUMNS, compression, state)
+                problems = response.get("result", {}).get("problems", [])
+                writer.write([export.problem_record(p) for p in problems[writer.state["rows"]:]],
+                             contest_id=contest_id, what=what)
+
+            elif what == "status":
+                writer = export.ExportWriter(output, fmt, export.STATUS_COLUMNS, compression, state)
+                for page in self.iter_contest_status(contest_id, page_size=page_size, start=writer.state["rows"] + 1,
+                                                     before=writer.state.get("last_id"), raw=True):
+                    writer.write([export.status_record(s) for s in page],
+                                 contest_id=contest_id, what=what, last_id=page[-1].get("id"))
+                    report(writer)
+
+            else:
+                writer = None
+                for _, problems, rows in self.iter_standings(contest_id, start=(state["rows"] if state else 0) + 1,
+                                                             page_size=page_size, unofficial=unofficial):
+                    if writer is None:
+                        writer = export.ExportWriter(output, fmt, export.standings_columns(problems), compression, state)
+                    writer.write([export.standings_record(row, problems) for row in rows],
+                                 contest_id=contest_id, what=what)
+                    report(writer)
+                if writer is None and not state:
+                    return {"status": "FAILED", "comment": f"No standings found for contest {contest_id}"}
+
+            if writer is None:
+                # Every row was written before the last run stopped; only its checkpoint was left
+                export.ExportWriter.mark_complete(output)
+            else:
+                writer.finish()
+                state = writer.state
+            return {"status": "OK", "result": {
+                "path": str(output),
+                "rows": state["rows"],
+                "resumed": resumed,
+                "bytes": state["bytes"],
+                "elapsed": time.perf_counter() - started
+            }}
+
+        except Exception as e:
+            return {"status": "FAILED", "comment": str(e)}
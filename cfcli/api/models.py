@@ -0,0 +1,215 @@
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Models keep only the fields cfcli displays. Repeated strings (verdicts,
+# problem indexes, languages, handles) are interned so every instance
+# shares a single copy.
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+
+def _party_name(party: Dict) -> str:
+    return party.get("teamName") or ",".join(m.get("handle", "") for m in party.get("members", []))
+
+
+class Problem:
+    """A problem of a contest or of the problemset"""
+    __slots__ = ("contest_id", "index", "name", "rating", "tags")
+
+    def __init__(self, contest_id: Optional[int], index: str, name: str = "",
+                 rating: Optional[int] = None, tags: Tuple[str, ...] = ()):
+        self.contest_id = contest_id
+        self.index = index
+        self.name = name
+        self.rating = rating
+        self.tags = tags
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "Problem":
+        return cls(
+            data.get("contestId"),
+            _intern(data.get("index", "")),
+            data.get("name", ""),
+            data.get("rating"),
+            tuple(sys.intern(tag) for tag in data.get("tags", ()))
+        )
+
+    def __repr__(self) -> str:
+        return f"Problem({self.contest_id}{self.index} {self.name!r})"
+
+
+class Contest:
+    """A contest from contest.list or a standings header"""
+    __slots__ = ("id", "name", "type", "phase", "frozen", "duration", "start_time")
+
+    def __init__(self, id: int, name: str, type: Optional[str], phase: Optional[str],
+                 frozen: bool = False, duration: int = 0, start_time: Optional[int] = None):
+        self.id = id
+        self.name = name
+        self.type = type
+        self.phase = phase
+        self.frozen = frozen
+        self.duration = duration
+        self.start_time = start_time
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "Contest":
+        return cls(
+            data.get("id"),
+            data.get("name", ""),
+            _intern(data.get("type")),
+            _intern(data.get("phase")),
+            bool(data.get("frozen")),
+            data.get("durationSeconds", 0),
+            data.get("startTimeSeconds")
+        )
+
+    def __repr__(self) -> str:
+        return f"Contest({self.id} {self.name!r} {self.phase})"
+
+
+class Submission:
+    """A submission from contest.status or user.status"""
+    __slots__ = ("id", "contest_id", "creation_time", "problem_index", "problem_name", "author",
+                 "language", "verdict", "passed", "time_ms", "memory_bytes")
+
+    def __init__(self, id: int, contest_id: Optional[int], creation_time: int, problem_index: str,
+                 problem_name: str, author: str, language: str, verdict: Optional[str],
+                 passed: int = 0, time_ms: int = 0, memory_bytes: int = 0):
+        self.id = id
+        self.contest_id = contest_id
+        self.creation_time = creation_time
+        self.problem_index = problem_index
+        self.problem_name = problem_name
+        self.author = author
+        self.language = language
+        self.verdict = verdict
+        self.passed = passed
+        self.time_ms = time_ms
+        self.memory_bytes = memory_bytes
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "Submission":
+        problem = data.get("problem", {})
+        return cls(
+            data.get("id", 0),
+            data.get("contestId"),
+            data.get("creationTimeSeconds", 0),
+            _intern(problem.get("index", "")),
+            problem.get("name", ""),
+            sys.intern(_party_name(data.get("author", {}))),
+            _intern(data.get("programmingLanguage", "")),
+            _intern(data.get("verdict")),
+            data.get("passedTestCount", 0),
+            data.get("timeConsumedMillis", 0),
+            data.get("memoryConsumedBytes", 0)
+        )
+
+    def __repr__(self) -> str:
+        return f"Submission({self.id} {self.contest_id}{self.problem_index} {self.verdict})"
+
+
+class StandingsRow:
+    """One standings row; results holds a (points, rejected attempts) pair per problem"""
+    __slots__ = ("rank", "party", "points", "penalty", "results")
+
+    def __init__(self, rank: int, party: str, points: float, penalty: int,
+                 results: Tuple[Tuple[float, int], ...]):
+        self.rank = rank
+        self.party = party
+        self.points = points
+        self.penalty = penalty
+        self.results = results
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "StandingsRow":
+        return cls(
+            data.get("rank", 0),
+            sys.intern(_party_name(data.get("party", {}))),
+            data.get("points", 0.0),
+            data.get("penalty", 0),
+            tuple((r.get("points", 0.0), r.get("rejectedAttemptCount", 0)) for r in data.get("problemResults", ()))
+        )
+
+    def __repr__(self) -> str:
+        return f"StandingsRow({self.rank} {self.party!r} {self.points:g})"
+
+
+class SubmissionBatch:
+    """Array-backed submissions for bulk results
+
+    Numbers live in typed arrays and strings are dictionary-encoded into a
+    shared table, so a batch costs a few dozen bytes per submission.
+    Submission objects are only built when rows are accessed.
+    """
+    __slots__ = ("ids", "contest_ids", "times", "passed", "time_ms", "memory_bytes",
+                 "_index", "_name", "_author", "_language", "_verdict", "_strings", "_codes")
+
+    def __init__(self):
+        self.ids = array("q")
+        self.contest_ids = array("l")
+        self.times = array("q")
+        self.passed = array("l")
+        self.time_ms = array("l")
+        self.memory_bytes = array("q")
+        self._index = array("l")
+        self._name = array("l")
+        self._author = array("l")
+        self._language = array("l")
+        self._verdict = array("l")
+        self._strings: List[Optional[str]] = [None]
+        self._codes: Dict[Optional[str], int] = {None: 0}
+
+    @classmethod
+    def from_json(cls, rows: List[Dict]) -> "SubmissionBatch":
+        batch = cls()
+        batch.extend(rows)
+        return batch
+
+    def _encode(self, value: Optional[str]) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._strings)
+            self._strings.append(sys.intern(value))
+        return code
+
+    def extend(self, rows: List[Dict]) -> None:
+        """Append raw submission dicts"""
+        encode = self._encode
+        for data in rows:
+            problem = data.get("problem", {})
+            self.ids.append(data.get("id", 0))
+            self.contest_ids.append(data.get("contestId") or 0)
+            self.times.append(data.get("creationTimeSeconds", 0))
+            self.passed.append(data.get("passedTestCount", 0))
+            self.time_ms.append(data.get("timeConsumedMillis", 0))
+            self.memory_bytes.append(data.get("memoryConsumedBytes", 0))
+            self._index.append(encode(problem.get("index", "")))
+            self._name.append(encode(problem.get("name", "")))
+            self._author.append(encode(_party_name(data.get("author", {}))))
+            self._language.append(encode(data.get("programmingLanguage", "")))
+            self._verdict.append(encode(data.get("verdict")))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, i: int) -> Submission:
+        strings = self._strings
+        return Submission(
+            self.ids[i], self.contest_ids[i] or None, self.times[i],
+            strings[self._index[i]], strings[self._name[i]], strings[self._author[i]],
+            strings[self._language[i]], strings[self._verdict[i]],
+            self.passed[i], self.time_ms[i], self.memory_bytes[i]
+        )
+
+    def __iter__(self) -> Iterator[Submission]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def verdicts(self) -> Iterator[Optional[str]]:
+        """Verdicts in row order without building Submission objects"""
+        strings = self._strings
+        return (strings[code] for code in self._verdict)
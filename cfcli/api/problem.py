@@ -1,13 +1,131 @@
+import re
+import json
+import time
 from typing import Dict, List, Optional
 from pathlib import Path
 from datetime import datetime
+from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
 from .session import CFSession
+from ..utils.trace import tracer
+from ..utils.problemset import ProblemsetIndex
+
+DEFAULT_TEMPLATE = """#include <iostream>
+#include <vector>
+#include <algorithm>
+#include <string>
+#include <map>
+#include <set>
+
+using namespace std;
+
+void solve() {
+    // Your solution here
+}
+
+int main() {
+    ios_base::sync_with_stdio(false);
+    cin.tie(nullptr);
+    
+    int t = 1;
+    // cin >> t;
+    while (t--) {
+        solve();
+    }
+    
+    return 0;
+}
+"""
+
+def _pre_text(pre) -> str:
+    """Get the text of a sample block, which may be split into per-line divs"""
+    lines = pre.find_all("div", class_="test-example-line")
+    if lines:
+        text = "\n".join(line.get_text() for line in lines)
+    else:
+        text = pre.get_text("\n")
+    return text.strip("\n") + "\n"
+
+def parse_statement(html: str) -> Dict:
+    """Extract sample tests and limits from a problem statement page"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    inputs = soup.select("div.sample-test div.input pre")
+    outputs = soup.select("div.sample-test div.output pre")
+    result = {
+        "tests": [{"input": _pre_text(i), "output": _pre_text(o)} for i, o in zip(inputs, outputs)],
+        "time_limit": None,
+        "memory_limit": None
+    }
+
+    time_limit = soup.select_one("div.time-limit")
+    if time_limit:
+        match = re.search(r'([\d.]+)\s*second', time_limit.get_text())
+        if match:
+            result["time_limit"] = float(match.group(1))
+
+    memory_limit = soup.select_one("div.memory-limit")
+    if memory_limit:
+        match = re.search(r'(\d+)\s*megabyte', memory_limit.get_text())
+        if match:
+            result["memory_limit"] = int(match.group(1))
+
+    return result
+
+PREFETCH_RETRY_DELAY = 2.0  # seconds between attempts while a contest is opening
 
 class ProblemAPI:
     def __init__(self, session: CFSession):
         self.session = session
         self.template_dir = Path.home() / ".cfcli" / "templates"
-        self.template_dir.mkdir(parents=True, exist_ok=True)
+        self.samples_dir = Path.home() / ".cfcli" / "samples"
+        self._problemset = None
+
+    @property
+    def problemset(self) -> ProblemsetIndex:
+        """Get the local problemset index, opening it on first use"""
+        if self._problemset is None:
+            self._problemset = ProblemsetIndex(Path.home() / ".cfcli" / "problemset.db")
+        return self._problemset
+
+    def refresh_problemset(self, force: bool = False) -> Dict:
+        """Merge new or changed problems into the local index when it is stale"""
+        try:
+            if not force and not self.problemset.needs_refresh():
+                return {"status": "OK", "result": {"added": 0, "updated": 0}}
+
+            def merge(response: Dict) -> Dict:
+                result = response.get("result", {})
+                return self.problemset.merge(result.get("problems", []), result.get("problemStatistics", []))
+
+            # Answer from the stale index and merge the new problemset in the background
+            if not force and self.session.use_stale_index("problemset.problems", self.problemset.refreshed_at, merge):
+                return {"status": "OK", "result": {"added": 0, "updated": 0}}
+
+            response = self.session.call_api("problemset.problems", refresh=force)
+            if response.get("status") != "OK":
+                return {"status": "FAILED", "comment": response.get("comment", "Unknown error")}
+
+            with tracer.span("problemset.merge"):
+                return {"status": "OK", "result": merge(response)}
+
+        except Exception as e:
+            return {"status": "FAILED", "comment": str(e)}
+
+    def search_problems(self, refresh: bool = False, **filters) -> Dict:
+        """Search the local problemset index, refreshing it first when stale"""
+        try:
+            with tracer.span("problemset.refresh"):
+                response = self.refresh_problemset(force=refresh)
+            if response.get("status") != "OK" and not len(self.problemset):
+                return response
+
+            with tracer.span("problemset.search"):
+                return {"status": "OK", "result": self.problemset.search(**filters)}
+
+        except Exception as e:
+            return {"status": "FAILED", "comment": str(e)}
 
     def get_problem(self, contest_id: int, problem_index: str) -> Dict:
         """Fetch problem details"""
@@ -32,6 +150,69 @@ class ProblemAPI:
         except Exception as e:
             return {"status": "FAILED", "comment": str(e)}
 
+    def get_samples(self, contest_id: int, problem_index: str, refresh: bool = False) -> Dict:
+        """Fetch sample tests and limits from the problem statement page"""
+        try:
+            cache_file = self.samples_dir / f"{contest_id}_{problem_index}.json"
+            if cache_file.exists() and not refresh:
+                with open(cache_file, 'r') as f:
+                    return {"status": "OK", "result": json.load(f)}
+
+            url = urljoin(self.session.CF_BASE_URL, f"contest/{contest_id}/problem/{problem_index}")
+            response = self.session.session.get(url)
+            if response.status_code != 200:
+                return {"status": "FAILED", "comment": f"HTTP Error: {response.status_code}"}
+
+            result = parse_statement(response.text)
+            if not result["tests"]:
+                return {"status": "FAILED", "comment": f"No samples found for problem {contest_id}{problem_index}"}
+
+            self.samples_dir.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, 'w') as f:
+                json.dump(result, f)
+            
+            return {"status": "OK", "result": result}
+            
+        except Exception as e:
+            return {"status": "FAILED", "comment": str(e)}
+
+    def _load_template(self, template_dir: Optional[Path] = None) -> str:
+        """Read the solution template, creating the default one if missing"""
+        # Determine template directory
+        if template_dir is None:
+            template_dir = self.template_dir
+            
+        template_file = Path(template_dir) / "template.cpp"
+        
+        # Create default template if it doesn't exist
+        if not template_file.exists():
+            template_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(template_file, 'w') as f:
+                f.write(DEFAULT_TEMPLATE)
+
+        with open(template_file, 'r') as src:
+            return src.read()
+
+    def _write_problem_file(self, contest_id: int, problem_index: str, template_content: str) -> Dict:
+        """Render the header for a problem and write its source file"""
+        output_filename = f"Contest{contest_id}_{problem_index}.cpp"
+        
+        # Generate problem URL
+        problem_url = f"https://codeforces.com/contest/{contest_id}/problem/{problem_index}"
+        
+        # Add header with problem URL
+        header = f"""/**
+ * Problem: Codeforces {contest_id}{problem_index}
+ * URL: {problem_url}
+ * Date: {datetime.now().strftime('%Y-%m-%d')}
+ */
+"""
+        # Write to output file
+        with open(output_filename, 'w') as dest:
+            dest.write(header + "\n" + template_content)
+        
+        return {"filename": output_filename, "url": problem_url}
+
     def generate_problem_file(self, contest_id: int, problem_index: str, template_dir: Optional[Path] = None) -> Dict:
         """Generate a source file for a problem"""
         try:
@@ -40,70 +221,118 @@ class ProblemAPI:
             if problem_response.get("status") != "OK":
                 return problem_response
                 
-            problem = problem_response["result"]
+            template_content = self._load_template(template_dir)
+            return {"status": "OK", "result": self._write_problem_file(contest_id, problem_index, template_content)}
             
-            # Determine template directory
-            if template_dir is None:
-                template_dir = self.template_dir
-                
-            template_file = template_dir / "template.cpp"
+        except Exception as e:
+            return {"status": "FAILED", "comment": str(e)}
+
+    def generate_contest_files(self, contest_id: int, template_dir: Optional[Path] = None, jobs: int = 1) -> Dict:
+        """Generate source files for every problem of a contest with a single API call"""
+        try:
+            started = time.perf_counter()
+
+            response = self.session.call_api("contest.standings", {
+                "contestId": contest_id,
+                "from": 1,
+                "count": 1
+            })
             
-            # Create default template if it doesn't exist
-            if not template_file.exists():
-                with open(template_file, 'w') as f:
-                    f.write("""#include <iostream>
-#include <vector>
-#include <algorithm>
-#include <string>
-#include <map>
-#include <set>
+            if response.get("status") != "OK":
+                return {"status": "FAILED", "comment": response.get("comment", "Unknown error")}
 
-using namespace std;
+            indexes = [p["index"] for p in response.get("result", {}).get("problems", []) if p.get("index")]
+            if not indexes:
+                return {"status": "FAILED", "comment": f"No problems found for contest {contest_id}"}
 
-void solve() {
-    // Your solution here
-}
+            # Read the template once and share it across all problems
+            with tracer.span("template.load"):
+                template_content = self._load_template(template_dir)
 
-int main() {
-    ios_base::sync_with_stdio(false);
-    cin.tie(nullptr);
-    
-    int t = 1;
-    // cin >> t;
-    while (t--) {
-        solve();
-    }
-    
-    return 0;
-}
-""")
+            with tracer.span("files.write", count=len(indexes)):
+                files = self._write_problem_files(contest_id, indexes, template_content, jobs)
 
-            # Create output file
-            output_filename = f"Contest{contest_id}_{problem_index}.cpp"
-            output_path = Path(output_filename)
-            
-            # Generate problem URL
-            problem_url = f"https://codeforces.com/contest/{contest_id}/problem/{problem_index}"
-            
-            # Read template
-            with open(template_file, 'r') as src:
-                template_content = src.read()
-            
-            # Add header with problem URL
-            header = f"""/**
- * Problem: Codeforces {contest_id}{problem_index}
- * URL: {problem_url}
- * Date: {datetime.now().strftime('%Y-%m-%d')}
- */
-"""
-            # Write to output file
-            with open(output_filename, 'w') as dest:
-                dest.write(header + "\n" + template_content)
+            return {"status": "OK", "result": {
+                "files": files,
+                "elapsed": time.perf_counter() - started
+            }}
             
+        except Exception as e:
+            return {"status": "FAILED", "comment": str(e)}
+
+    def generate_problem_set(self, problems: List[Dict], template_dir: Optional[Path] = None, jobs: int = 1) -> Dict:
+        """Generate source files for problems from a search, without any API calls"""
+        try:
+            template_content = self._load_template(template_dir)
+            with tracer.span("files.write", count=len(problems)):
+                if jobs > 1:
+                    with ThreadPoolExecutor(max_workers=jobs) as pool:
+                        files = list(pool.map(
+                            lambda p: self._write_problem_file(p["contestId"], p["index"], template_content), problems
+                        ))
+                else:
+                    files = [self._write_problem_file(p["contestId"], p["index"], template_content) for p in problems]
+            return {"status": "OK", "result": {"files": files}}
+
+        except Exception as e:
+            return {"status": "FAILED", "comment": str(e)}
+
+    def _write_problem_files(self, contest_id: int, indexes: List[str], template_content: str, jobs: int) -> List[Dict]:
+        """Write the files for several problems, optionally in parallel"""
+        if jobs > 1:
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                return list(pool.map(
+                    lambda index: self._write_problem_file(contest_id, index, template_content), indexes
+                ))
+        return [self._write_problem_file(contest_id, index, template_content) for index in indexes]
+
+    def prefetch_contest(self, contest_id: int, template_dir: Optional[Path] = None,
+                         generate: bool = True, attempts: int = 10) -> Dict:
+        """Warm every local cache for a contest that has just started
+
+        Problem metadata costs a single API call (retried while the contest is
+        still opening), statements and samples are then downloaded
+        concurrently, and source files are generated from the cached metadata.
+        """
+        try:
+            started = time.perf_counter()
+
+            problems = None
+            for attempt in range(attempts):
+                try:
+                    response = self.session.call_api("contest.standings", {
+                        "contestId": contest_id,
+                        "from": 1,
+                        "count": 1
+                    }, refresh=True)
+                    problems = response.get("result", {}).get("problems", [])
+                except Exception:
+                    problems = None
+                if problems:
+                    break
+                time.sleep(PREFETCH_RETRY_DELAY)
+
+            if not problems:
+                return {"status": "FAILED", "comment": f"Problems of contest {contest_id} are not available yet"}
+
+            indexes = [p["index"] for p in problems if p.get("index")]
+            samples = list(self.session.get_executor().map(
+                lambda index: self.get_samples(contest_id, index, refresh=True), indexes
+            ))
+
+            files = []
+            if generate:
+                generated = self.generate_contest_files(contest_id, template_dir, jobs=len(indexes))
+                if generated.get("status") != "OK":
+                    return generated
+                files = generated["result"]["files"]
+
             return {"status": "OK", "result": {
-                "filename": output_filename,
-                "url": problem_url
+                "problems": problems,
+                "samples": {index: sample for index, sample in zip(indexes, samples)},
+                "files": files,
+                "elapsed": time.perf_counter() - started
             }}
             
         except Exception as e:
-            return {"status": "FAILED", "comment": str(e)} 
\ No newline at end of file
+            return {"status": "FAILED", "comment": str(e)}
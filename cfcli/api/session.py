@@ -1,62 +1,206 @@
 import os
+import re
 import json
+import atexit
 import time
 import random
 import string
 import hashlib
-import requests
+import threading
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+from ..utils.cache import ResponseCache, make_cache_key
+from ..utils.trace import tracer
+from ..utils.scheduler import (RequestScheduler, TransientError, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND,
+                               API_RATE)
+
+REFRESH_EXIT_WAIT = 5.0  # Seconds a finished command waits for background refreshes
 
 class CFSession:
-    def __init__(self):
+    def __init__(self, offline: bool = False):
         self.handle = os.getenv("CF_HANDLE")
         self.api_key = os.getenv("CF_API_KEY")
         self.api_secret = os.getenv("CF_API_SECRET")
-        self.session = requests.Session()
+        self.password = os.getenv("CF_PASSWORD")
+        self._session = None
+        self._cookies = []
         self.csrf_token = None
         self.logged_in = False
         
         # Constants
-        self.CF_API_BASE = "https://codeforces.com/api/"
-        self.CF_BASE_URL = "https://codeforces.com/"
+        # urljoin drops the last path segment of a base without a trailing slash
+        self.CF_BASE_URL = os.getenv("CFCLI_BASE_URL", "https://codeforces.com/").rstrip("/") + "/"
+        self.CF_API_BASE = urljoin(self.CF_BASE_URL, "api/")
         self.CACHE_DIR = Path.home() / ".cfcli" / "cache"
-        self.CACHE_TTL = 300  # 5 minutes
+        self.WEB_SESSION_FILE = Path.home() / ".cfcli" / "web_session.json"
         
-        # Ensure cache directory exists
-        self.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Persistent response cache, opened on first use
+        self._cache = None
+
+        # Serve cached data without touching the network
+        self.set_offline(offline)
+
+        # Age in seconds of the oldest stale data served per method, for the CLI to report
+        self.stale_served: Dict[str, float] = {}
+        self._revalidating = set()
+        self._refreshes: List[threading.Thread] = []
+        self._waits_at_exit = False
+
+        # Rate limiting, request coalescing and retries for API calls
+        self.scheduler = RequestScheduler(rate=float(os.getenv("CFCLI_API_RATE", API_RATE)))
+
+        self.MAX_WORKERS = 8
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+        # Reuse the website login from a previous run if there is one
+        self._load_web_session()
+
+    def set_offline(self, offline: bool) -> None:
+        """Only serve cached data, for --offline or when CFCLI_OFFLINE=1"""
+        self.offline = offline or os.getenv("CFCLI_OFFLINE") == "1"
+
+    @property
+    def session(self):
+        """Get the HTTP session, importing requests and restoring saved cookies on first use
+
+        Commands answered from the cache never pay for importing requests.
+        """
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            # Keep-alive connection pool shared by concurrent calls
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=self.MAX_WORKERS)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            for cookie in self._cookies:
+                session.cookies.set(
+                    cookie["name"], cookie["value"],
+                    domain=cookie.get("domain", ""), path=cookie.get("path", "/"),
+                    expires=cookie.get("expires"), secure=cookie.get("secure", False)
+                )
+            self._session = session
+        return self._session
+
+    @property
+    def cache(self) -> ResponseCache:
+        """Get the response cache, creating the cache directory on first use"""
+        if self._cache is None:
+            self._cache = ResponseCache(self.CACHE_DIR)
+        return self._cache
 
     def is_authenticated(self) -> bool:
         return self.handle and self.api_key and self.api_secret
 
-    def _get_from_cache(self, key: str) -> Optional[Dict]:
-        """Get data from cache if valid"""
-        cache_file = self.CACHE_DIR / f"{key}.json"
-        if not cache_file.exists():
-            return None
-            
-        # Check if cache is still valid
-        file_time = datetime.fromtimestamp(cache_file.stat().st_mtime)
-        if datetime.now() - file_time > timedelta(seconds=self.CACHE_TTL):
-            return None
-            
+    def _load_web_session(self) -> None:
+        """Restore the cookie jar and CSRF token saved by a previous run"""
+        try:
+            with open(self.WEB_SESSION_FILE, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        # Sessions belong to a handle; ignore one saved for somebody else
+        if self.handle and state.get("handle") != self.handle:
+            return
+
+        # Applied to the HTTP session when it is created
+        self._cookies = state.get("cookies", [])
+        self.csrf_token = state.get("csrf_token")
+        self.logged_in = bool(state.get("cookies"))
+
+    def save_web_session(self) -> None:
+        """Persist the cookie jar and CSRF token, readable only by the current user"""
+        state = {
+            "handle": self.handle,
+            "csrf_token": self.csrf_token,
+            "cookies": [
+                {
+                    "name": c.name,
+                    "value": c.value,
+                    "domain": c.domain,
+                    "path": c.path,
+                    "expires": c.expires,
+                    "secure": c.secure
+                }
+                for c in self.session.cookies
+            ]
+        }
         try:
-            with open(cache_file, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return None
+            self.WEB_SESSION_FILE.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.WEB_SESSION_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(state, f)
+            os.chmod(self.WEB_SESSION_FILE, 0o600)
+        except OSError:
+            print(f"Warning: Could not save web session.")
 
-    def _save_to_cache(self, key: str, data: Dict) -> None:
+    def invalidate_web_session(self) -> None:
+        """Forget an expired or rejected website session"""
+        self._cookies = []
+        if self._session is not None:
+            self._session.cookies.clear()
+        self.csrf_token = None
+        self.logged_in = False
+        try:
+            self.WEB_SESSION_FILE.unlink()
+        except OSError:
+            pass
+
+    def extract_csrf_token(self, html: str) -> Optional[str]:
+        match = re.search(r'name="X-Csrf-Token" content="([^"]+)"', html)
+        if not match:
+            match = re.search(r"data-csrf='([^']+)'", html)
+        return match.group(1) if match else None
+
+    def web_login(self) -> bool:
+        """Log in to the Codeforces website using CF_HANDLE and CF_PASSWORD"""
+        if not self.handle or not self.password:
+            print(f"Error: Set CF_HANDLE and CF_PASSWORD to log in to the website.")
+            return False
+
+        login_url = urljoin(self.CF_BASE_URL, "enter")
+        response = self.session.get(login_url)
+        csrf_token = self.extract_csrf_token(response.text)
+        if not csrf_token:
+            return False
+
+        response = self.session.post(login_url, data={
+            "csrf_token": csrf_token,
+            "action": "enter",
+            "handleOrEmail": self.handle,
+            "password": self.password,
+            "remember": "on"
+        })
+
+        # A successful login redirects away from the login page and shows a logout link
+        if "logout" not in response.text:
+            return False
+
+        self.csrf_token = self.extract_csrf_token(response.text) or csrf_token
+        self.logged_in = True
+        self.save_web_session()
+        return True
+
+    def _save_to_cache(self, key: str, method: str, data: Dict, ttl: Optional[float]) -> None:
         """Save data to cache"""
-        cache_file = self.CACHE_DIR / f"{key}.json"
         try:
-            with open(cache_file, 'w') as f:
-                json.dump(data, f)
-        except IOError:
+            self.cache.put(key, method, data, ttl)
+        except Exception:
             print(f"Warning: Could not cache data.")
 
+    def _ttl_for(self, method: str, data: Dict) -> Optional[float]:
+        """Pick the cache lifetime for a successful response"""
+        if method == "contest.standings":
+            contest = data.get("result", {}).get("contest", {})
+            if contest.get("phase") == "FINISHED":
+                return None  # Standings of finished contests never change
+        return self.cache.ttl_for(method)
+
     def _generate_signature(self, method: str, params: Dict[str, str]) -> str:
         """Generate API signature for request"""
         # Sort parameters by key
@@ -77,17 +221,8 @@ class CFSession:
         prefix = str(random.randint(100000, 999999))
         return f"{prefix}{signature}"
 
-    def call_api(self, method: str, params: Optional[Dict[str, str]] = None) -> Dict:
-        """Make an authenticated call to the Codeforces API"""
-        if params is None:
-            params = {}
-
-        cache_key = f"{method}_{hash(frozenset(params.items()))}"
-        cached_data = self._get_from_cache(cache_key)
-        
-        if cached_data:
-            return cached_data
-
+    def _request(self, method: str, params: Dict[str, str], info: Optional[Dict] = None) -> Dict:
+        """Send a single signed API request"""
         url = urljoin(self.CF_API_BASE, method)
         
         if self.is_authenticated():
@@ -107,19 +242,177 @@ class CFSession:
             # Add signature
             params["apiSig"] = self._generate_signature(method, params)
 
+        import requests
+
         try:
             response = self.session.get(url, params=params)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise TransientError(f"Network error: {e}") from e
+
+        if info is not None:
+            info["size"] = len(response.content)
+
+        if response.status_code == 429 or response.status_code >= 500:
+            raise TransientError(f"HTTP Error: {response.status_code}")
+
+        try:
+            with tracer.span("json.parse", "api", method=method):
+                data = response.json()
+        except ValueError:
             response.raise_for_status()
-            data = response.json()
+            raise
+
+        comment = data.get("comment", "") or ""
+        if data.get("status") != "OK" and "limit exceeded" in comment.lower():
+            raise TransientError(f"API Error: {comment}")
+
+        # API failures come back as JSON with a 4xx status and a comment
+        if "status" not in data:
+            response.raise_for_status()
+        return data
+
+    def call_api(self, method: str, params: Optional[Dict[str, str]] = None,
+                 ttl: Optional[float] = None, refresh: bool = False, cache: bool = True,
+                 priority: int = PRIORITY_INTERACTIVE) -> Dict:
+        """Make an authenticated call to the Codeforces API"""
+        if params is None:
+            params = {}
+
+        started = time.perf_counter()
+        cache_key = make_cache_key(method, params)
+
+        # Fresh entries are returned as is; stale ones are returned immediately
+        # while a background refresh updates the cache
+        entry = None
+        if cache and (not refresh or self.offline):
+            entry = self.cache.get_entry(cache_key, stale=True, any_age=self.offline)
+        if entry:
+            if entry["fresh"]:
+                tracer.record_call(method, started, time.perf_counter() - started, "hit")
+                return entry["data"]
+            tracer.record_call(method, started, time.perf_counter() - started, "stale")
+            self.mark_stale(method, entry["age"])
+            if not self.offline:
+                self.revalidate(method, params, ttl=ttl)
+            return entry["data"]
+
+        if self.offline:
+            raise Exception(f"Offline: no cached response for {method}")
+
+        import requests
+
+        info = {}
+        try:
+            # Identical concurrent calls share one rate-limited, retried request
+            try:
+                data = self.scheduler.run(cache_key, lambda: self._request(method, params, info), priority, info)
+            finally:
+                tracer.record_call(method, started, time.perf_counter() - started,
+                                   "miss" if cache else "skip", info.get("size", 0), info.get("retries", 0))
             
             if data.get("status") == "OK":
-                self._save_to_cache(cache_key, data)
+                if cache:
+                    self._save_to_cache(cache_key, method, data,
+                                        ttl if ttl is not None else self._ttl_for(method, data))
                 return data
             else:
                 raise Exception(f"API Error: {data.get('comment', 'Unknown error')}")
-        except requests.RequestException as e:
+        except (requests.RequestException, TransientError) as e:
+            # Rather than failing, fall back to any cached copy however old
+            fallback = self.cache.get_entry(cache_key, any_age=True) if cache and not refresh else None
+            if fallback:
+                self.mark_stale(method, fallback["age"])
+                return fallback["data"]
             print(f"Network error: {e}")
             raise
         except Exception as e:
             print(f"Error: {e}")
-            raise 
\ No newline at end of file
+            raise
+
+    def mark_stale(self, method: str, age: float) -> None:
+        """Remember that stale data of the given age was served for a method"""
+        self.stale_served[method] = max(age, self.stale_served.get(method, 0.0))
+
+    def revalidate(self, method: str, params: Optional[Dict[str, str]] = None, ttl: Optional[float] = None,
+                   on_update: Optional[Any] = None) -> None:
+        """Refresh a cached response in the background, then pass it to on_update
+
+        The stale copy is returned right away and the refresh runs on a daemon
+        thread. A one-shot run waits for it at exit (see finish_refreshes);
+        the daemon process keeps running, so its refreshes simply finish.
+        """
+        key = make_cache_key(method, params)
+        with self._executor_lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def run():
+            try:
+                response = self.call_api(method, params, ttl=ttl, refresh=True, priority=PRIORITY_BACKGROUND)
+                if on_update is not None:
+                    on_update(response)
+            except Exception:
+                pass
+            finally:
+                with self._executor_lock:
+                    self._revalidating.discard(key)
+
+        thread = threading.Thread(target=run, name="cfcli-revalidate", daemon=True)
+        thread.start()
+        with self._executor_lock:
+            if not self._waits_at_exit:
+                atexit.register(self.finish_refreshes)
+                self._waits_at_exit = True
+            # Drop finished refreshes so a long-running daemon does not collect them
+            self._refreshes = [t for t in self._refreshes if t.is_alive()] + [thread]
+
+    def finish_refreshes(self, timeout: float = REFRESH_EXIT_WAIT) -> bool:
+        """Wait up to timeout seconds for background refreshes; returns whether all of them finished"""
+        deadline = time.monotonic() + timeout
+        with self._executor_lock:
+            threads = list(self._refreshes)
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        return not any(thread.is_alive() for thread in threads)
+
+    def use_stale_index(self, method: str, refreshed_at: float, on_update: Any) -> bool:
+        """Decide whether a local index built from a method may be used while it is stale
+
+        If so, a background refresh passes the new response to on_update.
+        """
+        if not refreshed_at:
+            return False
+        age = time.time() - refreshed_at
+        if not self.offline and age > self.cache.ttl_for(method) + self.cache.max_stale_for(method):
+            return False
+        self.mark_stale(method, age)
+        if not self.offline:
+            self.revalidate(method, on_update=on_update)
+        return True
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        """Get the shared worker pool, creating it on first use"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS,
+                                                    thread_name_prefix="cfcli-api")
+            return self._executor
+
+    def call_many(self, calls: List[Tuple[str, Optional[Dict[str, str]]]],
+                  priority: int = PRIORITY_INTERACTIVE, **kwargs) -> List[Dict]:
+        """Make several API calls concurrently, returning responses in order
+
+        Calls still go through the cache and the rate-limiting scheduler.
+        A failed call yields a FAILED response instead of raising.
+        """
+        def run(call: Tuple[str, Optional[Dict[str, str]]]) -> Dict:
+            method, params = call
+            try:
+                return self.call_api(method, params, priority=priority, **kwargs)
+            except Exception as e:
+                return {"status": "FAILED", "comment": str(e)}
+
+        if len(calls) <= 1:
+            return [run(call) for call in calls]
+        return list(self.get_executor().map(run, calls))
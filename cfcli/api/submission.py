@@ -1,8 +1,19 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 import re
+import time
 from pathlib import Path
 from urllib.parse import urljoin
 from .session import CFSession
+from ..utils.history import SubmissionHistory
+
+WATCH_MIN_INTERVAL = 2.0  # The API allows one call every two seconds
+WATCH_MAX_INTERVAL = 15.0
+WATCH_WINDOW = 20  # Most recent submissions scanned per poll
+HISTORY_PAGE_SIZE = 1000
+
+def is_final(submission: Dict) -> bool:
+    """Check whether a submission has a final verdict"""
+    return submission.get("verdict") not in (None, "", "TESTING")
 
 class SubmissionAPI:
     def __init__(self, session: CFSession):
@@ -11,55 +22,75 @@ class SubmissionAPI:
     def submit_solution(self, contest_id: int, problem_index: str, source_code: str) -> Dict:
         """Submit a solution to Codeforces"""
         try:
-            # Ensure we're logged in to the website
-            if not self.session.logged_in:
-                if not self.session.web_login():
-                    return {"status": "FAILED", "comment": "Failed to log in to Codeforces website"}
-            
-            # Prepare submission
-            submit_url = urljoin(self.session.CF_BASE_URL, f"contest/{contest_id}/submit")
-            
-            # Get CSRF token if needed
-            if not self.session.csrf_token:
-                response = self.session.session.get(submit_url)
-                csrf_pattern = r'name="X-Csrf-Token" content="([^"]+)"'
-                match = re.search(csrf_pattern, response.text)
-                if not match:
-                    return {"status": "FAILED", "comment": "Could not extract CSRF token"}
-                self.session.csrf_token = match.group(1)
-            
-            # Prepare form data
-            submit_data = {
-                "csrf_token": self.session.csrf_token,
-                "action": "submitSolutionFormSubmitted",
-                "submittedProblemIndex": problem_index,
-                "programTypeId": "54",  # ID for C++17
-                "source": source_code,
-                "tabSize": "4",
-                "sourceFile": ""
-            }
-            
-            # Submit solution
-            response = self.session.session.post(submit_url, data=submit_data)
-            
-            if "You have submitted exactly the same code" in response.text:
-                return {"status": "FAILED", "comment": "You have submitted exactly the same code before"}
-            
-            # Check if submission was successful
-            if f"contest/{contest_id}/my" in response.url:
-                # Extract submission ID
-                match = re.search(r'submissionId="(\d+)"', response.text)
-                if match:
-                    submission_id = match.group(1)
-                    return {"status": "OK", "result": {"submission_id": submission_id}}
-                else:
-                    return {"status": "FAILED", "comment": "Could not extract submission ID"}
-            else:
-                return {"status": "FAILED", "comment": "Submission failed"}
+            # A saved session is trusted until the site rejects it, then we log in once more
+            for attempt in range(2):
+                result = self._post_submission(contest_id, problem_index, source_code)
+                if result.get("status") != "REJECTED":
+                    return result
+                self.session.invalidate_web_session()
+                
+            return {"status": "FAILED", "comment": "Codeforces rejected the web session"}
                 
         except Exception as e:
             return {"status": "FAILED", "comment": str(e)}
 
+    def _post_submission(self, contest_id: int, problem_index: str, source_code: str) -> Dict:
+        """POST a solution, reusing the saved login and CSRF token when available"""
+        # Ensure we're logged in to the website
+        if not self.session.logged_in:
+            if not self.session.web_login():
+                return {"status": "FAILED", "comment": "Failed to log in to Codeforces website"}
+        
+        # Prepare submission
+        submit_url = urljoin(self.session.CF_BASE_URL, f"contest/{contest_id}/submit")
+        
+        # Get CSRF token if needed
+        if not self.session.csrf_token:
+            response = self.session.session.get(submit_url)
+            if "/enter" in response.url:
+                return {"status": "REJECTED"}
+            csrf_token = self.session.extract_csrf_token(response.text)
+            if not csrf_token:
+                return {"status": "FAILED", "comment": "Could not extract CSRF token"}
+            self.session.csrf_token = csrf_token
+            self.session.save_web_session()
+        
+        # Prepare form data
+        submit_data = {
+            "csrf_token": self.session.csrf_token,
+            "action": "submitSolutionFormSubmitted",
+            "submittedProblemIndex": problem_index,
+            "programTypeId": "54",  # ID for C++17
+            "source": source_code,
+            "tabSize": "4",
+            "sourceFile": ""
+        }
+        
+        # Submit solution
+        response = self.session.session.post(submit_url, data=submit_data)
+        
+        # Expired cookies redirect to the login page, a stale token is refused outright
+        if "/enter" in response.url or response.status_code == 403:
+            return {"status": "REJECTED"}
+        
+        if "You have submitted exactly the same code" in response.text:
+            return {"status": "FAILED", "comment": "You have submitted exactly the same code before"}
+        
+        # Check if submission was successful
+        if f"contest/{contest_id}/my" in response.url:
+            # Keep any refreshed cookies for the next run
+            self.session.save_web_session()
+            
+            # Extract submission ID
+            match = re.search(r'submissionId="(\d+)"', response.text)
+            if match:
+                submission_id = match.group(1)
+                return {"status": "OK", "result": {"submission_id": submission_id}}
+            else:
+                return {"status": "FAILED", "comment": "Could not extract submission ID"}
+        else:
+            return {"status": "FAILED", "comment": "Submission failed"}
+
     def get_submission_status(self, submission_id: str) -> Dict:
         """Get submission status"""
         try:
@@ -79,4 +110,107 @@ class SubmissionAPI:
             return {"status": "OK", "result": data}
             
         except Exception as e:
-            return {"status": "FAILED", "comment": str(e)} 
\ No newline at end of file
+            return {"status": "FAILED", "comment": str(e)}
+
+    def get_recent_submissions(self, handle: str, contest_id: Optional[int] = None,
+                               count: int = WATCH_WINDOW) -> Dict:
+        """Get a handle's most recent submissions with one uncached call"""
+        try:
+            if contest_id:
+                response = self.session.call_api("contest.status", {
+                    "contestId": contest_id,
+                    "handle": handle,
+                    "from": 1,
+                    "count": count
+                }, cache=False)
+            else:
+                response = self.session.call_api("user.status", {
+                    "handle": handle,
+                    "from": 1,
+                    "count": count
+                }, cache=False)
+                
+            if response.get("status") != "OK":
+                return {"status": "FAILED", "comment": response.get("comment", "Unknown error")}
+                
+            return {"status": "OK", "result": response.get("result", [])}
+            
+        except Exception as e:
+            return {"status": "FAILED", "comment": str(e)}
+
+    def watch_submissions(self, handle: str, contest_id: Optional[int] = None,
+                          submission_ids: Optional[List[int]] = None) -> Iterator[List[Dict]]:
+        """Poll a handle's submissions until all tracked ones reach a final verdict
+
+        Yields the tracked submissions after every poll. Without explicit IDs,
+        every submission still pending on the first poll is tracked. Polling
+        stays fast while tests progress and backs off while nothing changes.
+        """
+        tracked = {int(sid) for sid in submission_ids} if submission_ids else None
+        interval = WATCH_MIN_INTERVAL
+        previous = None
+
+        while True:
+            response = self.get_recent_submissions(handle, contest_id)
+            if response.get("status") != "OK":
+                raise Exception(response.get("comment", "Unknown error"))
+
+            recent = response["result"]
+            if tracked is None:
+                tracked = {s["id"] for s in recent if not is_final(s)}
+            elif previous is None:
+                # Submissions older than the polled window cannot be watched
+                tracked &= {s.get("id") for s in recent}
+
+            submissions = [s for s in recent if s.get("id") in tracked]
+            yield submissions
+
+            if len(submissions) == len(tracked) and all(is_final(s) for s in submissions):
+                return
+
+            # Back off only while nothing changes
+            snapshot = [(s.get("id"), s.get("verdict"), s.get("passedTestCount")) for s in submissions]
+            if snapshot == previous:
+                interval = min(interval * 1.5, WATCH_MAX_INTERVAL)
+            else:
+                interval = WATCH_MIN_INTERVAL
+            previous = snapshot
+
+            time.sleep(interval)
+
+    def iter_user_status(self, handle: str, since: int = 0, page_size: int = HISTORY_PAGE_SIZE) -> Iterator[List[Dict]]:
+        """Yield a handle's submissions newer than ``since`` page by page, newest first"""
+        start = 1
+        while True:
+            response = self.session.call_api("user.status", {
+                "handle": handle,
+                "from": start,
+                "count": page_size
+            }, cache=False)
+            if response.get("status") != "OK":
+                raise Exception(response.get("comment", "Unknown error"))
+
+            page = response.get("result", [])
+            newer = [s for s in page if s.get("id", 0) > since]
+            if newer:
+                yield newer
+            if len(newer) < len(page) or len(page) < page_size:
+                return
+            start += page_size
+
+    def sync_history(self, history: SubmissionHistory) -> Dict:
+        """Bring a local submission history up to date, fetching only new submissions"""
+        try:
+            # Submissions still being judged are refetched to pick up their verdicts
+            history.drop_pending()
+
+            pages = list(self.iter_user_status(history.handle, since=history.last_id))
+            added = 0
+            for page in reversed(pages):
+                added += history.append(reversed(page))
+            history.save()
+
+            return {"status": "OK", "result": {"added": added, "total": len(history)}}
+
+        except Exception as e:
+            return {"status": "FAILED", "comment": str(e)}
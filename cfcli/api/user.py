@@ -0,0 +1,186 @@
+import re
+import time
+from typing import Dict, List
+from .session import CFSession
+from ..utils.cache import make_cache_key
+
+# user.info accepts up to 10000 handles per call, but they travel in the query
+# string, so batches are also capped by length to stay within URL limits.
+USER_INFO_MAX_HANDLES = 10000
+USER_INFO_MAX_CHARS = 6000
+
+# user.rating takes a single handle. A history only changes after a rated
+# contest, which also changes the rating user.info reports, so histories are
+# kept for long and refetched only when the two disagree.
+RATING_HISTORY_TTL = 30 * 24 * 60 * 60
+
+MISSING_HANDLE = re.compile(r"User with handle (\S+) not found")
+
+
+def chunk_handles(handles: List[str], max_handles: int = USER_INFO_MAX_HANDLES,
+                  max_chars: int = USER_INFO_MAX_CHARS) -> List[List[str]]:
+    """Split handles into the fewest user.info batches within the count and length limits"""
+    batches, batch, length = [], [], 0
+    for handle in handles:
+        if batch and (len(batch) >= max_handles or length + len(handle) + 1 > max_chars):
+            batches.append(batch)
+            batch, length = [], 0
+        batch.append(handle)
+        length += len(handle) + 1
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+class UserAPI:
+    def __init__(self, session: CFSession):
+        self.session = session
+
+    def get_friends(self) -> Dict:
+        """Fetch the authenticated user's friends"""
+        try:
+            if not self.session.is_authenticated():
+                return {"status": "FAILED", "comment": "Listing friends requires CF_HANDLE, CF_API_KEY and CF_API_SECRET"}
+
+            response = self.session.call_api("user.friends", {"onlyOnline": "false"})
+            if response.get("status") != "OK":
+                return {"status": "FAILED", "comment": response.get("comment", "Unknown error")}
+
+            return {"status": "OK", "result": response.get("result", [])}
+
+        except Exception as e:
+            return {"status": "FAILED", "comment": str(e)}
+
+    def _fetch_info(self, handles: List[str], users: Dict[str, Dict], missing: List[str],
+                    failed: Dict[str, str]) -> int:
+        """Fetch user.info for handles in batches, caching each user; returns the number of requests
+
+        Handles of a batch that failed for another reason than an unknown
+        handle go to failed, with the error.
+        """
+        ttl = self.session.cache.ttl_for("user.info")
+        requests = 0
+        batches = chunk_handles(handles)
+        while batches:
+            responses = self.session.call_many([("user.info", {"handles": ";".join(batch)}) for batch in batches],
+                                               cache=False)
+            requests += len(batches)
+            retry = []
+            for batch, response in zip(batches, responses):
+                if response.get("status") == "OK":
+                    result = response.get("result", [])
+                    # Results follow the request order, which also maps renamed handles
+                    keys = batch if len(result) == len(batch) else [user["handle"] for user in result]
+                    for handle, user in zip(keys, result):
+                        users[handle.lower()] = user
+                        self.session.cache.put(make_cache_key("user.info", {"handles": handle.lower()}),
+                                               "user.info", {"status": "OK", "result": [user]}, ttl)
+                    continue
+
+                # One unknown handle fails the whole batch; drop it and retry the rest
+                comment = response.get("comment", "Unknown error")
+                match = MISSING_HANDLE.search(comment)
+                rest = [h for h in batch if not match or h.lower() != match.group(1).lower()]
+                if len(rest) == len(batch):
+                    failed.update((handle, comment) for handle in batch)
+                    continue
+                missing.append(match.group(1))
+                if rest:
+                    retry.append(rest)
+            batches = retry
+        return requests
+
+    def get_users(self, handles: List[str], refresh: bool = False, history: bool = False) -> Dict:
+        """Look up many users with batched user.info calls and per-handle caching
+
+        Each user is cached on its own, so overlapping handle lists share
+        entries and only expired handles are fetched again. With history,
+        contest activity comes from each user's rating history, at one
+        user.rating request per handle not cached.
+        """
+        try:
+            started = time.perf_counter()
+            cache = self.session.cache
+            handles = list({h.strip().lower(): h.strip() for h in handles if h.strip()}.values())
+
+            users, stale, pending = {}, {}, []
+            for handle in handles:
+                entry = None
+                if not refresh or self.session.offline:
+                    entry = cache.get_entry(make_cache_key("user.info", {"handles": handle.lower()}), any_age=True)
+                if entry and (entry["fresh"] or self.session.offline):
+                    users[handle.lower()] = entry["data"]["result"][0]
+                    continue
+                if entry:
+                    stale[handle.lower()] = (entry["data"]["result"][0], entry["age"])
+                if not self.session.offline:
+                    pending.append(handle)
+            cached = len(users)
+
+            missing, failed, requests = [], {}, 0
+            if pending:
+                requests += self._fetch_info(pending, users, missing, failed)
+                # Fall back to expired copies rather than dropping users whose batch failed
+                for handle in list(failed):
+                    if handle.lower() in stale:
+                        user, age = stale[handle.lower()]
+                        users[handle.lower()] = user
+                        self.session.mark_stale("user.info", age)
+                        del failed[handle]
+                if failed and not users:
+                    raise Exception(next(iter(failed.values())))
+
+            histories = {}
+            if history:
+                fetch = []
+                for handle in handles:
+                    user = users.get(handle.lower())
+                    if not user or user.get("rating") is None:
+                        continue
+                    entry = None
+                    if not refresh or self.session.offline:
+                        entry = cache.get_entry(make_cache_key("user.rating", {"handle": user["handle"]}), any_age=True)
+                    changes = entry["data"].get("result", []) if entry else []
+                    if entry and (self.session.offline or (entry["fresh"] and changes
+                                                           and changes[-1].get("newRating") == user["rating"])):
+                        histories[user["handle"]] = changes
+                    elif not self.session.offline:
+                        fetch.append(user["handle"])
+
+                responses = self.session.call_many([("user.rating", {"handle": h}) for h in fetch],
+                                                   refresh=True, ttl=RATING_HISTORY_TTL)
+                requests += len(fetch)
+                for handle, response in zip(fetch, responses):
+                    if response.get("status") == "OK":
+                        histories[handle] = response.get("result", [])
+
+            result = []
+            for handle in handles:
+                user = users.get(handle.lower())
+                if not user:
+                    continue
+                changes = histories.get(user["handle"])
+                last = changes[-1] if changes else None
+                result.append({
+                    "handle": user["handle"],
+                    "rating": user.get("rating"),
+                    "maxRating": user.get("maxRating"),
+                    "rank": user.get("rank"),
+                    "lastOnline": user.get("lastOnlineTimeSeconds"),
+                    "contests": len(changes) if changes is not None else None,
+                    "lastContest": last.get("ratingUpdateTimeSeconds") if last else None,
+                    "lastDelta": last["newRating"] - last["oldRating"] if last else None
+                })
+
+            return {"status": "OK", "result": {
+                "users": result,
+                "missing": missing,
+                "failed": list(failed),
+                "error": next(iter(failed.values()), None),
+                "requests": requests,
+                "cached": cached,
+                "elapsed": time.perf_counter() - started
+            }}
+
+        except Exception as e:
+            return {"status": "FAILED", "comment": str(e)}
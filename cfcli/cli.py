@@ -0,0 +1,13 @@
+import sys
+
+
+def main():
+    """Console entry point: forward to a running daemon, else run in-process"""
+    from .utils.daemon import forward
+
+    code = forward(sys.argv[1:])
+    if code is not None:
+        sys.exit(code)
+
+    from .commands.cli import cli
+    cli(prog_name="cfcli")
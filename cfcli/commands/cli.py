@@ -1,26 +1,143 @@
+import os
+import re
 import click
-import colorama
-from colorama import Fore, Style
+from colorama import Fore, Style, Cursor
+from colorama.ansi import clear_line
 from pathlib import Path
 from datetime import datetime
-from ..api.session import CFSession
-from ..api.contest import ContestAPI
-from ..api.problem import ProblemAPI
-from ..api.submission import SubmissionAPI
+from collections import Counter
+from ..utils.trace import tracer
+from .table import Column, Table
 
-# Initialize colorama
-colorama.init()
+# The session and API objects pull in requests and touch ~/.cfcli, so they
+# are only imported and built the first time a command needs them.
+_instances = {}
 
-# Initialize global session and APIs
-cf_session = CFSession()
-contest_api = ContestAPI(cf_session)
-problem_api = ProblemAPI(cf_session)
-submission_api = SubmissionAPI(cf_session)
+# Global options of the current command; the daemon runs many commands in one process
+_options = {"offline": False, "no_pager": False, "daemon": False}
+
+def get_session():
+    """Get the shared CFSession, creating it on first use"""
+    if "session" not in _instances:
+        from ..api.session import CFSession
+        _instances["session"] = CFSession(offline=_options["offline"])
+    return _instances["session"]
+
+def show_table(table, pages=None):
+    """Show a table, or stream pages of rows into it, paging unless --no-pager was given"""
+    pager = False if _options["no_pager"] else None
+    if pages is not None:
+        return table.show_pages(pages, pager=pager)
+    table.show(pager=pager)
+
+def get_contest_api():
+    if "contest" not in _instances:
+        from ..api.contest import ContestAPI
+        _instances["contest"] = ContestAPI(get_session())
+    return _instances["contest"]
+
+def get_problem_api():
+    if "problem" not in _instances:
+        from ..api.problem import ProblemAPI
+        _instances["problem"] = ProblemAPI(get_session())
+    return _instances["problem"]
+
+def get_submission_api():
+    if "submission" not in _instances:
+        from ..api.submission import SubmissionAPI
+        _instances["submission"] = SubmissionAPI(get_session())
+    return _instances["submission"]
+
+def get_user_api():
+    if "user" not in _instances:
+        from ..api.user import UserAPI
+        _instances["user"] = UserAPI(get_session())
+    return _instances["user"]
+
+def get_compile_cache():
+    if "compile_cache" not in _instances:
+        from ..utils.compile_cache import CompileCache
+        _instances["compile_cache"] = CompileCache(
+            Path.home() / ".cfcli" / "build",
+            template_file=get_problem_api().template_dir / "template.cpp"
+        )
+    return _instances["compile_cache"]
+
+TRACE_LOG = Path.home() / ".cfcli" / "traces.jsonl"
+HISTORY_DIR = Path.home() / ".cfcli" / "history"
+
+def finish_trace(trace, trace_file):
+    """Log this run's API calls and emit the trace requested with --trace"""
+    import sys
+    import json
+    
+    tracer.append_to_log(TRACE_LOG)
+    if trace is None:
+        return
+    
+    if trace == 'summary':
+        output = tracer.summary()
+    elif trace == 'json':
+        output = json.dumps(tracer.to_json(), indent=2)
+    else:
+        output = json.dumps(tracer.to_chrome_trace())
+    
+    if trace_file:
+        with open(trace_file, 'w') as f:
+            f.write(output)
+        print(f"{Fore.CYAN}Trace written to {trace_file}{Style.RESET_ALL}", file=sys.stderr)
+    else:
+        print(output, file=sys.stderr)
+
+def format_age(seconds):
+    """Format an age in seconds as e.g. '45s', '12m', '3h' or '2d'"""
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{int(seconds // size)}{unit}"
+    return f"{int(seconds)}s"
+
+def report_stale_data():
+    """Tell the user when cached data past its TTL was shown"""
+    import sys
+    
+    session = _instances.get("session")
+    if session is None or not session.stale_served:
+        return
+    if session.offline:
+        note = "offline"
+    elif _options["daemon"]:
+        note = "refreshing in the background"
+    else:
+        note = "refreshing the cache before exiting"
+    for method, age in sorted(session.stale_served.items()):
+        print(f"{Fore.YELLOW}Showing cached {method} data from {format_age(age)} ago ({note}).{Style.RESET_ALL}",
+              file=sys.stderr)
 
 @click.group()
-def cli():
+@click.option('--trace', type=click.Choice(['summary', 'json', 'chrome']), default=None,
+              help='Record API calls and phase timings and print them when the command ends')
+@click.option('--trace-file', default=None, help='Write the trace to this file instead of stderr')
+@click.option('--offline', is_flag=True, help='Only use cached data, never contact Codeforces')
+@click.option('--no-pager', is_flag=True, help='Never page long tables')
+@click.pass_context
+def cli(ctx, trace, trace_file, offline, no_pager):
     """Codeforces CLI - Automate your CP workflow"""
-    pass
+    _options["daemon"] = bool((ctx.obj or {}).get("daemon"))
+    
+    # Only Windows consoles need colorama's wrapper; elsewhere it would just
+    # strip codes from piped output, one regex per write. The daemon is Unix only.
+    if not _options["daemon"] and os.name == "nt":
+        import colorama
+        colorama.init()
+    
+    _options["offline"] = offline
+    _options["no_pager"] = no_pager
+    if "session" in _instances:
+        _instances["session"].set_offline(offline)
+    
+    tracer.enabled = trace is not None
+    ctx.call_on_close(lambda: finish_trace(trace, trace_file))
+    ctx.call_on_close(report_stale_data)
 
 @cli.command()
 @click.option('--handle', prompt='Your Codeforces handle', help='Your Codeforces handle', 
@@ -32,6 +149,7 @@ def cli():
 def login(handle, key, secret):
     """Validate Codeforces credentials"""
     # Set credentials in session
+    cf_session = get_session()
     cf_session.handle = handle
     cf_session.api_key = key
     cf_session.api_secret = secret
@@ -52,13 +170,22 @@ def login(handle, key, secret):
 @cli.command()
 @click.argument('type', type=click.Choice(['upcoming', 'running', 'past']), default='upcoming')
 @click.option('--limit', default=5, help='Number of contests to show')
-def fetch(type, limit):
+@click.option('--from', 'since', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+              help='Only contests starting on or after this date (YYYY-MM-DD)')
+@click.option('--to', 'until', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+              help='Only contests starting before this date (YYYY-MM-DD)')
+@click.option('--name', default=None, help='Only contests whose name contains this text')
+@click.option('--division', type=click.Choice(['1', '2', '3', '4', '1+2']), default=None,
+              help='Only contests of this division')
+@click.option('--refresh', is_flag=True, help='Force a refresh of the local contest catalog')
+def fetch(type, limit, since, until, name, division, refresh):
     """Fetch contest information"""
-    if not cf_session.is_authenticated():
+    if not get_session().is_authenticated():
         print(f"{Fore.YELLOW}Not authenticated. Using public API access.{Style.RESET_ALL}")
     
     try:
-        response = contest_api.get_contests(type, limit)
+        response = get_contest_api().get_contests(type, limit, since=since, until=until, name=name,
+                                            division=division, refresh=refresh)
         if response.get("status") != "OK":
             print(f"{Fore.RED}Error fetching contests: {response.get('comment', 'Unknown error')}{Style.RESET_ALL}")
             return
@@ -70,16 +197,15 @@ def fetch(type, limit):
             print(f"{Fore.YELLOW}No {type} contests found.{Style.RESET_ALL}")
             return
         
-        print(f"\n{Fore.CYAN}== {type.capitalize()} Contests =={Style.RESET_ALL}")
-        print(f"{Fore.CYAN}{'ID':<8} {'Name':<50} {'Start Time':<25} {'Duration'}{Style.RESET_ALL}")
-        print("-" * 90)
-        
-        for contest in contests:
-            start_time = datetime.fromtimestamp(contest.get('startTimeSeconds', 0))
-            duration_mins = contest.get('durationSeconds', 0) // 60
-            duration_str = f"{duration_mins // 60}h {duration_mins % 60}m"
-            
-            print(f"{contest.get('id', 'N/A'):<8} {contest.get('name', 'Unknown')[:47]+'...' if len(contest.get('name', '')) > 50 else contest.get('name', 'Unknown'):<50} {start_time.strftime('%Y-%m-%d %H:%M:%S'):<25} {duration_str}")
+        table = Table([
+            Column('ID', lambda c: c.get('id')),
+            Column('Name', lambda c: c.get('name', 'Unknown'), max_width=50),
+            Column('Start Time', lambda c: c.get('startTimeSeconds', 0),
+                   fmt=lambda t: datetime.fromtimestamp(t).strftime('%Y-%m-%d %H:%M:%S')),
+            Column('Duration', lambda c: c.get('durationSeconds', 0) // 60, fmt=lambda m: f"{m // 60}h {m % 60}m"),
+        ], contests, title=f"{type.capitalize()} Contests")
+        with tracer.span("render", rows=len(table)):
+            show_table(table)
         
     except Exception as e:
         print(f"{Fore.RED}Error fetching contests: {e}{Style.RESET_ALL}")
@@ -89,7 +215,8 @@ def fetch(type, limit):
 @click.argument('problem_index', required=False)
 @click.option('--template-dir', default=None, help='Directory containing C++ templates')
 @click.option('--all', is_flag=True, help='Generate files for all problems in the contest')
-def generate(contest_id, problem_index, template_dir, all):
+@click.option('--jobs', default=1, help='Number of files to write in parallel with --all')
+def generate(contest_id, problem_index, template_dir, all, jobs):
     """Generate C++ source files for contest problems"""
     # Validate contest ID
     try:
@@ -99,32 +226,20 @@ def generate(contest_id, problem_index, template_dir, all):
         return
 
     if all:
-        # Fetch contest problems
+        # Fetch contest metadata once and write every problem file in one pass
         try:
-            response = contest_api.get_contest_problems(contest_id)
-            if response.get("status") != "OK":
-                print(f"{Fore.RED}Failed to fetch contest problems: {response.get('comment', 'Unknown error')}{Style.RESET_ALL}")
-                return
-                
-            problems = response.get("result", [])
+            print(f"{Fore.CYAN}Generating files for contest {contest_id}...{Style.RESET_ALL}")
             
-            if not problems:
-                print(f"{Fore.YELLOW}No problems found for contest {contest_id}.{Style.RESET_ALL}")
+            result = get_problem_api().generate_contest_files(contest_id, template_dir, jobs=jobs)
+            if result.get("status") != "OK":
+                print(f"{Fore.RED}Error generating files: {result.get('comment', 'Unknown error')}{Style.RESET_ALL}")
                 return
                 
-            print(f"{Fore.CYAN}Generating files for {len(problems)} problems in contest {contest_id}...{Style.RESET_ALL}")
-            
-            for problem in problems:
-                problem_index = problem.get("index")
-                if not problem_index:
-                    continue
-                    
-                result = problem_api.generate_problem_file(contest_id, problem_index, template_dir)
-                if result.get("status") == "OK":
-                    print(f"{Fore.GREEN}Created {result['result']['filename']} successfully!{Style.RESET_ALL}")
-                    print(f"{Fore.CYAN}Problem URL: {result['result']['url']}{Style.RESET_ALL}")
-                else:
-                    print(f"{Fore.RED}Error generating file: {result.get('comment', 'Unknown error')}{Style.RESET_ALL}")
+            for file_info in result["result"]["files"]:
+                print(f"{Fore.GREEN}Created {file_info['filename']} successfully!{Style.RESET_ALL}")
+                print(f"{Fore.CYAN}Problem URL: {file_info['url']}{Style.RESET_ALL}")
+                
+            print(f"{Fore.CYAN}Generated {len(result['result']['files'])} files in {result['result']['elapsed']:.2f}s.{Style.RESET_ALL}")
                     
         except Exception as e:
             print(f"{Fore.RED}Error: {e}{Style.RESET_ALL}")
@@ -140,13 +255,73 @@ def generate(contest_id, problem_index, template_dir, all):
             print(f"{Fore.RED}Problem index must be a letter optionally followed by a number (e.g., A, B, C1).{Style.RESET_ALL}")
             return
 
-        result = problem_api.generate_problem_file(contest_id, problem_index, template_dir)
+        result = get_problem_api().generate_problem_file(contest_id, problem_index, template_dir)
         if result.get("status") == "OK":
             print(f"{Fore.GREEN}Created {result['result']['filename']} successfully!{Style.RESET_ALL}")
             print(f"{Fore.CYAN}Problem URL: {result['result']['url']}{Style.RESET_ALL}")
         else:
             print(f"{Fore.RED}Error generating file: {result.get('comment', 'Unknown error')}{Style.RESET_ALL}")
 
+def resolve_problem(file_path):
+    """Get the contest ID and problem index from a solution filename, prompting if needed"""
+    match = re.match(r'Contest(\d+)_([A-Z][0-9]?)\.cpp', file_path.name)
+    if not match:
+        print(f"{Fore.YELLOW}Filename doesn't follow the expected pattern 'Contest{{contest_id}}_{{problem_index}}.cpp'.{Style.RESET_ALL}")
+        contest_id = click.prompt("Enter contest ID", type=int)
+        problem_index = click.prompt("Enter problem index (e.g., A, B, C1)", type=str).upper()
+        return contest_id, problem_index
+    return int(match.group(1)), match.group(2)
+
+@cli.command()
+@click.argument('contest_id', type=int)
+@click.option('--template-dir', default=None, help='Directory containing C++ templates')
+@click.option('--no-generate', is_flag=True, help='Only warm caches, do not write source files')
+@click.option('--wait/--no-wait', default=True, help='Wait for the contest to start')
+def prefetch(contest_id, template_dir, no_generate, wait):
+    """Wait for a contest to start, then fetch and cache all of its problems"""
+    import time
+    
+    contest = None
+    refresh = get_contest_api().refresh_catalog()
+    if refresh.get("status") == "OK":
+        contest = get_contest_api().catalog.get(contest_id)
+    
+    if wait and contest and contest.get("phase") == "BEFORE" and contest.get("startTimeSeconds"):
+        print(f"{Fore.CYAN}Waiting for {contest['name']} to start...{Style.RESET_ALL}")
+        try:
+            while True:
+                remaining = contest["startTimeSeconds"] - time.time()
+                if remaining <= 0:
+                    break
+                hours, rest = divmod(int(remaining), 3600)
+                print(f"\r{clear_line()}Starts in {hours:02d}:{rest // 60:02d}:{rest % 60:02d}", end="", flush=True)
+                time.sleep(min(1.0, remaining))
+            print()
+        except KeyboardInterrupt:
+            print(f"\n{Fore.YELLOW}Prefetch cancelled.{Style.RESET_ALL}")
+            return
+    
+    print(f"{Fore.CYAN}Prefetching contest {contest_id}...{Style.RESET_ALL}")
+    result = get_problem_api().prefetch_contest(contest_id, template_dir, generate=not no_generate)
+    if result.get("status") != "OK":
+        print(f"{Fore.RED}Prefetch failed: {result.get('comment', 'Unknown error')}{Style.RESET_ALL}")
+        return
+    
+    data = result["result"]
+    for problem in data["problems"]:
+        index = problem.get("index")
+        sample = data["samples"].get(index, {})
+        if sample.get("status") == "OK":
+            sample_info = f"{len(sample['result']['tests'])} samples"
+        else:
+            sample_info = f"{Fore.YELLOW}no samples ({sample.get('comment', 'Unknown error')}){Style.RESET_ALL}"
+        print(f"{Fore.GREEN}{index:<4}{Style.RESET_ALL} {problem.get('name', '')[:40]:<40} {sample_info}")
+    
+    for file_info in data["files"]:
+        print(f"{Fore.GREEN}Created {file_info['filename']}{Style.RESET_ALL}")
+    
+    print(f"{Fore.CYAN}Prefetched {len(data['problems'])} problems in {data['elapsed']:.2f}s.{Style.RESET_ALL}")
+
 @cli.command()
 @click.argument('filename')
 def submit(filename):
@@ -159,14 +334,7 @@ def submit(filename):
         return
     
     # Extract contest ID and problem index from filename
-    match = re.match(r'Contest(\d+)_([A-Z][0-9]?)\.cpp', file_path.name)
-    if not match:
-        print(f"{Fore.YELLOW}Filename doesn't follow the expected pattern 'Contest{contest_id}_{problem_index}.cpp'.{Style.RESET_ALL}")
-        contest_id = click.prompt("Enter contest ID", type=int)
-        problem_index = click.prompt("Enter problem index (e.g., A, B, C1)", type=str).upper()
-    else:
-        contest_id = int(match.group(1))
-        problem_index = match.group(2)
+    contest_id, problem_index = resolve_problem(file_path)
     
     # Read source code
     try:
@@ -177,7 +345,7 @@ def submit(filename):
         return
     
     # Submit solution
-    result = submission_api.submit_solution(contest_id, problem_index, source_code)
+    result = get_submission_api().submit_solution(contest_id, problem_index, source_code)
     if result.get("status") == "OK":
         submission_id = result["result"]["submission_id"]
         print(f"{Fore.GREEN}Solution submitted successfully!{Style.RESET_ALL}")
@@ -187,10 +355,23 @@ def submit(filename):
         print(f"{Fore.RED}Submission failed: {result.get('comment', 'Unknown error')}{Style.RESET_ALL}")
 
 @cli.command()
-@click.argument('submission_id', required=False)
+@click.argument('submission_id', type=int, required=False)
 @click.option('--contest-id', type=int, help='Contest ID to check status for all submissions')
-def status(submission_id, contest_id):
+@click.option('--since', type=int, default=None, help='Only show submissions newer than this submission ID')
+@click.option('--handle', default=None, help='Only show submissions by this handle')
+@click.option('--page-size', default=5000, help='Number of submissions fetched per request')
+@click.option('--watch', is_flag=True, help='Track pending submissions until they get a final verdict')
+@click.option('--verdict', default=None, help='Only show these comma-separated verdicts, e.g. OK,WRONG_ANSWER')
+@click.option('--problem', default=None, help='Only show these comma-separated problem indexes')
+@click.option('--sort', type=click.Choice(['id', 'problem', 'author', 'verdict', 'time', 'memory']), default=None,
+              help='Sort the contest listing by this column (default: newest first)')
+@click.option('--reverse', is_flag=True, help='Reverse the sort order')
+def status(submission_id, contest_id, since, handle, page_size, watch, verdict, problem, sort, reverse):
     """Check submission status"""
+    if watch:
+        watch_status(submission_id, contest_id, handle or get_session().handle)
+        return
+
     if not submission_id and not contest_id:
         print(f"{Fore.RED}Please provide either a submission ID or a contest ID.{Style.RESET_ALL}")
         return
@@ -198,7 +379,7 @@ def status(submission_id, contest_id):
     try:
         if submission_id:
             # Check status for a specific submission
-            result = submission_api.get_submission_status(submission_id)
+            result = get_submission_api().get_submission_status(submission_id)
             
             if result.get("status") == "IN_QUEUE":
                 print(f"{Fore.YELLOW}Submission is in queue...{Style.RESET_ALL}")
@@ -226,32 +407,753 @@ def status(submission_id, contest_id):
                 print(f"Tests: {passed}/{total}")
         
         else:
-            # Check all submissions for a contest
-            response = contest_api.get_contest_status(contest_id)
-            if response.get("status") != "OK":
-                print(f"{Fore.RED}Error fetching submissions: {response.get('comment', 'Unknown error')}{Style.RESET_ALL}")
-                return
-                
-            submissions = response.get("result", [])
+            # Fixed minimum widths keep streamed pages aligned with the first one
+            table = Table([
+                Column('ID', lambda s: s.id, min_width=10),
+                Column('Problem', lambda s: s.problem_index, min_width=7),
+                Column('Author', lambda s: s.author, max_width=24, min_width=16),
+                Column('Verdict', lambda s: s.verdict or "IN QUEUE", min_width=21, color=verdict_color),
+                Column('Time', lambda s: s.time_ms, fmt=lambda ms: f"{ms} ms", align='>', min_width=7),
+                Column('Memory', lambda s: s.memory_bytes // 1024, fmt=lambda kb: f"{kb} KB", align='>',
+                       min_width=9),
+            ], title=f"Submissions for Contest {contest_id}")
+            if verdict:
+                verdicts = {v.strip().upper() for v in verdict.split(',')}
+                table.filter(lambda s: (s.verdict or "IN QUEUE") in verdicts)
+            if problem:
+                indexes = {p.strip().upper() for p in problem.split(',')}
+                table.filter(lambda s: s.problem_index in indexes)
+            pages = get_contest_api().iter_contest_status(contest_id, handle=handle, since=since, page_size=page_size)
             
-            if not submissions:
+            if sort or reverse:
+                # Sorting needs the whole listing, so only then are all pages collected
+                for page in pages:
+                    table.extend(row for row in page if all(keep(row) for keep in table.filters))
+                if sort:
+                    table.sort(sort, reverse=reverse)
+                else:
+                    table.rows.reverse()
+                if table.rows:
+                    with tracer.span("render", rows=len(table)):
+                        show_table(table)
+            else:
+                # Newest first as the API returns them, one page in memory at a time
+                with tracer.span("render"):
+                    show_table(table, pages)
+            
+            if not len(table) and not table.streamed:
                 print(f"{Fore.YELLOW}No submissions found for contest {contest_id}.{Style.RESET_ALL}")
-                return
             
-            print(f"\n{Fore.CYAN}== Submissions for Contest {contest_id} =={Style.RESET_ALL}")
-            print(f"{Fore.CYAN}{'ID':<12} {'Problem':<10} {'Verdict':<15}{Style.RESET_ALL}")
-            print("-" * 40)
+    except Exception as e:
+        print(f"{Fore.RED}Error checking status: {e}{Style.RESET_ALL}")
+
+@cli.command()
+@click.argument('filename')
+@click.option('--time-limit', type=float, default=None, help='Time limit per test in seconds (default: from the statement)')
+@click.option('--memory-limit', type=int, default=None, help='Memory limit in megabytes (default: from the statement)')
+@click.option('--compiler', default='g++', help='C++ compiler to use')
+@click.option('--refresh', is_flag=True, help='Download the samples again')
+def test(filename, time_limit, memory_limit, compiler, refresh):
+    """Run a solution against the problem's sample tests"""
+    from ..utils.judge import run_tests, DEFAULT_TIME_LIMIT, DEFAULT_MEMORY_LIMIT
+    
+    file_path = Path(filename)
+    if not file_path.exists():
+        print(f"{Fore.RED}File {filename} not found.{Style.RESET_ALL}")
+        return
+    
+    contest_id, problem_index = resolve_problem(file_path)
+    
+    samples = get_problem_api().get_samples(contest_id, problem_index, refresh=refresh)
+    if samples.get("status") != "OK":
+        print(f"{Fore.RED}Error fetching samples: {samples.get('comment', 'Unknown error')}{Style.RESET_ALL}")
+        return
+    
+    tests = samples["result"]["tests"]
+    time_limit = time_limit or samples["result"].get("time_limit") or DEFAULT_TIME_LIMIT
+    memory_limit = memory_limit or samples["result"].get("memory_limit") or DEFAULT_MEMORY_LIMIT
+    
+    compiled = get_compile_cache().compile(file_path, compiler)
+    if compiled.get("status") != "OK":
+        print(f"{Fore.RED}Compilation failed:{Style.RESET_ALL}\n{compiled.get('comment', '')}")
+        return
+    
+    if compiled["result"]["cached"]:
+        print(f"{Fore.CYAN}Using cached binary.{Style.RESET_ALL}")
+    else:
+        print(f"{Fore.CYAN}Compiled in {compiled['result']['elapsed']:.2f}s.{Style.RESET_ALL}")
+    
+    results = run_tests(compiled["result"]["binary"], tests, time_limit, memory_limit)
+    
+    passed = 0
+    for number, (sample, result) in enumerate(zip(tests, results), 1):
+        verdict = result["verdict"]
+        elapsed_ms = int(result["elapsed"] * 1000)
+        if verdict == "OK":
+            passed += 1
+            print(f"{Fore.GREEN}Test {number}: OK{Style.RESET_ALL} ({elapsed_ms} ms)")
+            continue
+        
+        print(f"{Fore.RED}Test {number}: {verdict}{Style.RESET_ALL} ({elapsed_ms} ms)")
+        if verdict == "WRONG_ANSWER":
+            print(f"{Fore.CYAN}Input:{Style.RESET_ALL}\n{sample['input']}", end="")
+            print(f"{Fore.CYAN}Expected:{Style.RESET_ALL}\n{sample['output']}", end="")
+            print(f"{Fore.CYAN}Got:{Style.RESET_ALL}\n{result['output']}")
+        elif result.get("stderr"):
+            print(result["stderr"].rstrip())
+    
+    color = Fore.GREEN if passed == len(tests) else Fore.RED
+    print(f"{color}Passed {passed}/{len(tests)} samples.{Style.RESET_ALL}")
+
+def build_command(file_path, compiler):
+    """Get the command line that runs a C++ (compiled through the cache) or Python program"""
+    import sys
+    
+    if file_path.suffix == ".py":
+        return {"status": "OK", "result": [sys.executable, str(file_path)]}
+    
+    compiled = get_compile_cache().compile(file_path, compiler)
+    if compiled.get("status") != "OK":
+        return compiled
+    return {"status": "OK", "result": [compiled["result"]["binary"]]}
+
+@cli.command()
+@click.argument('solution')
+@click.argument('brute')
+@click.argument('generator')
+@click.option('--iterations', default=1000, help='Maximum number of random tests to run')
+@click.option('--jobs', type=int, default=None, help='Number of parallel workers (default: all CPU cores)')
+@click.option('--time-limit', type=float, default=2.0, help='Time limit per program run in seconds')
+@click.option('--seed', default=1, help='Seed passed to the generator for the first test')
+@click.option('--compiler', default='g++', help='C++ compiler to use')
+@click.option('--shrink', is_flag=True,
+              help='Also save a smaller failing input; only inputs the brute force accepts are kept')
+def stress(solution, brute, generator, iterations, jobs, time_limit, seed, compiler, shrink):
+    """Compare a solution with a brute force on random tests
+
+    The generator is run with the test seed as its only argument and must
+    print one test to stdout. Programs may be C++ or Python files. The
+    failing input is saved next to the solution; with --shrink, a smaller
+    input that fails the same way is saved beside it.
+    """
+    from ..utils.stress import stress_test
+    
+    commands = []
+    for filename in (solution, brute, generator):
+        file_path = Path(filename)
+        if not file_path.exists():
+            print(f"{Fore.RED}File {filename} not found.{Style.RESET_ALL}")
+            return
+        
+        result = build_command(file_path, compiler)
+        if result.get("status") != "OK":
+            print(f"{Fore.RED}Compilation of {filename} failed:{Style.RESET_ALL}\n{result.get('comment', '')}")
+            return
+        commands.append(result["result"])
+    
+    def progress(done):
+        print(f"\r{Fore.CYAN}Ran {done}/{iterations} tests...{Style.RESET_ALL}", end="", flush=True)
+    
+    try:
+        result = stress_test(commands[2], commands[0], commands[1], iterations=iterations, jobs=jobs,
+                             time_limit=time_limit, seed=seed, progress=progress, shrink=shrink)
+    except Exception as e:
+        print(f"\n{Fore.RED}Error running generator: {e}{Style.RESET_ALL}")
+        return
+    
+    print(f"\r{clear_line()}{Fore.CYAN}Ran {result['tests']} tests in {result['elapsed']:.2f}s "
+          f"({result['throughput']:.0f} tests/s).{Style.RESET_ALL}")
+    
+    failure = result["failure"]
+    if failure is None:
+        print(f"{Fore.GREEN}No differences found.{Style.RESET_ALL}")
+        return
+    
+    # Save the failing input next to the solution
+    solution_path = Path(solution)
+    input_path = solution_path.with_name(f"{solution_path.stem}_fail.in")
+    input_path.write_bytes(failure["input"])
+    
+    print(f"{Fore.RED}{failure['verdict']} on seed {failure['seed']}. Input saved to {input_path}.{Style.RESET_ALL}")
+    if "shrunk" in failure:
+        # Show the smaller input, keeping the generated one on disk
+        original_size = len(failure["input"])
+        failure = failure["shrunk"]
+        min_path = solution_path.with_name(f"{solution_path.stem}_fail.min.in")
+        min_path.write_bytes(failure["input"])
+        print(f"{Fore.CYAN}Shrunk the input from {original_size} to {len(failure['input'])} bytes "
+              f"and saved it to {min_path}.{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}Input:{Style.RESET_ALL}\n{failure['input'].decode(errors='replace')}", end="")
+    print(f"{Fore.CYAN}Expected:{Style.RESET_ALL}\n{failure['expected'].decode(errors='replace')}", end="")
+    print(f"{Fore.CYAN}Got:{Style.RESET_ALL}\n{failure['actual'].decode(errors='replace')}")
+
+def verdict_color(verdict):
+    """Color used for a verdict in submission listings"""
+    if verdict == "OK":
+        return Fore.GREEN
+    if verdict in ["IN QUEUE", "TESTING"]:
+        return Fore.YELLOW
+    return Fore.RED
+
+def format_submission_progress(submission):
+    """Format a one-line progress summary for a submission"""
+    problem = submission.get("problem", {})
+    verdict = submission.get("verdict") or "IN QUEUE"
+    passed = submission.get("passedTestCount", 0)
+    
+    if verdict == "TESTING":
+        color = Fore.YELLOW
+        verdict = f"Running on test {passed + 1}"
+    elif verdict == "IN QUEUE":
+        color = Fore.YELLOW
+    elif verdict == "OK":
+        color = Fore.GREEN
+        verdict = f"Accepted ({passed} tests)"
+    else:
+        color = Fore.RED
+        verdict = f"{verdict} on test {passed + 1}"
+    
+    time_consumed = submission.get("timeConsumedMillis", 0)
+    memory_consumed = submission.get("memoryConsumedBytes", 0) // 1024
+    name = f"{problem.get('contestId', '')}{problem.get('index', '')}"
+    return f"{submission.get('id', ''):<12} {name:<8} {color}{verdict:<30}{Style.RESET_ALL} {time_consumed:>6} ms {memory_consumed:>8} KB"
+
+def watch_status(submission_id, contest_id, handle):
+    """Redraw the progress of pending submissions in place until they are judged"""
+    if not handle:
+        print(f"{Fore.RED}Watching requires a handle. Set CF_HANDLE or pass --handle.{Style.RESET_ALL}")
+        return
+    
+    submission_ids = [submission_id] if submission_id else None
+    drawn = 0
+    try:
+        for submissions in get_submission_api().watch_submissions(handle, contest_id, submission_ids):
+            if not submissions:
+                if submission_ids:
+                    print(f"{Fore.YELLOW}Submission {submission_id} is not among the latest submissions of {handle}.{Style.RESET_ALL}")
+                else:
+                    print(f"{Fore.YELLOW}No pending submissions for {handle}.{Style.RESET_ALL}")
+                return
             
+            # Move back over the previous frame and overwrite it
+            if drawn:
+                print(Cursor.UP(drawn), end="")
             for submission in submissions:
-                subm_id = submission.get("id")
-                problem_index = submission.get("problem", {}).get("index")
-                verdict = submission.get("verdict", "IN QUEUE")
-                
-                color = Fore.GREEN if verdict == "OK" else Fore.RED if verdict not in ["IN QUEUE", "TESTING"] else Fore.YELLOW
-                print(f"{subm_id:<12} {problem_index:<10} {color}{verdict}{Style.RESET_ALL}")
+                print(f"\r{clear_line()}{format_submission_progress(submission)}")
+            drawn = len(submissions)
             
+    except KeyboardInterrupt:
+        pass
     except Exception as e:
-        print(f"{Fore.RED}Error checking status: {e}{Style.RESET_ALL}")
+        print(f"{Fore.RED}Error watching submissions: {e}{Style.RESET_ALL}")
+
+@cli.command()
+@click.argument('action', type=click.Choice(['stats', 'clear']), default='stats')
+def cache(action):
+    """Show or clear the local API response and compile caches"""
+    response_cache = get_session().cache
+    compile_cache = get_compile_cache()
+    if action == 'clear':
+        removed = response_cache.clear()
+        print(f"{Fore.GREEN}Removed {removed} cached responses.{Style.RESET_ALL}")
+        removed = compile_cache.clear()
+        print(f"{Fore.GREEN}Removed {removed} cached binaries.{Style.RESET_ALL}")
+        return
+
+    stats = response_cache.stats()
+    print(f"\n{Fore.CYAN}== Response Cache =={Style.RESET_ALL}")
+    print(f"Location: {response_cache.db_path}")
+    print(f"Entries: {stats['entries']}")
+    print(f"Size: {stats['bytes'] // 1024} KB / {stats['max_bytes'] // 1024} KB")
+    print(f"Hits: {stats['hits']}  Stale: {stats['stale']}  Misses: {stats['misses']}  Hit ratio: {stats['hit_ratio']:.1%}")
+    
+    stats = compile_cache.stats()
+    print(f"\n{Fore.CYAN}== Compile Cache =={Style.RESET_ALL}")
+    print(f"Location: {compile_cache.cache_dir}")
+    print(f"Binaries: {stats['entries']}")
+    print(f"Size: {stats['bytes'] // 1024} KB / {stats['max_bytes'] // 1024} KB")
+    print(f"Hits: {stats['hits']}  Misses: {stats['misses']}  Hit ratio: {stats['hit_ratio']:.1%}")
+    print(f"Compile time saved: {stats['time_saved']:.1f}s")
+
+def format_standings_cell(points, rejected, scored):
+    """Format one problem result the way the standings page shows it"""
+    if points > 0:
+        if scored:
+            return str(int(points))
+        return f"+{rejected}" if rejected else "+"
+    return f"-{rejected}" if rejected else ""
+
+def redraw_lines(lines, new_lines):
+    """Update a table printed just above the cursor in place"""
+    import sys
+    
+    if len(new_lines) != len(lines):
+        # Row count changed, redraw the whole table and blank any leftover lines
+        leftover = max(0, len(lines) - len(new_lines))
+        sys.stdout.write(Cursor.UP(len(lines)) + "".join(f"\r{clear_line()}{line}\n" for line in new_lines))
+        if leftover:
+            sys.stdout.write(f"{clear_line()}\n" * leftover + Cursor.UP(leftover))
+    else:
+        # Rewrite only the lines that changed, then return below the table
+        for offset, (old, new) in enumerate(zip(lines, new_lines)):
+            if old != new:
+                up = len(lines) - offset
+                sys.stdout.write(f"{Cursor.UP(up)}\r{clear_line()}{new}{Cursor.DOWN(up)}\r")
+    sys.stdout.flush()
+
+def render_standings(standings):
+    """Render a standings page into a header and one line per row"""
+    problems = standings["problems"]
+    scored = standings["contest"].type != "ICPC"
+    header = [
+        f"{Fore.CYAN}== {standings['contest'].name or 'Standings'} =={Style.RESET_ALL}",
+        f"{Fore.CYAN}{'#':>6} {'Who':<24} {'=':>7} {'Pen':>5} " + " ".join(f"{p:>5}" for p in problems) + Style.RESET_ALL
+    ]
+    lines = []
+    for row in standings["rows"]:
+        cells = []
+        for problem_points, rejected in row.results:
+            cell = format_standings_cell(problem_points, rejected, scored)
+            color = Fore.GREEN if problem_points > 0 else Fore.RED if rejected else ""
+            cells.append(f"{color}{cell:>5}{Style.RESET_ALL if color else ''}")
+        lines.append(f"{row.rank:>6} {row.party[:24]:<24} {row.points:>7g} {row.penalty:>5} " + " ".join(cells))
+    return header, lines
+
+@cli.command()
+@click.argument('contest_id', type=int)
+@click.option('--page', default=1, help='Page of the standings to show')
+@click.option('--count', default=50, help='Rows per page')
+@click.option('--handles', default=None, help='Comma-separated handles to show')
+@click.option('--friends', is_flag=True, help='Only show your friends (requires API key)')
+@click.option('--unofficial', is_flag=True, help='Include unofficial participants')
+@click.option('--live', is_flag=True, help='Keep refreshing, redrawing only the rows that changed')
+@click.option('--interval', default=10.0, help='Seconds between refreshes in live mode')
+def standings(contest_id, page, count, handles, friends, unofficial, live, interval):
+    """Show contest standings"""
+    import sys
+    import time
+    
+    handle_list = [h.strip() for h in handles.split(",") if h.strip()] if handles else []
+    if friends:
+        response = get_user_api().get_friends()
+        if response.get("status") != "OK":
+            print(f"{Fore.RED}Error fetching friends: {response.get('comment', 'Unknown error')}{Style.RESET_ALL}")
+            return
+        handle_list += response["result"] + [get_session().handle]
+    
+    def fetch_page():
+        return get_contest_api().get_standings(contest_id, start=(page - 1) * count + 1, count=count,
+                                               handles=handle_list or None, unofficial=unofficial, live=live)
+    
+    response = fetch_page()
+    if response.get("status") != "OK":
+        print(f"{Fore.RED}Error fetching standings: {response.get('comment', 'Unknown error')}{Style.RESET_ALL}")
+        return
+    
+    header, lines = render_standings(response["result"])
+    if not lines:
+        print(f"{Fore.YELLOW}No standings rows found.{Style.RESET_ALL}")
+        return
+    print("\n".join(header + lines))
+    
+    try:
+        while live:
+            time.sleep(interval)
+            response = fetch_page()
+            if response.get("status") != "OK":
+                continue
+            
+            _, new_lines = render_standings(response["result"])
+            redraw_lines(lines, new_lines)
+            lines = new_lines
+    except KeyboardInterrupt:
+        pass
+
+def render_predictions(result, handles, top):
+    """Render predicted rating changes for the chosen handles, or the top rows"""
+    predictions = result["predictions"]
+    if handles:
+        wanted = {h.lower() for h in handles}
+        predictions = [p for p in predictions if p["handle"].lower() in wanted]
+    else:
+        predictions = predictions[:top]
+    
+    has_actual = any(p["actual"] is not None for p in predictions)
+    header = [
+        f"{Fore.CYAN}== {result['contest'].name or 'Contest'}: predicted rating changes =={Style.RESET_ALL}",
+        f"{Fore.CYAN}{'#':>6} {'Handle':<24} {'Old':>5} {'Delta':>6} {'New':>5}" + (f" {'Actual':>7}" if has_actual else "") + Style.RESET_ALL
+    ]
+    lines = []
+    for p in predictions:
+        color = Fore.GREEN if p["delta"] > 0 else Fore.RED if p["delta"] < 0 else ""
+        line = (f"{p['rank']:>6} {p['handle'][:24]:<24} {p['rating']:>5} "
+                f"{color}{p['delta']:>+6}{Style.RESET_ALL if color else ''} {p['rating'] + p['delta']:>5}")
+        if has_actual:
+            line += f" {p['actual']:>+7}" if p["actual"] is not None else f" {'-':>7}"
+        lines.append(line)
+    lines.append(f"{Fore.CYAN}{len(result['predictions'])} contestants in {result['elapsed']:.2f}s{Style.RESET_ALL}")
+    return header, lines
+
+@cli.command()
+@click.argument('contest_id', type=int)
+@click.option('--handles', default=None, help='Comma-separated handles to show along with your own')
+@click.option('--friends', is_flag=True, help='Also show your friends (requires API key)')
+@click.option('--top', default=20, help='Rows to show when no handles are selected')
+@click.option('--live', is_flag=True, help='Keep recomputing from fresh standings')
+@click.option('--interval', default=30.0, help='Seconds between recomputations in live mode')
+def predict(contest_id, handles, friends, top, live, interval):
+    """Predict rating changes from the contest standings"""
+    import time
+    
+    handle_list = [h.strip() for h in handles.split(",") if h.strip()] if handles else []
+    if friends:
+        response = get_user_api().get_friends()
+        if response.get("status") != "OK":
+            print(f"{Fore.RED}Error fetching friends: {response.get('comment', 'Unknown error')}{Style.RESET_ALL}")
+            return
+        handle_list += response["result"]
+    if get_session().handle and get_session().handle not in handle_list:
+        handle_list.append(get_session().handle)
+    
+    response = get_contest_api().predict_rating_changes(contest_id, live=live)
+    if response.get("status") != "OK":
+        print(f"{Fore.RED}Error predicting rating changes: {response.get('comment', 'Unknown error')}{Style.RESET_ALL}")
+        return
+    
+    header, lines = render_predictions(response["result"], handle_list, top)
+    if len(lines) == 1:
+        print(f"{Fore.YELLOW}None of the selected handles are rated in this contest.{Style.RESET_ALL}")
+        return
+    print("\n".join(header + lines))
+    
+    try:
+        while live:
+            time.sleep(interval)
+            response = get_contest_api().predict_rating_changes(contest_id, live=True)
+            if response.get("status") != "OK":
+                continue
+            
+            _, new_lines = render_predictions(response["result"], handle_list, top)
+            redraw_lines(lines, new_lines)
+            lines = new_lines
+    except KeyboardInterrupt:
+        pass
+
+def rating_color(rating):
+    """Colorama color of a Codeforces rank"""
+    if rating is None:
+        return ""
+    for threshold, color in ((2400, Fore.RED), (2100, Fore.YELLOW), (1900, Fore.MAGENTA), (1600, Fore.BLUE),
+                             (1400, Fore.CYAN), (1200, Fore.GREEN)):
+        if rating >= threshold:
+            return color
+    return Fore.LIGHTBLACK_EX
+
+USER_SORT_KEYS = {
+    'rating': lambda u: -(u['rating'] or 0),
+    'max': lambda u: -(u['maxRating'] or 0),
+    'contests': lambda u: -(u['contests'] or 0),
+    'active': lambda u: -(u['lastContest'] or 0),
+    'online': lambda u: -(u['lastOnline'] or 0),
+    'handle': lambda u: u['handle'].lower(),
+}
+
+@cli.command()
+@click.argument('handles', nargs=-1)
+@click.option('--file', 'handle_file', type=click.File('r'), default=None,
+              help='File with handles, separated by whitespace, commas or semicolons (# starts a comment)')
+@click.option('--sort', type=click.Choice(list(USER_SORT_KEYS)), default='rating', help='Dashboard order')
+@click.option('--history', is_flag=True,
+              help='Also show contest count and last contest; costs one request per handle not cached '
+                   '(implied by --sort active)')
+@click.option('--refresh', is_flag=True, help='Ignore cached users')
+def users(handles, handle_file, sort, history, refresh):
+    """Show a rating and activity dashboard for many handles"""
+    import time
+    
+    handle_list = [h for arg in handles for h in re.split(r'[\s,;]+', arg) if h]
+    if handle_file:
+        for line in handle_file:
+            handle_list += [h for h in re.split(r'[\s,;]+', line.split('#', 1)[0]) if h]
+    if not handle_list and get_session().handle:
+        handle_list = [get_session().handle]
+    if not handle_list:
+        print(f"{Fore.RED}No handles given. Pass handles, --file or set CF_HANDLE.{Style.RESET_ALL}")
+        return
+    
+    history = history or sort == 'active'
+    result = get_user_api().get_users(handle_list, refresh=refresh, history=history)
+    if result.get("status") != "OK":
+        print(f"{Fore.RED}Error fetching users: {result.get('comment', 'Unknown error')}{Style.RESET_ALL}")
+        return
+    
+    info = result["result"]
+    rows = sorted(info["users"], key=USER_SORT_KEYS[sort])
+    now = time.time()
+    if not rows:
+        print(f"{Fore.YELLOW}None of these handles exist: {', '.join(info['missing'])}{Style.RESET_ALL}")
+        return
+    
+    activity = f" {'Contests':>8} {'Last contest':>12}" if history else ""
+    print(f"{Fore.CYAN}{'#':>4} {'Handle':<24} {'Rating':>6} {'Max':>5} {'Rank':<26}"
+          f"{activity} {'Online':>7}{Style.RESET_ALL}")
+    for position, user in enumerate(rows, 1):
+        color = rating_color(user['rating'])
+        rating = str(user['rating']) if user['rating'] is not None else '-'
+        max_rating = str(user['maxRating']) if user['maxRating'] is not None else '-'
+        activity = ""
+        if history:
+            contests = str(user['contests']) if user['contests'] is not None else '-'
+            last_contest = '-'
+            if user['lastContest']:
+                delta = f" {user['lastDelta']:+d}" if user['lastDelta'] is not None else ''
+                last_contest = f"{format_age(now - user['lastContest'])}{delta}"
+            activity = f" {contests:>8} {last_contest:>12}"
+        online = format_age(now - user['lastOnline']) if user['lastOnline'] else '-'
+        print(f"{position:>4} {color}{user['handle'][:24]:<24} {rating:>6}{Style.RESET_ALL if color else ''} "
+              f"{max_rating:>5} {(user['rank'] or 'unrated')[:26]:<26}{activity} {online:>7}")
+    
+    if info["missing"]:
+        print(f"{Fore.YELLOW}Not found: {', '.join(info['missing'])}{Style.RESET_ALL}")
+    if info["failed"]:
+        print(f"{Fore.YELLOW}Could not fetch: {', '.join(info['failed'])} ({info['error']}){Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{len(rows)} users, {info['cached']} from cache, {info['requests']} API requests "
+          f"in {info['elapsed']:.2f}s{Style.RESET_ALL}")
+
+@cli.command()
+@click.argument('contest_id', type=int)
+@click.option('--what', type=click.Choice(['status', 'standings', 'problems']), default='status', help='Data to export')
+@click.option('--format', 'fmt', type=click.Choice(['jsonl', 'csv', 'parquet']), default='jsonl', help='Output format')
+@click.option('--compress', 'compression', type=click.Choice(['none', 'gzip', 'bz2', 'xz', 'snappy', 'zstd']), default=None,
+              help='Compression (gzip/bz2/xz for JSONL and CSV, snappy/gzip/zstd for Parquet; '
+                   'default: none, snappy for Parquet)')
+@click.option('--output', type=click.Path(), default=None, help='Output path (default: contest<ID>_<what>.<format>)')
+@click.option('--page-size', default=5000, help='Rows fetched and written per request')
+@click.option('--unofficial', is_flag=True, help='Include unofficial participants in the standings')
+@click.option('--restart', is_flag=True, help='Overwrite the output instead of resuming an interrupted export')
+def export(contest_id, what, fmt, compression, output, page_size, unofficial, restart):
+    """Stream contest submissions, standings or problems to a file"""
+    def progress(rows):
+        print(f"\r{Fore.CYAN}Exported {rows} rows...{Style.RESET_ALL}", end="", flush=True)
+    
+    result = get_contest_api().export_contest(
+        contest_id, what, fmt, output=output, compression=compression, page_size=page_size,
+        unofficial=unofficial, restart=restart, progress=progress
+    )
+    print("\r", end="")
+    if result.get("status") != "OK":
+        print(f"{Fore.RED}Error exporting contest {contest_id}: {result.get('comment', 'Unknown error')}{Style.RESET_ALL}")
+        return
+    
+    info = result["result"]
+    if info["resumed"] and info["rows"] == info["resumed"]:
+        print(f"{Fore.GREEN}{info['path']} was already complete with {info['rows']} rows.{Style.RESET_ALL}")
+        return
+    resumed = f", resumed after {info['resumed']}" if info["resumed"] else ""
+    print(f"{Fore.GREEN}Exported {info['rows']} rows to {info['path']} in {info['elapsed']:.1f}s{resumed}.{Style.RESET_ALL}")
+
+@cli.command()
+@click.option('--handle', 'handles', multiple=True, help='Handle to sync and analyze (repeatable, default: CF_HANDLE)')
+@click.option('--by', 'dimension', type=click.Choice(['tag', 'rating', 'language']), default=None,
+              help='Show the verdict distribution grouped by this attribute')
+@click.option('--unsolved', is_flag=True, help='List attempted but unsolved problems')
+@click.option('--solve-times', is_flag=True, help='List time from first attempt to accepted per problem')
+@click.option('--limit', default=20, help='Maximum rows per report')
+@click.option('--no-sync', is_flag=True, help='Use the local store without contacting Codeforces')
+def history(handles, dimension, unsolved, solve_times, limit, no_sync):
+    """Sync submission history locally and analyze it"""
+    from ..utils.history import SubmissionHistory
+    
+    handles = handles or ([get_session().handle] if get_session().handle else [])
+    if not handles:
+        print(f"{Fore.RED}No handle given. Set CF_HANDLE or pass --handle.{Style.RESET_ALL}")
+        return
+    
+    for handle in handles:
+        store = SubmissionHistory(HISTORY_DIR, handle)
+        if not no_sync:
+            result = get_submission_api().sync_history(store)
+            if result.get("status") != "OK":
+                print(f"{Fore.RED}Error syncing {handle}: {result.get('comment', 'Unknown error')}{Style.RESET_ALL}")
+            else:
+                print(f"{Fore.CYAN}{handle}: {result['result']['added']} new, {result['result']['total']} submissions stored.{Style.RESET_ALL}")
+        
+        if dimension:
+            groups = store.verdicts_by(dimension)
+            verdicts = [v for v, _ in sum(groups.values(), Counter()).most_common(5)]
+            print(f"\n{Fore.CYAN}== {handle}: verdicts by {dimension} =={Style.RESET_ALL}")
+            print(f"{Fore.CYAN}{dimension.capitalize():<28} {'Total':>6} " + " ".join(f"{v[:12]:>12}" for v in verdicts) + Style.RESET_ALL)
+            ordered = sorted(groups.items(), key=lambda item: -sum(item[1].values()))
+            if dimension == 'rating':
+                ordered = sorted(groups.items(), key=lambda item: (not item[0].isdigit(), int(item[0]) if item[0].isdigit() else 0))
+            for label, counts in ordered[:limit]:
+                cells = " ".join(f"{verdict_color(v)}{counts.get(v, 0):>12}{Style.RESET_ALL}" for v in verdicts)
+                print(f"{label[:28]:<28} {sum(counts.values()):>6} {cells}")
+        
+        if unsolved:
+            rows = store.unsolved()
+            print(f"\n{Fore.CYAN}== {handle}: unsolved problems ({len(rows)}) =={Style.RESET_ALL}")
+            for row in rows[:limit]:
+                last = datetime.fromtimestamp(row['last_attempt']).strftime('%Y-%m-%d')
+                print(f"{row['problem']:<10} {row['name'][:36]:<36} {str(row['rating'] or '-'):>5} "
+                      f"{Fore.RED}{row['attempts']:>3} tries{Style.RESET_ALL}  {last}")
+        
+        if solve_times:
+            rows = store.solve_times()
+            print(f"\n{Fore.CYAN}== {handle}: time to accepted =={Style.RESET_ALL}")
+            for row in rows[:limit]:
+                minutes = row['seconds'] // 60
+                print(f"{row['problem']:<10} {row['name'][:36]:<36} {str(row['rating'] or '-'):>5} "
+                      f"{minutes // 60:>4}h {minutes % 60:02d}m")
+
+def parse_range(value):
+    """Parse '1800-2100', '1800-' or '1800' into an inclusive (low, high) range"""
+    if not value:
+        return None, None
+    low, sep, high = value.partition('-')
+    try:
+        low = int(low) if low else None
+        high = int(high) if high else (None if sep else low)
+    except ValueError:
+        raise click.BadParameter(f"Expected a number or a range like 1800-2100, got '{value}'")
+    return low, high
+
+@cli.command()
+@click.option('--tags', default=None, help='Comma-separated tags the problems must all have')
+@click.option('--rating', default=None, help='Rating or range, e.g. 1800 or 1800-2100')
+@click.option('--contest', default=None, help='Contest ID or range, e.g. 1900-')
+@click.option('--min-solved', type=int, default=None, help='Minimum number of solvers')
+@click.option('--unsolved', is_flag=True, help='Exclude problems already solved by CF_HANDLE')
+@click.option('--sort', type=click.Choice(['solved', 'rating', 'contest']), default='solved', help='Result order')
+@click.option('--limit', default=20, help='Maximum number of problems')
+@click.option('--refresh', is_flag=True, help='Refresh the local problemset index first')
+@click.option('--generate', 'generate_files', is_flag=True, help='Generate source files for the results')
+@click.option('--template-dir', default=None, help='Directory containing C++ templates')
+@click.option('--jobs', default=1, help='Number of files to write in parallel with --generate')
+def search(tags, rating, contest, min_solved, unsolved, sort, limit, refresh, generate_files, template_dir, jobs):
+    """Search the problemset offline and optionally scaffold the results"""
+    rating_min, rating_max = parse_range(rating)
+    contest_min, contest_max = parse_range(contest)
+    tags = [tag.strip() for tag in tags.split(',') if tag.strip()] if tags else None
+    
+    exclude = None
+    if unsolved:
+        from ..utils.history import SubmissionHistory
+        
+        handle = get_session().handle
+        if not handle:
+            print(f"{Fore.RED}--unsolved needs CF_HANDLE to be set.{Style.RESET_ALL}")
+            return
+        store = SubmissionHistory(HISTORY_DIR, handle)
+        result = get_submission_api().sync_history(store)
+        if result.get("status") != "OK":
+            print(f"{Fore.YELLOW}Could not sync {handle}'s history, using the local copy: {result.get('comment', 'Unknown error')}{Style.RESET_ALL}")
+        exclude = store.solved_problems()
+    
+    result = get_problem_api().search_problems(
+        refresh=refresh, tags=tags, rating_min=rating_min, rating_max=rating_max, min_solved=min_solved,
+        contest_min=contest_min, contest_max=contest_max, exclude=exclude, sort=sort, limit=limit
+    )
+    if result.get("status") != "OK":
+        print(f"{Fore.RED}Error searching problems: {result.get('comment', 'Unknown error')}{Style.RESET_ALL}")
+        return
+    
+    problems = result["result"]
+    if not problems:
+        print(f"{Fore.YELLOW}No problems match these filters.{Style.RESET_ALL}")
+        return
+    
+    print(f"{Fore.CYAN}{'Problem':<10} {'Name':<36} {'Rating':>6} {'Solved':>8}  Tags{Style.RESET_ALL}")
+    for problem in problems:
+        problem_id = f"{problem['contestId']}{problem['index']}"
+        print(f"{problem_id:<10} {problem['name'][:36]:<36} {str(problem['rating'] or '-'):>6} "
+              f"{problem['solvedCount']:>8}  {', '.join(problem['tags'])}")
+    
+    if generate_files:
+        result = get_problem_api().generate_problem_set(problems, template_dir, jobs=jobs)
+        if result.get("status") != "OK":
+            print(f"{Fore.RED}Error generating files: {result.get('comment', 'Unknown error')}{Style.RESET_ALL}")
+            return
+        for file_info in result["result"]["files"]:
+            print(f"{Fore.GREEN}Created {file_info['filename']} successfully!{Style.RESET_ALL}")
+
+@cli.command()
+@click.argument('action', type=click.Choice(['start', 'stop', 'status', 'run']), default='status')
+@click.option('--idle-timeout', default=120, help='Minutes without requests before the daemon exits (0 = never)')
+def daemon(action, idle_timeout):
+    """Run a background process that keeps the session and caches warm"""
+    import sys
+    import time
+    import subprocess
+    from ..utils.daemon import Daemon, request, socket_path
+    
+    path = socket_path()
+    if action == 'run':
+        Daemon(path, idle_timeout=idle_timeout * 60).serve()
+        return
+    
+    state = request({"command": "ping"})
+    if action == 'status':
+        if state is None:
+            print(f"{Fore.YELLOW}No daemon running.{Style.RESET_ALL}")
+            return
+        print(f"{Fore.GREEN}Daemon running (pid {state['pid']}) on {path}{Style.RESET_ALL}")
+        print(f"Uptime: {format_age(state['uptime'])}  Idle: {format_age(state['idle'])}  Commands served: {state['requests']}")
+        return
+    
+    if action == 'stop':
+        if state is None:
+            print(f"{Fore.YELLOW}No daemon running.{Style.RESET_ALL}")
+            return
+        request({"command": "stop"})
+        print(f"{Fore.GREEN}Daemon stopped.{Style.RESET_ALL}")
+        return
+    
+    if state is not None:
+        print(f"{Fore.YELLOW}Daemon already running (pid {state['pid']}).{Style.RESET_ALL}")
+        return
+    
+    log_file = Path.home() / ".cfcli" / "daemon.log"
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_file, 'a') as log:
+        subprocess.Popen([sys.executable, "-m", "cfcli", "daemon", "run", "--idle-timeout", str(idle_timeout)],
+                         stdin=subprocess.DEVNULL, stdout=log, stderr=log, start_new_session=True)
+    
+    # Wait for the socket so the next command is already served by the daemon
+    for _ in range(100):
+        state = request({"command": "ping"})
+        if state is not None:
+            print(f"{Fore.GREEN}Daemon started (pid {state['pid']}) on {path}{Style.RESET_ALL}")
+            return
+        time.sleep(0.1)
+    print(f"{Fore.RED}Daemon did not start, see {log_file}{Style.RESET_ALL}")
+
+@cli.command()
+@click.option('--days', type=int, default=None, help='Only include calls from the last N days')
+def stats(days):
+    """Show API latency and cache statistics from past runs"""
+    import time
+    from ..utils.trace import aggregate_log
+    
+    since = time.time() - days * 86400 if days else None
+    methods = aggregate_log(TRACE_LOG, since)
+    if not methods:
+        print(f"{Fore.YELLOW}No API calls recorded yet.{Style.RESET_ALL}")
+        return
+    
+    print(f"\n{Fore.CYAN}== API Call Statistics =={Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'Method':<24} {'Calls':>7} {'Hit ratio':>10} {'p50 (ms)':>10} {'p95 (ms)':>10} {'Avg KB':>9} {'Retries':>8}{Style.RESET_ALL}")
+    print("-" * 84)
+    
+    total_calls = total_hits = 0
+    for method, entry in sorted(methods.items(), key=lambda item: -item[1]["calls"]):
+        avg_kb = entry["bytes"] / entry["network_calls"] / 1024 if entry["network_calls"] else 0
+        print(f"{method:<24} {entry['calls']:>7} {entry['hit_ratio']:>10.1%} {entry['p50'] * 1000:>10.1f} "
+              f"{entry['p95'] * 1000:>10.1f} {avg_kb:>9.1f} {entry['retries']:>8}")
+        total_calls += entry["calls"]
+        total_hits += entry["hits"]
+    
+    print(f"\nOverall cache hit ratio: {total_hits / total_calls:.1%} over {total_calls} calls")
 
 if __name__ == "__main__":
     cli() 
\ No newline at end of file
@@ -0,0 +1,195 @@
+import os
+import sys
+import shutil
+from itertools import chain
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+from colorama import Fore, Style
+
+# Tables are rendered column by column: every cell is formatted once, column
+# widths come from the formatted cells, and lines are joined into large chunks
+# that reach the terminal in a few writes instead of one print per row. Color
+# codes are only emitted for terminals, so piped output is plain text without
+# anything having to strip it. Paged listings can also be streamed one page at
+# a time, with widths fixed by the first page.
+
+CHUNK_ROWS = 4096
+
+
+def use_color(stream=None) -> bool:
+    """Whether escape codes should be written to the stream"""
+    stream = stream or sys.stdout
+    return stream.isatty() and not os.getenv("NO_COLOR")
+
+
+class Column:
+    """A table column: how to get, format and color its cell for a row"""
+
+    def __init__(self, title: str, value: Callable[[Any], Any], fmt: Callable[[Any], str] = str,
+                 align: str = "<", max_width: Optional[int] = None, min_width: int = 0,
+                 color: Optional[Callable[[Any], str]] = None):
+        self.title = title
+        self.value = value
+        self.fmt = fmt
+        self.align = align
+        self.max_width = max_width
+        self.min_width = min_width
+        self.color = color
+        self.width = max(len(title), min_width)
+
+
+class Table:
+    """Rows shown under a set of columns, sorted and filtered before rendering"""
+
+    def __init__(self, columns: List[Column], rows: Iterable[Any] = (), title: Optional[str] = None,
+                 footer: Optional[str] = None):
+        self.columns = columns
+        self.rows = list(rows)
+        self.title = title
+        self.footer = footer
+        self.filters: List[Callable[[Any], bool]] = []
+        self.streamed = 0
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def extend(self, rows: Iterable[Any]) -> None:
+        self.rows.extend(rows)
+
+    def column(self, title: str) -> Column:
+        for column in self.columns:
+            if column.title.lower() == title.lower():
+                return column
+        raise KeyError(title)
+
+    def filter(self, predicate: Callable[[Any], bool]) -> "Table":
+        """Drop rows that fail the predicate, now and in streamed pages"""
+        self.filters.append(predicate)
+        self.rows = [row for row in self.rows if predicate(row)]
+        return self
+
+    def sort(self, by: str, reverse: bool = False) -> "Table":
+        """Sort by a column's values; rows without a value go last"""
+        value = self.column(by).value
+        present = [row for row in self.rows if value(row) is not None]
+        missing = [row for row in self.rows if value(row) is None]
+        self.rows = sorted(present, key=value, reverse=reverse) + missing
+        return self
+
+    def _cells(self, column: Column, values: List[Any]) -> List[str]:
+        fmt = column.fmt
+        texts = [fmt(v) if v is not None else "-" for v in values]
+        if column.max_width:
+            limit = column.max_width
+            texts = [t if len(t) <= limit else t[:limit - 3] + "..." for t in texts]
+        return texts
+
+    def _lines(self, rows: List[Any], color: bool, resize: bool = True) -> List[str]:
+        """Format rows into lines; with resize, column widths are first fitted to these rows"""
+        reset = Style.RESET_ALL if color else ""
+        columns = []
+        for column in self.columns:
+            values = list(map(column.value, rows))
+            texts = self._cells(column, values)
+            if resize:
+                column.width = max(len(column.title), column.min_width, max(map(len, texts), default=0))
+            if column is self.columns[-1] and column.align == "<":
+                padded = texts  # No trailing spaces after the last column
+            else:
+                spec = f"{column.align}{column.width}"
+                padded = [format(t, spec) for t in texts]
+            if color and column.color:
+                paint = column.color
+                padded = [f"{paint(v)}{t}{reset}" for v, t in zip(values, padded)]
+            columns.append(padded)
+        return list(map(" ".join, zip(*columns))) if columns else []
+
+    def _head(self, color: bool) -> str:
+        reset = Style.RESET_ALL if color else ""
+        header = " ".join(f"{c.title:{c.align}{c.width}}" for c in self.columns).rstrip()
+        head = []
+        if self.title:
+            head.append(f"\n{Fore.CYAN if color else ''}== {self.title} =={reset}")
+        head.append(f"{Fore.CYAN if color else ''}{header}{reset}")
+        head.append("-" * len(header))
+        return "\n".join(head) + "\n"
+
+    def _foot(self, color: bool) -> str:
+        return f"{Fore.CYAN if color else ''}{self.footer}{Style.RESET_ALL if color else ''}\n"
+
+    def render(self, color: bool = False) -> Iterator[str]:
+        """Yield the table as text chunks of up to CHUNK_ROWS lines each"""
+        lines = self._lines(self.rows, color)
+        yield self._head(color)
+        for start in range(0, len(lines), CHUNK_ROWS):
+            yield "\n".join(lines[start:start + CHUNK_ROWS]) + "\n"
+        if self.footer:
+            yield self._foot(color)
+
+    def stream(self, pages: Iterable[Iterable[Any]], color: bool = False) -> Iterator[str]:
+        """Yield pages of rows as text without holding more than one page
+
+        Filters apply to every page. Column widths come from the first page
+        with rows, raised to each column's min_width; a later cell that does
+        not fit widens its own line only. Nothing is yielded when no row
+        passes the filters. The number of rows shown is kept in self.streamed.
+        """
+        self.streamed = 0
+        for page in pages:
+            rows = [row for row in page if all(predicate(row) for predicate in self.filters)]
+            if not rows:
+                continue
+            lines = self._lines(rows, color, resize=not self.streamed)
+            if not self.streamed:
+                yield self._head(color)
+            self.streamed += len(rows)
+            for start in range(0, len(lines), CHUNK_ROWS):
+                yield "\n".join(lines[start:start + CHUNK_ROWS]) + "\n"
+        if self.streamed and self.footer:
+            yield self._foot(color)
+
+    def show(self, pager: Optional[bool] = None) -> None:
+        """Write the table to stdout, through a pager when it does not fit an interactive terminal
+
+        pager=None pages automatically unless CFCLI_NO_PAGER is set.
+        """
+        color = use_color()
+        interactive = sys.stdin.isatty() and sys.stdout.isatty()
+        if pager is None:
+            pager = not os.getenv("CFCLI_NO_PAGER")
+        if pager and interactive and len(self.rows) + 4 > shutil.get_terminal_size().lines:
+            import click
+            click.echo_via_pager(self.render(color), color=color)
+            return
+
+        write = sys.stdout.write
+        for chunk in self.render(color):
+            write(chunk)
+        sys.stdout.flush()
+
+    def show_pages(self, pages: Iterable[Iterable[Any]], pager: Optional[bool] = None) -> int:
+        """Stream pages of rows to stdout like show, returning the number of rows shown
+
+        Output is held back only until it is known whether it fits the
+        terminal; longer listings continue through the pager.
+        """
+        color = use_color()
+        chunks = self.stream(pages, color)
+        if pager is None:
+            pager = not os.getenv("CFCLI_NO_PAGER")
+        if pager and sys.stdin.isatty() and sys.stdout.isatty():
+            height = shutil.get_terminal_size().lines
+            held, lines = [], 0
+            for chunk in chunks:
+                held.append(chunk)
+                lines += chunk.count("\n")
+                if lines > height:
+                    import click
+                    click.echo_via_pager(chain(held, chunks), color=color)
+                    return self.streamed
+            chunks = iter(held)
+
+        write = sys.stdout.write
+        for chunk in chunks:
+            write(chunk)
+        sys.stdout.flush()
+        return self.streamed
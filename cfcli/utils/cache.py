@@ -0,0 +1,290 @@
+import json
+import time
+import atexit
+import zlib
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from typing import Dict, Optional, Any
+
+# Per-method time-to-live in seconds. None means the entry never expires.
+METHOD_TTLS = {
+    "contest.list": 3 * 60 * 60,
+    "contest.status": 10,
+    "contest.standings": 60,
+    "contest.ratingChanges": 24 * 60 * 60,
+    "problemset.problems": 6 * 60 * 60,
+    "user.info": 10 * 60,
+    "user.rating": 60 * 60,
+    "user.ratedList": 60 * 60,
+    "user.status": 30,
+}
+
+# How long past its TTL an entry may still be served while it is refreshed
+# in the background. Live data (submissions, running standings) is short.
+METHOD_MAX_STALE = {
+    "contest.list": 7 * 24 * 60 * 60,
+    "contest.status": 60,
+    "contest.standings": 10 * 60,
+    "contest.ratingChanges": 7 * 24 * 60 * 60,
+    "problemset.problems": 7 * 24 * 60 * 60,
+    "user.info": 24 * 60 * 60,
+    "user.rating": 24 * 60 * 60,
+    "user.ratedList": 24 * 60 * 60,
+    "user.status": 60 * 60,
+}
+
+DEFAULT_TTL = 300  # 5 minutes
+DEFAULT_MAX_STALE = 24 * 60 * 60  # 1 day
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 64 MB
+
+# Reads only record counters and access times in memory; they are written in
+# one transaction once this many reads or seconds have accumulated, on the
+# next write, or at exit.
+FLUSH_READS = 256
+FLUSH_INTERVAL = 30.0
+
+
+def make_cache_key(method: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Build a stable cache key from a method name and its parameters"""
+    canonical = json.dumps(
+        {str(k): str(v) for k, v in (params or {}).items()},
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    digest = hashlib.sha256(f"{method}?{canonical}".encode('utf-8')).hexdigest()
+    return f"{method}_{digest[:32]}"
+
+
+class ResponseCache:
+    """Persistent SQLite-backed cache for API responses"""
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES, memory_entries: int = 0):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # Optional in-memory LRU of decoded responses for long-running processes.
+        # Responses returned from it are shared and must not be modified.
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self.db_path = cache_dir / "cache.db"
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._pending_counters: Dict[str, int] = {}
+        self._pending_access: Dict[str, float] = {}
+        self._pending_reads = 0
+        self._flushed = time.time()
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                method TEXT NOT NULL,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                expires REAL,
+                stale_until REAL,
+                accessed REAL NOT NULL
+            )
+        """)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(entries)")]
+        if "stale_until" not in columns:
+            self._conn.execute("ALTER TABLE entries ADD COLUMN stale_until REAL")
+            self._conn.execute("UPDATE entries SET stale_until = expires")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
+        self._conn.commit()
+        self._purge_legacy_files()
+        atexit.register(self.flush)
+
+    def _purge_legacy_files(self) -> None:
+        """Remove per-request JSON files left behind by older versions"""
+        for legacy_file in self.cache_dir.glob("*.json"):
+            try:
+                legacy_file.unlink()
+            except OSError:
+                pass
+
+    def ttl_for(self, method: str) -> Optional[float]:
+        """Get the default time-to-live for a method"""
+        return METHOD_TTLS.get(method, DEFAULT_TTL)
+
+    def max_stale_for(self, method: str) -> float:
+        """Get how long past its TTL a method's response may still be served"""
+        return METHOD_MAX_STALE.get(method, DEFAULT_MAX_STALE)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Get data from cache if it has not expired"""
+        entry = self.get_entry(key)
+        return entry["data"] if entry else None
+
+    def get_entry(self, key: str, stale: bool = False, any_age: bool = False) -> Optional[Dict]:
+        """Get a cached response with its age and whether it is still fresh
+
+        With stale, expired entries within their max staleness are returned
+        too; any_age returns whatever is stored (used when offline).
+        """
+        now = time.time()
+        with self._lock:
+            memory = self._memory.get(key)
+            if memory is not None:
+                self._memory.move_to_end(key)
+                row = memory
+            else:
+                row = self._conn.execute(
+                    "SELECT data, created, expires, stale_until FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+
+            fresh = row is not None and (row[2] is None or row[2] >= now)
+            usable = fresh or (row is not None and (any_age or (stale and (row[3] is None or row[3] >= now))))
+            counter = "hits" if fresh else "stale" if usable else "misses"
+            if counter == "hits":
+                self.hits += 1
+            elif counter == "misses":
+                self.misses += 1
+            self._pending_counters[counter] = self._pending_counters.get(counter, 0) + 1
+            if usable:
+                self._pending_access[key] = now
+            self._pending_reads += 1
+            if self._pending_reads >= FLUSH_READS or now - self._flushed >= FLUSH_INTERVAL:
+                self._flush_locked()
+
+        if not usable:
+            return None
+        if memory is not None:
+            return {"data": memory[0], "age": now - row[1], "fresh": fresh}
+        try:
+            data = json.loads(zlib.decompress(row[0]))
+        except (zlib.error, ValueError):
+            self.delete(key)
+            return None
+        self._remember(key, (data,) + tuple(row[1:]))
+        return {"data": data, "age": now - row[1], "fresh": fresh}
+
+    def _remember(self, key: str, entry: tuple) -> None:
+        """Keep a decoded entry (data, created, expires, stale_until) in the memory LRU"""
+        if not self.memory_entries:
+            return
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def put(self, key: str, method: str, data: Dict, ttl: Optional[float] = DEFAULT_TTL) -> None:
+        """Store data in cache, evicting least recently used entries if needed"""
+        blob = zlib.compress(json.dumps(data, separators=(",", ":")).encode('utf-8'))
+        now = time.time()
+        expires = None if ttl is None else now + ttl
+        stale_until = None if expires is None else expires + self.max_stale_for(method)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, method, data, size, created, expires, stale_until, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, method, blob, len(blob), now, expires, stale_until, now)
+            )
+            self._memory.pop(key, None)
+            self._pending_access.pop(key, None)
+            self._flush_locked(commit=False)
+            self._evict()
+            self._conn.commit()
+        self._remember(key, (data, now, expires, stale_until))
+
+    def flush(self) -> None:
+        """Write counters and access times recorded by reads since the last flush"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self, commit: bool = True) -> None:
+        if self._pending_counters or self._pending_access:
+            self._conn.executemany(
+                "INSERT INTO counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                list(self._pending_counters.items())
+            )
+            self._conn.executemany("UPDATE entries SET accessed = ? WHERE key = ?",
+                                   [(accessed, key) for key, accessed in self._pending_access.items()])
+            if commit:
+                self._conn.commit()
+        self._pending_counters.clear()
+        self._pending_access.clear()
+        self._pending_reads = 0
+        self._flushed = time.time()
+
+    def delete(self, key: str) -> None:
+        """Remove a single entry"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+            self._memory.pop(key, None)
+
+    def clear(self) -> int:
+        """Remove all entries and reset counters"""
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM entries").rowcount
+            self._memory.clear()
+            self._pending_counters.clear()
+            self._pending_access.clear()
+            self._conn.execute("DELETE FROM counters")
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+        self.hits = 0
+        self.misses = 0
+        return removed
+
+    def stats(self) -> Dict:
+        """Get cache size and lifetime hit/miss counters"""
+        with self._lock:
+            self._flush_locked()
+            entries, total_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            counters = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        lookups = hits + misses
+        return {
+            "entries": entries,
+            "bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "stale": counters.get("stale", 0),
+            "misses": misses,
+            "hit_ratio": hits / lookups if lookups else 0.0
+        }
+
+    def _evict(self) -> None:
+        """Drop entries past their max staleness, then least recently used ones until under the size cap"""
+        now = time.time()
+        expired = self._conn.execute(
+            "SELECT key FROM entries WHERE stale_until IS NOT NULL AND stale_until < ?", (now,)
+        ).fetchall()
+        self._conn.execute("DELETE FROM entries WHERE stale_until IS NOT NULL AND stale_until < ?", (now,))
+        # The memory LRU must not keep serving what was removed from disk
+        for (key,) in expired:
+            self._memory.pop(key, None)
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY accessed ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._memory.pop(key, None)
+            total -= size
@@ -0,0 +1,184 @@
+import re
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+CATALOG_MAX_AGE = 3 * 60 * 60  # Full refresh at least every 3 hours
+PHASE_RECHECK = 60  # Minimum seconds between refreshes for a pending phase change
+
+COLUMNS = ("id", "name", "type", "phase", "frozen", "duration", "start_time", "division")
+
+DIVISION_PATTERN = re.compile(r'Div\.\s*(\d)(?:\s*\+\s*Div\.\s*(\d))?', re.IGNORECASE)
+
+
+def parse_division(name: str) -> Optional[str]:
+    """Extract the division from a contest name (e.g. '2', '1+2')"""
+    match = DIVISION_PATTERN.search(name or "")
+    if not match:
+        return None
+    if match.group(2):
+        return f"{match.group(1)}+{match.group(2)}"
+    return match.group(1)
+
+
+def _to_row(contest: Dict) -> Tuple:
+    name = contest.get("name", "")
+    return (
+        contest.get("id"),
+        name,
+        contest.get("type"),
+        contest.get("phase"),
+        1 if contest.get("frozen") else 0,
+        contest.get("durationSeconds", 0),
+        contest.get("startTimeSeconds"),
+        parse_division(name)
+    )
+
+
+def _to_contest(row: Tuple) -> Dict:
+    return {
+        "id": row[0],
+        "name": row[1],
+        "type": row[2],
+        "phase": row[3],
+        "frozen": bool(row[4]),
+        "durationSeconds": row[5],
+        "startTimeSeconds": row[6],
+        "division": row[7]
+    }
+
+
+class ContestCatalog:
+    """Local indexed copy of the Codeforces contest list"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS contests (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                type TEXT,
+                phase TEXT NOT NULL,
+                frozen INTEGER NOT NULL DEFAULT 0,
+                duration INTEGER NOT NULL DEFAULT 0,
+                start_time INTEGER,
+                division TEXT
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_contests_phase_start ON contests (phase, start_time)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_contests_start ON contests (start_time)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_contests_division ON contests (division, start_time)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                name TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    @property
+    def refreshed_at(self) -> float:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE name = 'refreshed_at'").fetchone()
+        return float(row[0]) if row else 0.0
+
+    def needs_refresh(self, max_age: float = CATALOG_MAX_AGE) -> bool:
+        """Check whether the catalog is empty, too old, or has contests due to change phase"""
+        return time.time() - self.refreshed_at > max_age or self.phase_change_due()
+
+    def phase_change_due(self, recheck: float = PHASE_RECHECK) -> bool:
+        """Check for contests that should have started or ended, or are still in system testing
+
+        Codeforces may flip a phase late, so these only trigger a refresh when
+        the last one is at least `recheck` seconds old.
+        """
+        now = time.time()
+        if now - self.refreshed_at < recheck:
+            return False
+        with self._lock:
+            due = self._conn.execute("""
+                SELECT 1 FROM contests
+                WHERE (phase = 'BEFORE' AND start_time <= ?)
+                   OR (phase = 'CODING' AND start_time + duration <= ?)
+                   OR phase IN ('PENDING_SYSTEM_TEST', 'SYSTEM_TEST')
+                LIMIT 1
+            """, (now, now)).fetchone()
+        return due is not None
+
+    def merge(self, contests: List[Dict]) -> Dict:
+        """Merge a fresh contest list, writing only new or changed contests"""
+        with self._lock:
+            existing = {row[0]: row for row in self._conn.execute(f"SELECT {', '.join(COLUMNS)} FROM contests")}
+
+            added, updated = [], []
+            for contest in contests:
+                row = _to_row(contest)
+                if row[0] is None:
+                    continue
+                current = existing.get(row[0])
+                if current is None:
+                    added.append(row)
+                elif current != row:
+                    updated.append(row)
+
+            placeholders = ", ".join("?" for _ in COLUMNS)
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO contests ({', '.join(COLUMNS)}) VALUES ({placeholders})",
+                added + updated
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('refreshed_at', ?)",
+                (str(time.time()),)
+            )
+            self._conn.commit()
+
+        return {"added": len(added), "updated": len(updated)}
+
+    def query(self, phase: Optional[str] = None, limit: Optional[int] = None, newest_first: bool = False,
+              since: Optional[int] = None, until: Optional[int] = None,
+              name: Optional[str] = None, division: Optional[str] = None) -> List[Dict]:
+        """Query contests using the phase/start-time indexes"""
+        clauses, args = [], []
+        if phase:
+            clauses.append("phase = ?")
+            args.append(phase)
+        if since is not None:
+            clauses.append("start_time >= ?")
+            args.append(since)
+        if until is not None:
+            clauses.append("start_time < ?")
+            args.append(until)
+        if division:
+            clauses.append("division = ?")
+            args.append(division)
+        if name:
+            clauses.append("name LIKE ? ESCAPE '\\'")
+            escaped = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            args.append(f"%{escaped}%")
+
+        sql = f"SELECT {', '.join(COLUMNS)} FROM contests"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY start_time " + ("DESC" if newest_first else "ASC")
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [_to_contest(row) for row in rows]
+
+    def get(self, contest_id: int) -> Optional[Dict]:
+        """Look up a single contest by ID"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM contests WHERE id = ?", (contest_id,)
+            ).fetchone()
+        return _to_contest(row) if row else None
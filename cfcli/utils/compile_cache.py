@@ -0,0 +1,172 @@
+import os
+import re
+import json
+import time
+import shutil
+import hashlib
+import threading
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .judge import DEFAULT_COMPILER, DEFAULT_FLAGS
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256 MB
+INCLUDE_PATTERN = re.compile(r'^\s*#\s*include\s*[<"][^>"]+[>"]', re.MULTILINE)
+
+
+def _is_gcc(compiler: str) -> bool:
+    """Precompiled headers are only set up for GCC-style compilers"""
+    name = Path(compiler).name
+    return "g++" in name or "gcc" in name
+
+
+class CompileCache:
+    """Content-addressed store of compiled solution binaries"""
+
+    def __init__(self, cache_dir: Path, template_file: Optional[Path] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.template_file = template_file
+        self.max_bytes = max_bytes
+        self.index_file = cache_dir / "index.json"
+        self._lock = threading.Lock()
+        self._index = None
+
+    def _load_index(self) -> Dict:
+        if self._index is None:
+            try:
+                with open(self.index_file, 'r') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {"entries": {}, "hits": 0, "misses": 0, "time_saved": 0.0}
+        return self._index
+
+    def _save_index(self) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.index_file.with_suffix(".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_file, self.index_file)
+
+    def _compiler_id(self, compiler: str) -> str:
+        """Identify the compiler binary without running it"""
+        path = shutil.which(compiler)
+        if path is None:
+            return compiler
+        stat = os.stat(path)
+        return f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def _prelude(self) -> Optional[str]:
+        """The #include lines of the user's template, shared by every generated file"""
+        if self.template_file is None or not self.template_file.exists():
+            return None
+        includes = INCLUDE_PATTERN.findall(self.template_file.read_text())
+        return "\n".join(line.strip() for line in includes) + "\n" if includes else None
+
+    def _precompiled_header(self, compiler: str, flags: List[str], compiler_id: str) -> Optional[Path]:
+        """Build (once) a precompiled header for the template prelude"""
+        prelude = self._prelude()
+        if prelude is None or not _is_gcc(compiler):
+            return None
+
+        digest = hashlib.sha256("\0".join([prelude, compiler_id, *flags]).encode('utf-8')).hexdigest()[:16]
+        pch_dir = self.cache_dir / "pch" / digest
+        header = pch_dir / "prelude.h"
+        if (pch_dir / "prelude.h.gch").exists():
+            return header
+
+        pch_dir.mkdir(parents=True, exist_ok=True)
+        header.write_text(prelude)
+        proc = subprocess.run(
+            [compiler, *flags, "-x", "c++-header", str(header), "-o", str(pch_dir / "prelude.h.gch")],
+            capture_output=True, text=True
+        )
+        return header if proc.returncode == 0 else None
+
+    def compile(self, source: Path, compiler: str = DEFAULT_COMPILER,
+                flags: Optional[List[str]] = None) -> Dict:
+        """Compile a source file, reusing the cached binary when nothing changed"""
+        if shutil.which(compiler) is None:
+            return {"status": "FAILED", "comment": f"Compiler '{compiler}' not found"}
+
+        flags = list(DEFAULT_FLAGS if flags is None else flags)
+        compiler_id = self._compiler_id(compiler)
+        header = self._precompiled_header(compiler, flags, compiler_id)
+        if header is not None:
+            flags = ["-include", str(header), "-Winvalid-pch", *flags]
+
+        key = hashlib.sha256(b"\0".join([
+            Path(source).read_bytes(), compiler_id.encode('utf-8'), *(f.encode('utf-8') for f in flags)
+        ])).hexdigest()
+        binary = self.cache_dir / "bin" / key
+
+        with self._lock:
+            index = self._load_index()
+            entry = index["entries"].get(key)
+            if entry is not None and binary.exists():
+                entry["used"] = time.time()
+                index["hits"] += 1
+                index["time_saved"] += entry["compile_time"]
+                self._save_index()
+                return {"status": "OK", "result": {"binary": str(binary), "cached": True, "elapsed": 0.0}}
+
+        binary.parent.mkdir(parents=True, exist_ok=True)
+        started = time.perf_counter()
+        tmp_binary = binary.with_name(f"{key}.{os.getpid()}.tmp")
+        proc = subprocess.run(
+            [compiler, *flags, str(source), "-o", str(tmp_binary)],
+            capture_output=True, text=True
+        )
+        elapsed = time.perf_counter() - started
+        if proc.returncode != 0:
+            tmp_binary.unlink(missing_ok=True)
+            return {"status": "FAILED", "comment": proc.stderr.strip() or "Compilation failed"}
+        os.replace(tmp_binary, binary)
+
+        with self._lock:
+            index = self._load_index()
+            index["misses"] += 1
+            index["entries"][key] = {
+                "source": str(source),
+                "size": binary.stat().st_size,
+                "compile_time": elapsed,
+                "used": time.time()
+            }
+            self._evict()
+            self._save_index()
+
+        return {"status": "OK", "result": {"binary": str(binary), "cached": False, "elapsed": elapsed}}
+
+    def _evict(self) -> None:
+        """Remove least recently used binaries until under the size cap"""
+        entries = self._index["entries"]
+        total = sum(e["size"] for e in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]["used"]):
+            if total <= self.max_bytes:
+                break
+            (self.cache_dir / "bin" / key).unlink(missing_ok=True)
+            total -= entries.pop(key)["size"]
+
+    def stats(self) -> Dict:
+        """Get binary count, size, hit rate and compile time saved"""
+        with self._lock:
+            index = self._load_index()
+            lookups = index["hits"] + index["misses"]
+            return {
+                "entries": len(index["entries"]),
+                "bytes": sum(e["size"] for e in index["entries"].values()),
+                "max_bytes": self.max_bytes,
+                "hits": index["hits"],
+                "misses": index["misses"],
+                "hit_ratio": index["hits"] / lookups if lookups else 0.0,
+                "time_saved": index["time_saved"]
+            }
+
+    def clear(self) -> int:
+        """Remove all binaries and precompiled headers"""
+        with self._lock:
+            removed = len(self._load_index()["entries"])
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            self._index = None
+        return removed
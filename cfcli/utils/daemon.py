@@ -0,0 +1,324 @@
+import os
+import sys
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Only the standard library is imported here: the client side runs before
+# click, requests or any cfcli module is loaded. socket and hashlib are only
+# imported once a daemon socket exists.
+
+# submit is left out: it may prompt for the problem, and the daemon has no stdin
+DAEMON_COMMANDS = {"fetch", "status", "generate", "search", "history", "standings", "cache", "export", "users"}
+
+# Modes that keep running until interrupted gain nothing from a warm start and
+# would hold the daemon for as long as they run, so they always run in-process
+LONG_RUNNING_FLAGS = {"--live", "--watch"}
+
+# Settings a daemon was started with; clients with different ones run in-process
+ENV_KEYS = ("CF_HANDLE", "CF_API_KEY", "CF_API_SECRET", "CF_PASSWORD",
+            "CFCLI_BASE_URL", "CFCLI_API_RATE", "CFCLI_OFFLINE")
+
+DEFAULT_IDLE_TIMEOUT = 2 * 60 * 60  # Exit after two hours without requests
+MEMORY_CACHE_ENTRIES = 256
+
+
+def socket_path() -> Path:
+    return Path(os.getenv("CFCLI_SOCKET") or Path.home() / ".cfcli" / "daemon.sock")
+
+
+def env_fingerprint() -> str:
+    """Hash of the settings that change command results, without sending secrets"""
+    import hashlib
+
+    values = "\0".join(os.getenv(key, "") for key in ENV_KEYS)
+    return hashlib.sha256(values.encode("utf-8")).hexdigest()
+
+
+def _send(conn: "socket.socket", message: Dict) -> None:
+    conn.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def _messages(conn: "socket.socket"):
+    """Yield newline-delimited JSON messages from a socket"""
+    buffer = b""
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            return
+        buffer += chunk
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            yield json.loads(line)
+
+
+def forwardable(argv: List[str]) -> bool:
+    """Whether a command line may be run by the daemon"""
+    return (bool(argv) and argv[0] in DAEMON_COMMANDS and "--help" not in argv
+            and not LONG_RUNNING_FLAGS.intersection(argv))
+
+
+def request(message: Dict, timeout: Optional[float] = 5.0) -> Optional[Dict]:
+    """Send a control message to the daemon and return its reply, or None if it is not running"""
+    import socket
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(timeout)
+            conn.connect(str(socket_path()))
+            _send(conn, message)
+            return next(_messages(conn), None)
+    except (OSError, ValueError):
+        return None
+
+
+def forward(argv: List[str]) -> Optional[int]:
+    """Run a command in the daemon, streaming its output
+
+    Returns the exit code, or None when the command should run in-process
+    (no daemon, a busy daemon, different settings or an unsupported command).
+    """
+    if not forwardable(argv):
+        return None
+    path = socket_path()
+    if not path.exists():
+        return None
+
+    import socket
+
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    output = False
+    try:
+        conn.connect(str(path))
+        _send(conn, {
+            "command": "run",
+            "argv": argv,
+            "cwd": os.getcwd(),
+            "tty": sys.stdout.isatty(),
+            "env": env_fingerprint()
+        })
+        for message in _messages(conn):
+            if "out" in message:
+                sys.stdout.write(message["out"])
+                sys.stdout.flush()
+                output = True
+            elif "err" in message:
+                sys.stderr.write(message["err"])
+                sys.stderr.flush()
+                output = True
+            elif "exit" in message:
+                return message["exit"]
+            elif message.get("fallback"):
+                return None
+        # The daemon went away mid-command; only rerun if nothing was shown yet
+        return 1 if output else None
+    except KeyboardInterrupt:
+        return 130
+    except (OSError, ValueError):
+        return 1 if output else None
+    finally:
+        conn.close()
+
+
+class _StreamWriter:
+    """File-like object that forwards writes to a client as messages"""
+
+    def __init__(self, conn: "socket.socket", key: str, tty: bool):
+        self.conn = conn
+        self.key = key
+        self.tty = tty
+        self.encoding = "utf-8"
+
+    def write(self, text: str) -> int:
+        if text:
+            _send(self.conn, {self.key: text})
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+    def isatty(self) -> bool:
+        return self.tty
+
+    def fileno(self) -> int:
+        raise OSError("daemon output stream has no file descriptor")
+
+
+class _ThreadStream:
+    """Stands in for sys.stdin, sys.stdout or sys.stderr and routes each thread to its own stream
+
+    Installed once when the daemon starts. The thread running a command is
+    bound to the client's streams; every other thread, such as API workers
+    and background refreshes, keeps writing to the daemon's own stream.
+    """
+
+    def __init__(self, default):
+        self._default = default
+        self._local = threading.local()
+
+    def bind(self, stream) -> None:
+        self._local.stream = stream
+
+    def unbind(self) -> None:
+        self._local.stream = None
+
+    def _target(self):
+        return getattr(self._local, "stream", None) or self._default
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def __getattr__(self, name: str):
+        return getattr(self._target(), name)
+
+
+class Daemon:
+    """Runs cfcli commands for thin clients in one warm process"""
+
+    def __init__(self, path: Path, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self.started = time.time()
+        self.last_request = time.time()
+        self.requests = 0
+        self.fingerprint = env_fingerprint()
+        self._run_lock = threading.Lock()
+        self._server = None
+        self._streams = None
+
+    def _warm_up(self) -> None:
+        """Build the shared session and open a keep-alive connection ahead of the first command"""
+        from ..commands.cli import get_session
+
+        session = get_session()
+        session.cache.memory_entries = MEMORY_CACHE_ENTRIES
+        try:
+            session.session.head(session.CF_BASE_URL, timeout=10)
+        except Exception:
+            pass
+
+    def handle(self, conn: "socket.socket") -> None:
+        try:
+            message = next(_messages(conn), None)
+        except (OSError, ValueError):
+            return
+        if not message:
+            return
+
+        command = message.get("command")
+        if command == "ping":
+            _send(conn, self.status())
+        elif command == "stop":
+            _send(conn, {"stopping": True})
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+        elif command == "run":
+            if (message.get("env") != self.fingerprint or not forwardable(message.get("argv", []))
+                    or not self._run_lock.acquire(blocking=False)):
+                _send(conn, {"fallback": True})
+                return
+            try:
+                self.last_request = time.time()
+                self.requests += 1
+                code = self.run(conn, message)
+                _send(conn, {"exit": code})
+            except OSError:
+                pass  # The client disconnected
+            finally:
+                self.last_request = time.time()
+                self._run_lock.release()
+
+    def run(self, conn: "socket.socket", message: Dict) -> int:
+        """Run one command with its output sent to the client"""
+        import io
+        import click
+        from .trace import tracer
+        from ..commands.cli import cli, _instances
+
+        # Per-command state starts fresh; the session and caches stay warm
+        tracer.calls.clear()
+        tracer.spans.clear()
+        tracer.origin = time.perf_counter()
+        if "session" in _instances:
+            _instances["session"].stale_served.clear()
+
+        tty = message.get("tty", False)
+        streams = [io.StringIO(""), _StreamWriter(conn, "out", tty), _StreamWriter(conn, "err", tty)]
+        for proxy, stream in zip(self._streams, streams):
+            proxy.bind(stream)
+
+        cwd = os.getcwd()
+        try:
+            os.chdir(message.get("cwd") or cwd)
+            cli.main(args=message.get("argv", []), prog_name="cfcli", standalone_mode=False, obj={"daemon": True})
+            return 0
+        except click.exceptions.Exit as e:
+            return e.exit_code
+        except click.ClickException as e:
+            e.show()
+            return e.exit_code
+        except click.Abort:
+            print("Aborted!", file=sys.stderr)
+            return 1
+        except SystemExit as e:
+            return e.code if isinstance(e.code, int) else 1
+        finally:
+            for proxy in self._streams:
+                proxy.unbind()
+            os.chdir(cwd)
+
+    def status(self) -> Dict:
+        return {
+            "pid": os.getpid(),
+            "uptime": time.time() - self.started,
+            "idle": time.time() - self.last_request,
+            "requests": self.requests
+        }
+
+    def _watch_idle(self) -> None:
+        while True:
+            time.sleep(min(60.0, self.idle_timeout))
+            if time.time() - self.last_request > self.idle_timeout and not self._run_lock.locked():
+                self._server.shutdown()
+                return
+
+    def serve(self) -> None:
+        """Serve clients until stopped or idle for too long"""
+        import socketserver
+
+        daemon = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                daemon.handle(self.request)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            self.path.unlink()
+        # Only the current user may connect: the daemon holds the web session
+        umask = os.umask(0o177)
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(str(self.path), Handler)
+        finally:
+            os.umask(umask)
+        self._server.daemon_threads = True
+        # Output is routed per thread from here on, so commands never swap the process-wide streams
+        saved = sys.stdin, sys.stdout, sys.stderr
+        self._streams = [_ThreadStream(stream) for stream in saved]
+        sys.stdin, sys.stdout, sys.stderr = self._streams
+        try:
+            self._warm_up()
+            if self.idle_timeout:
+                threading.Thread(target=self._watch_idle, daemon=True).start()
+            self._server.serve_forever()
+        finally:
+            sys.stdin, sys.stdout, sys.stderr = saved
+            self._server.server_close()
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
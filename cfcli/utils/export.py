@@ -0,0 +1,223 @@
+import io
+import os
+import csv
+import bz2
+import gzip
+import json
+import lzma
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Column types used for Parquet schemas
+INT, FLOAT, STR, BOOL = "int", "float", "str", "bool"
+
+# Stream codecs for line formats; each written page is compressed as its own
+# member, and readers of all three formats accept concatenated members.
+STREAM_CODECS = {
+    "gzip": (gzip.compress, ".gz"),
+    "bz2": (bz2.compress, ".bz2"),
+    "xz": (lzma.compress, ".xz"),
+}
+PARQUET_CODECS = ("snappy", "gzip", "zstd")
+
+FORMATS = ("jsonl", "csv", "parquet")
+
+STATUS_COLUMNS = [
+    ("id", INT), ("contestId", INT), ("creationTimeSeconds", INT), ("relativeTimeSeconds", INT),
+    ("problemIndex", STR), ("problemName", STR), ("author", STR), ("participantType", STR),
+    ("programmingLanguage", STR), ("verdict", STR), ("testset", STR), ("passedTestCount", INT),
+    ("timeConsumedMillis", INT), ("memoryConsumedBytes", INT),
+]
+
+PROBLEM_COLUMNS = [
+    ("contestId", INT), ("index", STR), ("name", STR), ("type", STR), ("points", FLOAT),
+    ("rating", INT), ("tags", STR),
+]
+
+
+def _party(party: Dict) -> str:
+    return party.get("teamName") or ";".join(m.get("handle", "") for m in party.get("members", []))
+
+
+def status_record(submission: Dict) -> Dict:
+    """Flatten a contest.status submission"""
+    problem = submission.get("problem", {})
+    author = submission.get("author", {})
+    return {
+        "id": submission.get("id"),
+        "contestId": submission.get("contestId"),
+        "creationTimeSeconds": submission.get("creationTimeSeconds"),
+        "relativeTimeSeconds": submission.get("relativeTimeSeconds"),
+        "problemIndex": problem.get("index"),
+        "problemName": problem.get("name"),
+        "author": _party(author),
+        "participantType": author.get("participantType"),
+        "programmingLanguage": submission.get("programmingLanguage"),
+        "verdict": submission.get("verdict"),
+        "testset": submission.get("testset"),
+        "passedTestCount": submission.get("passedTestCount"),
+        "timeConsumedMillis": submission.get("timeConsumedMillis"),
+        "memoryConsumedBytes": submission.get("memoryConsumedBytes"),
+    }
+
+
+def standings_columns(problems: List[Dict]) -> List[Tuple[str, str]]:
+    """Standings columns: the party, totals, then points/rejections/time per problem"""
+    columns = [
+        ("rank", INT), ("party", STR), ("participantType", STR), ("points", FLOAT), ("penalty", INT),
+        ("successfulHackCount", INT), ("unsuccessfulHackCount", INT),
+    ]
+    for problem in problems:
+        index = problem.get("index", "")
+        columns += [(f"{index}_points", FLOAT), (f"{index}_rejected", INT), (f"{index}_time", INT)]
+    return columns
+
+
+def standings_record(row: Dict, problems: List[Dict]) -> Dict:
+    """Flatten a contest.standings row"""
+    party = row.get("party", {})
+    record = {
+        "rank": row.get("rank"),
+        "party": _party(party),
+        "participantType": party.get("participantType"),
+        "points": row.get("points"),
+        "penalty": row.get("penalty"),
+        "successfulHackCount": row.get("successfulHackCount"),
+        "unsuccessfulHackCount": row.get("unsuccessfulHackCount"),
+    }
+    for problem, result in zip(problems, row.get("problemResults", [])):
+        index = problem.get("index", "")
+        record[f"{index}_points"] = result.get("points")
+        record[f"{index}_rejected"] = result.get("rejectedAttemptCount")
+        record[f"{index}_time"] = result.get("bestSubmissionTimeSeconds")
+    return record
+
+
+def problem_record(problem: Dict) -> Dict:
+    """Flatten a problem"""
+    record = {name: problem.get(name) for name, _ in PROBLEM_COLUMNS}
+    record["tags"] = ";".join(problem.get("tags", []))
+    return record
+
+
+def default_output(contest_id: int, what: str, fmt: str, compression: Optional[str]) -> Path:
+    name = f"contest{contest_id}_{what}.{fmt}"
+    if fmt != "parquet" and compression in STREAM_CODECS:
+        name += STREAM_CODECS[compression][1]
+    return Path(name)
+
+
+def check_compression(fmt: str, compression: Optional[str]) -> Optional[str]:
+    """Return an error message if the compression does not fit the format"""
+    if not compression or compression == "none":
+        return None
+    if fmt == "parquet" and compression not in PARQUET_CODECS:
+        return f"Parquet supports {', '.join(PARQUET_CODECS)} compression"
+    if fmt != "parquet" and compression not in STREAM_CODECS:
+        return f"{fmt.upper()} supports {', '.join(STREAM_CODECS)} compression"
+    return None
+
+
+class ExportWriter:
+    """Append-only writer that checkpoints after every page
+
+    The progress sidecar (``<output>.progress``) records how many records
+    and bytes were written, so an interrupted export can be resumed from
+    the last complete page.
+    """
+
+    def __init__(self, path: Path, fmt: str, columns: List[Tuple[str, str]],
+                 compression: Optional[str] = None, state: Optional[Dict] = None):
+        self.path = path
+        self.fmt = fmt
+        self.columns = columns
+        if fmt == "parquet":
+            # pyarrow writes uncompressed files for "none"
+            self.compression = compression or "snappy"
+        else:
+            self.compression = None if compression == "none" else compression
+        self.progress_path = path.with_name(path.name + ".progress")
+        self.state = state or {"format": fmt, "compression": self.compression,
+                               "columns": [name for name, _ in columns], "rows": 0, "bytes": 0, "parts": 0}
+
+        if state and state.get("columns") != [name for name, _ in columns]:
+            raise ValueError(f"The columns of {path} changed since the export started; use --restart")
+
+        if fmt == "parquet":
+            import pyarrow  # noqa: F401  Fail early when the optional dependency is missing
+            if not state and self.path.exists():
+                for part in self.path.glob("part-*.parquet"):
+                    part.unlink()
+            self.path.mkdir(parents=True, exist_ok=True)
+        elif state:
+            # Drop anything written after the last checkpoint
+            with open(self.path, "ab") as f:
+                f.truncate(self.state["bytes"])
+        else:
+            with open(self.path, "wb"):
+                pass
+            if fmt == "csv":
+                self._append(self._csv([dict((name, name) for name, _ in columns)]))
+
+    @staticmethod
+    def load_state(path: Path) -> Optional[Dict]:
+        """Read the progress of an interrupted export, if any"""
+        try:
+            with open(path.with_name(path.name + ".progress"), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _csv(self, records: List[Dict]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=[name for name, _ in self.columns], extrasaction="ignore")
+        writer.writerows(records)
+        return buffer.getvalue().encode("utf-8")
+
+    def _append(self, data: bytes) -> None:
+        if self.compression:
+            data = STREAM_CODECS[self.compression][0](data)
+        with open(self.path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self.state["bytes"] += len(data)
+
+    def _write_parquet(self, records: List[Dict]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        types = {INT: pa.int64(), FLOAT: pa.float64(), STR: pa.string(), BOOL: pa.bool_()}
+        schema = pa.schema([(name, types[kind]) for name, kind in self.columns])
+        table = pa.Table.from_pylist(records, schema=schema)
+        part = self.path / f"part-{self.state['parts']:05d}.parquet"
+        pq.write_table(table, part, compression=self.compression)
+        self.state["parts"] += 1
+
+    def write(self, records: List[Dict], **progress) -> None:
+        """Write one page and checkpoint; extra keyword arguments are saved with the progress"""
+        if records:
+            if self.fmt == "jsonl":
+                self._append("".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records).encode("utf-8"))
+            elif self.fmt == "csv":
+                self._append(self._csv(records))
+            else:
+                self._write_parquet(records)
+            self.state["rows"] += len(records)
+        self.state.update(progress)
+
+        tmp = self.progress_path.with_name(self.progress_path.name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.progress_path)
+
+    @staticmethod
+    def mark_complete(path: Path) -> None:
+        """Mark an export complete by removing its progress file"""
+        try:
+            path.with_name(path.name + ".progress").unlink()
+        except OSError:
+            pass
+
+    def finish(self) -> None:
+        self.mark_complete(self.path)
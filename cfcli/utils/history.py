@@ -0,0 +1,215 @@
+import os
+import json
+import time
+from array import array
+from pathlib import Path
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+# Column name -> array typecode. Strings are dictionary-encoded into ints.
+COLUMNS = {
+    "id": "q",
+    "time": "q",
+    "problem": "l",
+    "verdict": "H",
+    "language": "H",
+    "passed": "H",
+    "time_ms": "l",
+    "memory_kb": "l",
+}
+
+UNKNOWN_VERDICT = "TESTING"
+
+
+class SubmissionHistory:
+    """Column-oriented local store of one handle's submissions, oldest first"""
+
+    def __init__(self, store_dir: Path, handle: str):
+        self.handle = handle
+        self.dir = store_dir / handle.lower()
+        self.columns = {name: array(code) for name, code in COLUMNS.items()}
+        self.verdicts: List[str] = []
+        self.languages: List[str] = []
+        self.problems: List[str] = []  # "contestId/index" keys
+        self.problem_meta: Dict[str, Dict] = {}
+        self.synced_at = 0.0
+        self._codes: Dict[str, Dict[str, int]] = {"verdict": {}, "language": {}, "problem": {}}
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    @property
+    def last_id(self) -> int:
+        return self.columns["id"][-1] if len(self) else 0
+
+    def _load(self) -> None:
+        try:
+            with open(self.dir / "meta.json", 'r') as f:
+                meta = json.load(f)
+            with open(self.dir / "columns.bin", 'rb') as f:
+                for name in COLUMNS:
+                    self.columns[name].fromfile(f, meta["rows"])
+        except (OSError, ValueError, EOFError, KeyError):
+            self.columns = {name: array(code) for name, code in COLUMNS.items()}
+            return
+
+        self.verdicts = meta["verdicts"]
+        self.languages = meta["languages"]
+        self.problems = meta["problems"]
+        self.problem_meta = meta["problem_meta"]
+        self.synced_at = meta.get("synced_at", 0.0)
+        for column, values in (("verdict", self.verdicts), ("language", self.languages), ("problem", self.problems)):
+            self._codes[column] = {value: code for code, value in enumerate(values)}
+
+    def save(self) -> None:
+        """Write the columns and dictionaries atomically"""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp_columns = self.dir / "columns.bin.tmp"
+        with open(tmp_columns, 'wb') as f:
+            for name in COLUMNS:
+                self.columns[name].tofile(f)
+        tmp_meta = self.dir / "meta.json.tmp"
+        with open(tmp_meta, 'w') as f:
+            json.dump({
+                "handle": self.handle,
+                "rows": len(self),
+                "verdicts": self.verdicts,
+                "languages": self.languages,
+                "problems": self.problems,
+                "problem_meta": self.problem_meta,
+                "synced_at": self.synced_at
+            }, f)
+        os.replace(tmp_columns, self.dir / "columns.bin")
+        os.replace(tmp_meta, self.dir / "meta.json")
+
+    def _encode(self, column: str, values: List[str], value: str) -> int:
+        codes = self._codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(value)
+        return code
+
+    def append(self, submissions: Iterable[Dict]) -> int:
+        """Append submissions (oldest first) that are newer than the last stored one"""
+        added = 0
+        last_id = self.last_id
+        for s in submissions:
+            if s.get("id", 0) <= last_id:
+                continue
+            problem = s.get("problem", {})
+            key = f"{problem.get('contestId', '')}/{problem.get('index', '')}"
+            if key not in self.problem_meta:
+                self.problem_meta[key] = {
+                    "name": problem.get("name", ""),
+                    "rating": problem.get("rating"),
+                    "tags": problem.get("tags", [])
+                }
+            columns = self.columns
+            columns["id"].append(s["id"])
+            columns["time"].append(s.get("creationTimeSeconds", 0))
+            columns["problem"].append(self._encode("problem", self.problems, key))
+            columns["verdict"].append(self._encode("verdict", self.verdicts, s.get("verdict") or UNKNOWN_VERDICT))
+            columns["language"].append(self._encode("language", self.languages, s.get("programmingLanguage", "")))
+            columns["passed"].append(min(s.get("passedTestCount", 0), 65535))
+            columns["time_ms"].append(s.get("timeConsumedMillis", 0))
+            columns["memory_kb"].append(s.get("memoryConsumedBytes", 0) // 1024)
+            last_id = s["id"]
+            added += 1
+        self.synced_at = time.time()
+        return added
+
+    def drop_pending(self) -> None:
+        """Remove trailing submissions without a final verdict so the next sync refetches them"""
+        code = self._codes["verdict"].get(UNKNOWN_VERDICT)
+        if code is None:
+            return
+        verdicts = self.columns["verdict"]
+        keep = len(verdicts)
+        for i in range(len(verdicts) - 1, max(-1, len(verdicts) - 51), -1):
+            if verdicts[i] == code:
+                keep = i
+        for column in self.columns.values():
+            del column[keep:]
+
+    # Analytics
+
+    def verdicts_by(self, dimension: str) -> Dict[str, Counter]:
+        """Verdict counts grouped by 'tag', 'rating', 'language' or 'problem'"""
+        groups: Dict[str, Counter] = defaultdict(Counter)
+        verdict_codes = self.columns["verdict"]
+
+        if dimension == "language":
+            pairs = Counter(zip(self.columns["language"], verdict_codes))
+            for (language, verdict), n in pairs.items():
+                groups[self.languages[language]][self.verdicts[verdict]] += n
+            return dict(groups)
+
+        # Count per (problem, verdict) once, then fan out to problem attributes
+        pairs = Counter(zip(self.columns["problem"], verdict_codes))
+        for (problem, verdict), n in pairs.items():
+            key = self.problems[problem]
+            meta = self.problem_meta.get(key, {})
+            if dimension == "tag":
+                labels = meta.get("tags") or ["(no tags)"]
+            elif dimension == "rating":
+                labels = [str(meta["rating"]) if meta.get("rating") else "unrated"]
+            else:
+                labels = [key]
+            for label in labels:
+                groups[label][self.verdicts[verdict]] += n
+        return dict(groups)
+
+    def _first_times(self) -> Tuple[Dict[int, int], Dict[int, int]]:
+        """First attempt and first accepted time per problem code"""
+        first_try: Dict[int, int] = {}
+        first_ok: Dict[int, int] = {}
+        ok = self._codes["verdict"].get("OK", -1)
+        for problem, verdict, when in zip(self.columns["problem"], self.columns["verdict"], self.columns["time"]):
+            first_try.setdefault(problem, when)
+            if verdict == ok:
+                first_ok.setdefault(problem, when)
+        return first_try, first_ok
+
+    def solve_times(self) -> List[Dict]:
+        """Time from first attempt to first accepted submission per solved problem"""
+        first_try, first_ok = self._first_times()
+        result = []
+        for problem, solved_at in first_ok.items():
+            key = self.problems[problem]
+            result.append({
+                "problem": key,
+                "name": self.problem_meta.get(key, {}).get("name", ""),
+                "rating": self.problem_meta.get(key, {}).get("rating"),
+                "seconds": solved_at - first_try[problem]
+            })
+        return sorted(result, key=lambda r: -r["seconds"])
+
+    def unsolved(self) -> List[Dict]:
+        """Problems attempted but never accepted, most recent first"""
+        first_try, first_ok = self._first_times()
+        attempts = Counter(self.columns["problem"])
+        last_try: Dict[int, int] = {}
+        for problem, when in zip(self.columns["problem"], self.columns["time"]):
+            last_try[problem] = when
+        result = []
+        for problem in first_try:
+            if problem in first_ok:
+                continue
+            key = self.problems[problem]
+            meta = self.problem_meta.get(key, {})
+            result.append({
+                "problem": key,
+                "name": meta.get("name", ""),
+                "rating": meta.get("rating"),
+                "tags": meta.get("tags", []),
+                "attempts": attempts[problem],
+                "last_attempt": last_try[problem]
+            })
+        return sorted(result, key=lambda r: -r["last_attempt"])
+
+    def solved_problems(self) -> List[str]:
+        """Keys ("contestId/index") of every accepted problem"""
+        _, first_ok = self._first_times()
+        return [self.problems[problem] for problem in first_ok]
@@ -0,0 +1,113 @@
+import os
+import sys
+import time
+import shutil
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+DEFAULT_COMPILER = "g++"
+DEFAULT_FLAGS = ["-std=c++17", "-O2", "-pipe"]
+DEFAULT_TIME_LIMIT = 2.0  # seconds
+DEFAULT_MEMORY_LIMIT = 256  # megabytes
+FLOAT_TOLERANCE = 1e-6
+
+
+def compile_source(source: Path, binary: Path, compiler: str = DEFAULT_COMPILER,
+                   flags: Optional[List[str]] = None) -> Dict:
+    """Compile a C++ source file"""
+    if shutil.which(compiler) is None:
+        return {"status": "FAILED", "comment": f"Compiler '{compiler}' not found"}
+
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [compiler, *(DEFAULT_FLAGS if flags is None else flags), str(source), "-o", str(binary)],
+        capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        return {"status": "FAILED", "comment": proc.stderr.strip() or "Compilation failed"}
+
+    return {"status": "OK", "result": {"binary": str(binary), "elapsed": time.perf_counter() - started}}
+
+
+def _is_real(token) -> bool:
+    """Whether a token is written as a real number rather than an integer"""
+    text = (token.decode(errors="replace") if isinstance(token, bytes) else token).lower()
+    return "." in text or "e" in text or "inf" in text or "nan" in text
+
+
+def outputs_match(expected: str, actual: str) -> bool:
+    """Compare whitespace-separated tokens, allowing a small error for real numbers
+
+    Integers must match exactly; the tolerance only applies when either token
+    is written as a real number. Works on str and bytes alike.
+    """
+    expected_tokens = expected.split()
+    actual_tokens = actual.split()
+    if expected_tokens == actual_tokens:
+        return True
+    if len(expected_tokens) != len(actual_tokens):
+        return False
+
+    for want, got in zip(expected_tokens, actual_tokens):
+        if want == got:
+            continue
+        if not _is_real(want) and not _is_real(got):
+            return False
+        try:
+            want_value, got_value = float(want), float(got)
+        except ValueError:
+            return False
+        # Written as a negated <= so that nan never matches
+        if not abs(want_value - got_value) <= FLOAT_TOLERANCE * max(1.0, abs(want_value)):
+            return False
+    return True
+
+
+def _limited(command: List[str], memory_limit: int) -> List[str]:
+    """Wrap a command so it runs under an address space limit
+
+    The limit is applied by a shell that then execs the command, which keeps
+    process creation free of preexec hooks that are unsafe in threads.
+    """
+    if sys.platform == "win32" or shutil.which("sh") is None:
+        return command
+    return ["sh", "-c", f'ulimit -v {memory_limit * 1024} && exec "$0" "$@"', *command]
+
+
+def run_test(binary: str, test_input: str, expected: Optional[str] = None,
+             time_limit: float = DEFAULT_TIME_LIMIT, memory_limit: int = DEFAULT_MEMORY_LIMIT) -> Dict:
+    """Run a binary on one input and judge its output"""
+    started = time.perf_counter()
+    try:
+        proc = subprocess.run(
+            _limited([os.path.abspath(binary)], memory_limit), input=test_input, capture_output=True, text=True,
+            timeout=time_limit
+        )
+    except subprocess.TimeoutExpired:
+        return {"verdict": "TIME_LIMIT_EXCEEDED", "elapsed": time_limit, "output": "", "stderr": ""}
+
+    elapsed = time.perf_counter() - started
+    result = {"elapsed": elapsed, "output": proc.stdout, "stderr": proc.stderr}
+
+    if proc.returncode != 0:
+        # std::bad_alloc or a failed allocation under RLIMIT_AS usually ends in SIGABRT/SIGSEGV
+        memory_hit = "bad_alloc" in proc.stderr
+        result["verdict"] = "MEMORY_LIMIT_EXCEEDED" if memory_hit else "RUNTIME_ERROR"
+    elif expected is None:
+        result["verdict"] = "OK"
+    else:
+        result["verdict"] = "OK" if outputs_match(expected, proc.stdout) else "WRONG_ANSWER"
+    return result
+
+
+def run_tests(binary: str, tests: List[Dict], time_limit: float = DEFAULT_TIME_LIMIT,
+              memory_limit: int = DEFAULT_MEMORY_LIMIT, jobs: Optional[int] = None) -> List[Dict]:
+    """Run all tests concurrently, one child process per test, returning results in order"""
+    jobs = jobs or min(len(tests), os.cpu_count() or 1) or 1
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(
+            lambda test: run_test(binary, test["input"], test.get("output"), time_limit, memory_limit),
+            tests
+        ))
@@ -0,0 +1,196 @@
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+PROBLEMSET_MAX_AGE = 6 * 60 * 60  # Refresh the problemset at most every 6 hours
+
+COLUMNS = ("contest_id", "idx", "name", "rating", "solved_count")
+
+SORT_ORDERS = {
+    "solved": "p.solved_count DESC",
+    "rating": "p.rating IS NULL, p.rating ASC, p.solved_count DESC",
+    "contest": "p.contest_id DESC, p.idx ASC",
+}
+
+
+def _to_problem(row: Tuple, tags: List[str]) -> Dict:
+    return {
+        "contestId": row[0],
+        "index": row[1],
+        "name": row[2],
+        "rating": row[3],
+        "solvedCount": row[4],
+        "tags": tags
+    }
+
+
+class ProblemsetIndex:
+    """Local indexed copy of the Codeforces problemset
+
+    Tags are kept in an inverted index (tag -> problems), ratings, solved
+    counts and contest IDs are indexed columns, so searches never scan the
+    full problem list.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS problems (
+                contest_id INTEGER NOT NULL,
+                idx TEXT NOT NULL,
+                name TEXT NOT NULL,
+                rating INTEGER,
+                solved_count INTEGER NOT NULL DEFAULT 0,
+                tags TEXT NOT NULL DEFAULT '',
+                PRIMARY KEY (contest_id, idx)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_problems_rating ON problems (rating)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_problems_solved ON problems (solved_count)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS problem_tags (
+                tag TEXT NOT NULL,
+                contest_id INTEGER NOT NULL,
+                idx TEXT NOT NULL,
+                PRIMARY KEY (tag, contest_id, idx)
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                name TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    @property
+    def refreshed_at(self) -> float:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE name = 'refreshed_at'").fetchone()
+        return float(row[0]) if row else 0.0
+
+    def needs_refresh(self, max_age: float = PROBLEMSET_MAX_AGE) -> bool:
+        """Check whether the index is empty or too old"""
+        return time.time() - self.refreshed_at > max_age
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM problems").fetchone()[0]
+
+    def merge(self, problems: List[Dict], statistics: List[Dict]) -> Dict:
+        """Merge a problemset.problems result, writing only new or changed problems"""
+        solved = {(s.get("contestId"), s.get("index")): s.get("solvedCount", 0) for s in statistics}
+
+        with self._lock:
+            existing = {
+                (row[0], row[1]): row
+                for row in self._conn.execute("SELECT contest_id, idx, name, rating, solved_count, tags FROM problems")
+            }
+
+            added, updated = [], []
+            for problem in problems:
+                key = (problem.get("contestId"), problem.get("index"))
+                if key[0] is None or not key[1]:
+                    continue
+                tags = sorted(set(problem.get("tags", [])))
+                row = key + (problem.get("name", ""), problem.get("rating"), solved.get(key, 0), "\t".join(tags))
+                current = existing.get(key)
+                if current is None:
+                    added.append((row, tags))
+                elif current != row:
+                    updated.append((row, tags, current[5] != row[5]))
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO problems (contest_id, idx, name, rating, solved_count, tags) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [row for row, _ in added] + [row for row, _, _ in updated]
+            )
+
+            # Only problems whose tags changed need their postings rewritten
+            retagged = [(row, tags) for row, tags, changed in updated if changed]
+            self._conn.executemany(
+                "DELETE FROM problem_tags WHERE contest_id = ? AND idx = ?",
+                [row[:2] for row, _ in retagged]
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO problem_tags (tag, contest_id, idx) VALUES (?, ?, ?)",
+                [(tag,) + row[:2] for row, tags in added + retagged for tag in tags]
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('refreshed_at', ?)",
+                (str(time.time()),)
+            )
+            self._conn.commit()
+
+        return {"added": len(added), "updated": len(updated)}
+
+    def tags(self) -> List[Tuple[str, int]]:
+        """Every known tag with its number of problems"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT tag, COUNT(*) FROM problem_tags GROUP BY tag ORDER BY tag"
+            ).fetchall()
+
+    def search(self, tags: Optional[List[str]] = None, rating_min: Optional[int] = None,
+               rating_max: Optional[int] = None, min_solved: Optional[int] = None,
+               contest_min: Optional[int] = None, contest_max: Optional[int] = None,
+               exclude: Optional[Iterable[str]] = None, sort: str = "solved",
+               limit: Optional[int] = None) -> List[Dict]:
+        """Find problems having all given tags and matching the rating/solved/contest ranges
+
+        exclude holds "contestId/index" keys, e.g. the problems already solved.
+        """
+        clauses, args = [], []
+        tags = sorted(set(tags or []))
+        sql = f"SELECT {', '.join('p.' + c for c in COLUMNS)}, p.tags FROM problems p"
+        if tags:
+            # Intersect the tag postings before touching the problems table
+            placeholders = ", ".join("?" for _ in tags)
+            sql += f"""
+                JOIN (
+                    SELECT contest_id, idx FROM problem_tags
+                    WHERE tag IN ({placeholders})
+                    GROUP BY contest_id, idx
+                    HAVING COUNT(*) = ?
+                ) t ON t.contest_id = p.contest_id AND t.idx = p.idx
+            """
+            args.extend(tags)
+            args.append(len(tags))
+        if rating_min is not None:
+            clauses.append("p.rating >= ?")
+            args.append(rating_min)
+        if rating_max is not None:
+            clauses.append("p.rating <= ?")
+            args.append(rating_max)
+        if min_solved is not None:
+            clauses.append("p.solved_count >= ?")
+            args.append(min_solved)
+        if contest_min is not None:
+            clauses.append("p.contest_id >= ?")
+            args.append(contest_min)
+        if contest_max is not None:
+            clauses.append("p.contest_id <= ?")
+            args.append(contest_max)
+
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY " + SORT_ORDERS.get(sort, SORT_ORDERS["solved"])
+
+        with self._lock:
+            cursor = self._conn.execute(sql, args)
+            excluded = set(exclude or ())
+            result = []
+            for row in cursor:
+                if excluded and f"{row[0]}/{row[1]}" in excluded:
+                    continue
+                result.append(_to_problem(row, row[5].split("\t") if row[5] else []))
+                if limit is not None and len(result) >= limit:
+                    break
+        return result
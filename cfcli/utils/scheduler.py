@@ -0,0 +1,130 @@
+import heapq
+import time
+import random
+import itertools
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+# Priority lanes: lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+API_RATE = 0.5  # Codeforces allows one call every two seconds
+API_BURST = 1
+
+
+class TransientError(Exception):
+    """An error worth retrying (server errors, call limit exceeded)"""
+    pass
+
+
+class TokenBucket:
+    """Token bucket with a priority queue of waiters"""
+
+    def __init__(self, rate: float = API_RATE, capacity: float = API_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._waiters = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, priority: int = PRIORITY_INTERACTIVE) -> None:
+        """Block until a token is available and no higher-priority caller is waiting"""
+        with self._cond:
+            ticket = (priority, next(self._counter))
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    self._refill()
+                    if self._waiters[0] == ticket and self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    if self._waiters[0] == ticket:
+                        self._cond.wait((1 - self.tokens) / self.rate)
+                    else:
+                        self._cond.wait()
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    def penalize(self, seconds: float) -> None:
+        """Hold back all callers for a while, e.g. after a call limit error"""
+        with self._cond:
+            self._refill()
+            self.tokens = min(self.tokens, 0) - seconds * self.rate
+            self._cond.notify_all()
+
+
+class RequestScheduler:
+    """Rate limits, coalesces and retries outgoing API requests"""
+
+    def __init__(self, rate: float = API_RATE, capacity: float = API_BURST,
+                 max_retries: int = 4, backoff_base: float = 1.0, backoff_max: float = 30.0):
+        self.bucket = TokenBucket(rate, capacity)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retries = 0
+        self.coalesced = 0
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def run(self, key: str, func: Callable[[], Any], priority: int = PRIORITY_INTERACTIVE,
+            info: Optional[Dict] = None) -> Any:
+        """Run func under the rate limit, sharing the result with identical in-flight calls
+
+        If given, info receives the number of retries and whether the call was coalesced.
+        """
+        info = {} if info is None else info
+        info.setdefault("retries", 0)
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.coalesced += 1
+
+        info["coalesced"] = not owner
+        if not owner:
+            return future.result()
+
+        try:
+            result = self._run_with_retries(func, priority, info)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _run_with_retries(self, func: Callable[[], Any], priority: int, info: Dict) -> Any:
+        attempt = 0
+        while True:
+            self.bucket.acquire(priority)
+            try:
+                return func()
+            except TransientError:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                self.bucket.penalize(delay)
+                self.retries += 1
+                info["retries"] += 1
+                attempt += 1
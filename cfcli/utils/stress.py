@@ -0,0 +1,188 @@
+import os
+import time
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from .judge import outputs_match, DEFAULT_TIME_LIMIT
+
+BATCH_SIZE = 25  # Iterations a worker runs before reporting progress
+SHRINK_CHECKS = 400  # Candidate inputs tried while shrinking a failure
+SHRINK_SECONDS = 30.0
+
+
+def _run(command: List[str], data: bytes, time_limit: float) -> bytes:
+    """Run a command with data piped to stdin and return its stdout"""
+    proc = subprocess.run(command, input=data, stdout=subprocess.PIPE,
+                          stderr=subprocess.DEVNULL, timeout=time_limit)
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, command)
+    return proc.stdout
+
+
+def _judge(data: bytes, solution: List[str], brute: List[str], time_limit: float,
+           expected: Optional[bytes] = None) -> Dict:
+    """Run the brute force (unless its output is given) and the solution on one input and compare them"""
+    actual = b""
+    verdict = None
+    try:
+        if expected is None:
+            expected = b""  # Reported as is when the brute force itself fails
+            expected = _run(brute, data, time_limit)
+        actual = _run(solution, data, time_limit)
+        if not outputs_match(expected, actual):
+            verdict = "WRONG_ANSWER"
+    except subprocess.TimeoutExpired:
+        verdict = "TIME_LIMIT_EXCEEDED"
+    except subprocess.CalledProcessError:
+        verdict = "RUNTIME_ERROR"
+    return {"verdict": verdict, "expected": expected, "actual": actual}
+
+
+def _remove_chunks(items: List, fails: Callable[[List], bool]) -> List:
+    """Drop halves, then quarters and so on down to single items while the input still fails"""
+    size = len(items) // 2
+    while size >= 1:
+        start = 0
+        while start < len(items):
+            candidate = items[:start] + items[start + size:]
+            if candidate and fails(candidate):
+                items = candidate
+            else:
+                start += size
+        size //= 2
+    return items
+
+
+def shrink_input(data: bytes, fails: Callable[[bytes], bool], max_checks: int = SHRINK_CHECKS,
+                 max_seconds: float = SHRINK_SECONDS) -> bytes:
+    """Shrink a failing input by dropping lines and tokens and halving integers
+
+    Passes repeat until nothing more can be removed or the check budget runs
+    out; the smallest input that still fails is returned.
+    """
+    deadline = time.perf_counter() + max_seconds
+    checks = [0]
+
+    def attempt(candidate: bytes) -> bool:
+        if checks[0] >= max_checks or time.perf_counter() > deadline:
+            return False
+        checks[0] += 1
+        return fails(candidate)
+
+    def join(rows: List[List[bytes]]) -> bytes:
+        return b"".join(b" ".join(tokens) + b"\n" for tokens in rows)
+
+    rows = [line.split() for line in data.splitlines()]
+    rows = [tokens for tokens in rows if tokens]
+    if not rows or not attempt(join(rows)):
+        # Whitespace normalization alone changes the outcome; leave the input alone
+        return data
+
+    while True:
+        before = join(rows)
+        rows = _remove_chunks(rows, lambda candidate: attempt(join(candidate)))
+        for line in range(len(rows)):
+            rows[line] = _remove_chunks(
+                rows[line], lambda tokens: attempt(join(rows[:line] + [tokens] + rows[line + 1:])))
+        for line in range(len(rows)):
+            for position, token in enumerate(rows[line]):
+                if not token.lstrip(b"-").isdigit():
+                    continue
+                value = int(token)
+                while value:
+                    value = int(value / 2)
+                    tokens = rows[line][:position] + [str(value).encode()] + rows[line][position + 1:]
+                    if not attempt(join(rows[:line] + [tokens] + rows[line + 1:])):
+                        break
+                    rows[line] = tokens
+        if join(rows) == before or checks[0] >= max_checks or time.perf_counter() > deadline:
+            return join(rows)
+
+
+def stress_test(generator: List[str], solution: List[str], brute: List[str], iterations: int = 1000,
+                jobs: Optional[int] = None, time_limit: float = DEFAULT_TIME_LIMIT, seed: int = 1,
+                progress: Optional[Callable[[int], None]] = None, shrink: bool = False) -> Dict:
+    """Compare a solution against a brute force on generated inputs until the first mismatch
+
+    The generator is called with the test seed as its only argument. All data
+    flows through pipes. When several workers fail at once, the smallest
+    failing input is kept. With shrink, a reduced copy made by shrink_input
+    is added as ``failure["shrunk"]``; the generated input is always kept.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    stop = threading.Event()
+    lock = threading.Lock()
+    next_seed = [seed]
+    state = {"done": 0, "failure": None}
+
+    def record_failure(failure: Dict) -> None:
+        with lock:
+            current = state["failure"]
+            if current is None or len(failure["input"]) < len(current["input"]):
+                state["failure"] = failure
+        stop.set()
+
+    def worker() -> None:
+        try:
+            run_batches()
+        except Exception:
+            # A broken generator stops every worker
+            stop.set()
+            raise
+
+    def run_batches() -> None:
+        while not stop.is_set():
+            # Claim a batch of seeds and report back once per batch
+            with lock:
+                first = next_seed[0]
+                count = min(BATCH_SIZE, seed + iterations - first)
+                if count <= 0:
+                    return
+                next_seed[0] += count
+
+            done = 0
+            for test_seed in range(first, first + count):
+                if stop.is_set():
+                    break
+                data = _run(generator + [str(test_seed)], b"", time_limit)
+                judged = _judge(data, solution, brute, time_limit)
+                if judged["verdict"] is not None:
+                    record_failure({"seed": test_seed, "input": data, **judged})
+                    break
+                done += 1
+
+            with lock:
+                state["done"] += done
+                total = state["done"]
+            if progress:
+                progress(total)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(worker) for _ in range(jobs)]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - started
+
+    failure = state["failure"]
+    if failure is not None and shrink:
+        def fails(candidate: bytes) -> bool:
+            # The brute force must accept the candidate, or any malformed input would "fail"
+            try:
+                expected = _run(brute, candidate, time_limit)
+            except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
+                return False
+            return _judge(candidate, solution, brute, time_limit, expected)["verdict"] == failure["verdict"]
+
+        smaller = shrink_input(failure["input"], fails)
+        if len(smaller) < len(failure["input"]):
+            failure = {**failure, "shrunk": {"input": smaller, **_judge(smaller, solution, brute, time_limit)}}
+
+    return {
+        "tests": state["done"],
+        "elapsed": elapsed,
+        "throughput": state["done"] / elapsed if elapsed else 0.0,
+        "failure": failure
+    }
@@ -0,0 +1,153 @@
+import os
+import json
+import time
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+TRACE_LOG_MAX_BYTES = 5 * 1024 * 1024  # Rotate the call log past 5 MB
+
+
+class Tracer:
+    """Collects API call records and timed phases for the current process"""
+
+    def __init__(self):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.calls: List[Dict] = []
+        self.spans: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def _now(self) -> float:
+        return time.perf_counter() - self.origin
+
+    @contextmanager
+    def span(self, name: str, category: str = "phase", **args):
+        """Time a block of work; free when tracing is disabled"""
+        if not self.enabled:
+            yield
+            return
+        start = self._now()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.spans.append({
+                    "name": name,
+                    "cat": category,
+                    "start": start,
+                    "duration": self._now() - start,
+                    "tid": threading.get_ident(),
+                    "args": args
+                })
+
+    def record_call(self, method: str, start: float, duration: float, cache: str,
+                    size: int = 0, retries: int = 0) -> None:
+        """Record one call_api invocation (always kept for the history log)"""
+        with self._lock:
+            self.calls.append({
+                "method": method,
+                "start": start - self.origin,
+                "duration": duration,
+                "cache": cache,
+                "size": size,
+                "retries": retries,
+                "tid": threading.get_ident(),
+                "time": time.time()
+            })
+
+    def summary(self) -> str:
+        """Human-readable summary of calls and phases"""
+        lines = ["== Trace =="]
+        if self.spans:
+            lines.append("Phases:")
+            for span in sorted(self.spans, key=lambda s: s["start"]):
+                lines.append(f"  {span['name']:<28} {span['duration'] * 1000:>9.1f} ms")
+        if self.calls:
+            lines.append("API calls:")
+            for call in self.calls:
+                lines.append(f"  {call['method']:<28} {call['duration'] * 1000:>9.1f} ms  {call['cache']:<5} "
+                             f"{call['size'] / 1024:>8.1f} KB  retries={call['retries']}")
+        network = sum(c["duration"] for c in self.calls if c["cache"] not in ("hit", "stale"))
+        hits = sum(1 for c in self.calls if c["cache"] == "hit")
+        stale = sum(1 for c in self.calls if c["cache"] == "stale")
+        lines.append(f"Total: {len(self.calls)} calls, {hits} cache hits, {stale} stale, {network * 1000:.1f} ms on the network, "
+                     f"{self._now() * 1000:.1f} ms elapsed")
+        return "\n".join(lines)
+
+    def to_json(self) -> Dict:
+        return {"calls": self.calls, "spans": self.spans, "elapsed": self._now()}
+
+    def to_chrome_trace(self) -> Dict:
+        """Events in the Chrome trace format (chrome://tracing, Perfetto)"""
+        pid = os.getpid()
+        events = []
+        for span in self.spans:
+            events.append({"name": span["name"], "cat": span["cat"], "ph": "X", "pid": pid, "tid": span["tid"],
+                           "ts": span["start"] * 1e6, "dur": span["duration"] * 1e6, "args": span["args"]})
+        for call in self.calls:
+            events.append({"name": call["method"], "cat": "api", "ph": "X", "pid": pid, "tid": call["tid"],
+                           "ts": call["start"] * 1e6, "dur": call["duration"] * 1e6,
+                           "args": {"cache": call["cache"], "size": call["size"], "retries": call["retries"]}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def append_to_log(self, log_file: Path) -> None:
+        """Append this process's API calls to the history log"""
+        if not self.calls:
+            return
+        try:
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+            if log_file.exists() and log_file.stat().st_size > TRACE_LOG_MAX_BYTES:
+                os.replace(log_file, log_file.with_suffix(".old.jsonl"))
+            with open(log_file, 'a') as f:
+                for call in self.calls:
+                    f.write(json.dumps({k: call[k] for k in ("time", "method", "duration", "cache", "size", "retries")}) + "\n")
+        except OSError:
+            pass
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def aggregate_log(log_file: Path, since: Optional[float] = None) -> Dict:
+    """Aggregate logged calls per method: latency percentiles, cache hit ratio, sizes, retries"""
+    methods: Dict[str, Dict] = {}
+    for path in (log_file.with_suffix(".old.jsonl"), log_file):
+        if not path.exists():
+            continue
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    call = json.loads(line)
+                except ValueError:
+                    continue
+                if since is not None and call.get("time", 0) < since:
+                    continue
+                entry = methods.setdefault(call["method"], {"calls": 0, "hits": 0, "latencies": [],
+                                                            "bytes": 0, "retries": 0})
+                entry["calls"] += 1
+                entry["retries"] += call.get("retries", 0)
+                if call.get("cache") in ("hit", "stale"):
+                    entry["hits"] += 1
+                else:
+                    entry["latencies"].append(call["duration"])
+                    entry["bytes"] += call.get("size", 0)
+
+    result = {}
+    for method, entry in methods.items():
+        latencies = entry.pop("latencies")
+        result[method] = dict(entry, **{
+            "network_calls": len(latencies),
+            "p50": _percentile(latencies, 0.5),
+            "p95": _percentile(latencies, 0.95),
+            "hit_ratio": entry["hits"] / entry["calls"] if entry["calls"] else 0.0
+        })
+    return result
+
+
+tracer = Tracer()
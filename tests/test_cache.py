@@ -0,0 +1,121 @@
+import time
+
+import pytest
+
+from cfcli.utils.cache import ResponseCache, make_cache_key, FLUSH_READS
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(tmp_path)
+
+
+def test_cache_key_ignores_param_order_and_types():
+    assert make_cache_key("contest.list", {"a": 1, "b": "x"}) == make_cache_key("contest.list", {"b": "x", "a": "1"})
+    assert make_cache_key("contest.list", {"a": 1}) != make_cache_key("contest.list", {"a": 2})
+    assert make_cache_key("contest.list").startswith("contest.list_")
+
+
+def test_put_and_get(cache):
+    cache.put("k", "contest.list", {"status": "OK", "result": [1, 2]}, ttl=60)
+    assert cache.get("k") == {"status": "OK", "result": [1, 2]}
+    assert cache.get("missing") is None
+
+
+def test_expired_entry_is_only_served_as_stale(cache):
+    cache.put("k", "contest.status", {"v": 1}, ttl=-1)
+    assert cache.get("k") is None
+    entry = cache.get_entry("k", stale=True)
+    assert entry["data"] == {"v": 1} and not entry["fresh"]
+
+
+def test_entry_past_max_staleness_is_evicted(cache):
+    cache.put("k", "contest.status", {"v": 1}, ttl=-1000)
+    assert cache.get_entry("k", stale=True) is None
+    assert cache.get_entry("k", any_age=True) is None
+
+
+def test_no_ttl_never_expires(cache):
+    cache.put("k", "contest.standings", {"v": 1}, ttl=None)
+    assert cache.get_entry("k")["fresh"]
+
+
+def test_lru_eviction_keeps_recently_read_entries(tmp_path):
+    payload = {"blob": "".join(chr(33 + (i * 7919) % 90) for i in range(4000))}
+    cache = ResponseCache(tmp_path, max_bytes=1)
+    cache.max_bytes = 10 ** 9
+    cache.put("old", "m", payload, ttl=60)
+    time.sleep(0.01)
+    cache.put("new", "m", payload, ttl=60)
+    time.sleep(0.01)
+    assert cache.get("old") is not None  # Reading makes it the most recently used
+
+    size = cache.stats()["bytes"] // 2
+    cache.max_bytes = size * 2 + size // 2
+    cache.put("third", "m", payload, ttl=60)
+    assert cache.get("new") is None
+    assert cache.get("old") is not None
+    assert cache.get("third") is not None
+
+
+def test_evicted_entries_leave_the_memory_lru(tmp_path):
+    payload = {"blob": "".join(chr(33 + (i * 7919) % 90) for i in range(4000))}
+    cache = ResponseCache(tmp_path, memory_entries=8)
+    cache.put("a", "m", payload, ttl=60)
+    cache.put("b", "m", payload, ttl=60)
+    assert cache.get("b") is not None
+    time.sleep(0.01)
+    assert cache.get("a") is not None
+    assert set(cache._memory) == {"a", "b"}
+
+    size = cache.stats()["bytes"] // 2
+    cache.max_bytes = size * 2 + size // 2
+    cache.put("c", "m", payload, ttl=60)
+    assert "b" not in cache._memory
+    assert cache.get_entry("b", any_age=True) is None
+
+
+def test_entries_past_max_staleness_leave_the_memory_lru(tmp_path):
+    cache = ResponseCache(tmp_path, memory_entries=8)
+    cache.put("k", "contest.status", {"v": 1}, ttl=-1)
+    assert cache.get_entry("k", stale=True) is not None
+    assert "k" in cache._memory
+    cache._conn.execute("UPDATE entries SET stale_until = ?", (time.time() - 1,))
+    cache.put("other", "contest.status", {"v": 2}, ttl=60)
+    assert cache.get_entry("k", any_age=True) is None
+
+
+def test_memory_lru_is_bounded(tmp_path):
+    cache = ResponseCache(tmp_path, memory_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, "m", {"key": key}, ttl=60)
+    assert list(cache._memory) == ["b", "c"]
+    assert cache.get("a") == {"key": "a"}  # Falls back to SQLite
+    assert list(cache._memory) == ["c", "a"]
+
+
+def test_reads_do_not_write_until_flushed(cache):
+    cache.put("k", "m", {"v": 1}, ttl=60)
+    for _ in range(3):
+        cache.get("k")
+    cache.get("missing")
+    stored = dict(cache._conn.execute("SELECT name, value FROM counters").fetchall())
+    assert stored.get("hits", 0) == 0
+
+    stats = cache.stats()
+    assert stats["hits"] == 3 and stats["misses"] == 1
+
+
+def test_reads_flush_after_threshold(cache):
+    cache.put("k", "m", {"v": 1}, ttl=60)
+    for _ in range(FLUSH_READS):
+        cache.get("k")
+    stored = dict(cache._conn.execute("SELECT name, value FROM counters").fetchall())
+    assert stored["hits"] == FLUSH_READS
+
+
+def test_clear(cache):
+    cache.put("k", "m", {"v": 1}, ttl=60)
+    cache.get("k")
+    assert cache.clear() == 1
+    assert cache.stats()["entries"] == 0 and cache.stats()["hits"] == 0
@@ -0,0 +1,141 @@
+import time
+
+import pytest
+
+from cfcli.utils.catalog import ContestCatalog, parse_division, CATALOG_MAX_AGE, PHASE_RECHECK
+
+
+def contest(contest_id, phase="FINISHED", start=None, duration=7200, name=None):
+    return {
+        "id": contest_id,
+        "name": name or f"Codeforces Round {contest_id} (Div. 2)",
+        "type": "CF",
+        "phase": phase,
+        "frozen": False,
+        "durationSeconds": duration,
+        "startTimeSeconds": start if start is not None else int(time.time()) - 86400 * contest_id,
+    }
+
+
+def age(catalog, seconds):
+    """Pretend the last refresh happened `seconds` ago"""
+    catalog._conn.execute("UPDATE meta SET value = ? WHERE name = 'refreshed_at'", (str(time.time() - seconds),))
+    catalog._conn.commit()
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    return ContestCatalog(tmp_path / "catalog.db")
+
+
+def test_parse_division():
+    assert parse_division("Codeforces Round 900 (Div. 2)") == "2"
+    assert parse_division("Codeforces Round 901 (Div. 1 + Div. 2)") == "1+2"
+    assert parse_division("Educational Round") is None
+
+
+def test_merge_counts_only_new_and_changed(catalog):
+    assert catalog.merge([contest(1), contest(2)]) == {"added": 2, "updated": 0}
+    assert catalog.merge([contest(1), contest(2)]) == {"added": 0, "updated": 0}
+    changed = contest(2)
+    changed["name"] = "Renamed (Div. 1)"
+    assert catalog.merge([contest(1), changed, contest(3)]) == {"added": 1, "updated": 1}
+    assert catalog.get(2)["division"] == "1"
+
+
+def test_empty_catalog_needs_refresh(catalog):
+    assert catalog.needs_refresh()
+
+
+def test_fresh_catalog_does_not_need_refresh(catalog):
+    catalog.merge([contest(1)])
+    assert not catalog.needs_refresh()
+
+
+def test_old_catalog_needs_refresh(catalog):
+    catalog.merge([contest(1)])
+    age(catalog, CATALOG_MAX_AGE + 1)
+    assert catalog.needs_refresh()
+    assert not catalog.phase_change_due()
+
+
+@pytest.mark.parametrize("phase, start", [
+    ("BEFORE", -10),                # Should have started
+    ("CODING", -7300),              # Should have ended
+    ("PENDING_SYSTEM_TEST", -8000),
+    ("SYSTEM_TEST", -8000),
+])
+def test_phase_change_due(catalog, phase, start):
+    catalog.merge([contest(1, phase=phase, start=int(time.time()) + start)])
+    # Not rechecked right after a refresh
+    assert not catalog.phase_change_due()
+    age(catalog, PHASE_RECHECK + 1)
+    assert catalog.phase_change_due()
+    assert catalog.needs_refresh()
+
+
+def test_no_phase_change_due_for_future_or_running(catalog):
+    now = int(time.time())
+    catalog.merge([contest(1, phase="BEFORE", start=now + 3600), contest(2, phase="CODING", start=now - 60)])
+    age(catalog, PHASE_RECHECK + 1)
+    assert not catalog.phase_change_due()
+
+
+def test_query_filters_and_order(catalog):
+    now = int(time.time())
+    catalog.merge([
+        contest(1, start=now - 300),
+        contest(2, start=now - 200, name="Codeforces Round 2 (Div. 1)"),
+        contest(3, start=now - 100),
+        contest(4, phase="BEFORE", start=now + 100),
+    ])
+    assert [c["id"] for c in catalog.query(phase="FINISHED", newest_first=True)] == [3, 2, 1]
+    assert [c["id"] for c in catalog.query(phase="FINISHED", limit=2)] == [1, 2]
+    assert [c["id"] for c in catalog.query(division="1")] == [2]
+    assert [c["id"] for c in catalog.query(name="round 3")] == [3]
+    assert [c["id"] for c in catalog.query(since=now - 150)] == [3, 4]
+
+
+class FakeSession:
+    offline = False
+
+    def __init__(self, contests):
+        self.contests = contests
+        self.calls = []
+
+    def call_api(self, method, params=None, refresh=False, **kwargs):
+        self.calls.append((method, refresh))
+        return {"status": "OK", "result": self.contests}
+
+    def use_stale_index(self, method, refreshed_at, on_update):
+        self.calls.append(("stale index", False))
+        return True
+
+
+def test_refresh_catalog_bypasses_cache_for_phase_change(catalog):
+    from cfcli.api.contest import ContestAPI
+
+    now = int(time.time())
+    catalog.merge([contest(1, phase="BEFORE", start=now - 10)])
+    age(catalog, PHASE_RECHECK + 1)
+    session = FakeSession([contest(1, phase="CODING", start=now - 10)])
+    api = ContestAPI(session)
+    api._catalog = catalog
+
+    assert api.refresh_catalog()["result"] == {"added": 0, "updated": 1}
+    assert session.calls == [("contest.list", True)]
+    assert catalog.get(1)["phase"] == "CODING"
+    assert not catalog.needs_refresh()
+
+
+def test_refresh_catalog_serves_old_catalog_while_revalidating(catalog):
+    from cfcli.api.contest import ContestAPI
+
+    catalog.merge([contest(1)])
+    age(catalog, CATALOG_MAX_AGE + 1)
+    session = FakeSession([])
+    api = ContestAPI(session)
+    api._catalog = catalog
+
+    api.refresh_catalog()
+    assert session.calls == [("stale index", False)]
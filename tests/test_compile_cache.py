@@ -0,0 +1,92 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from cfcli.utils.compile_cache import CompileCache
+
+pytestmark = pytest.mark.skipif(shutil.which("g++") is None, reason="g++ is not installed")
+
+FLAGS = ["-O0"]
+
+
+def write(path, body):
+    path.write_text(f"#include <cstdio>\nint main() {{ {body} }}\n")
+    return path
+
+
+def test_second_compile_is_a_hit(tmp_path):
+    cache = CompileCache(tmp_path / "cache")
+    source = write(tmp_path / "a.cpp", 'puts("a");')
+    first = cache.compile(source, "g++", FLAGS)
+    second = cache.compile(source, "g++", FLAGS)
+
+    assert first["status"] == "OK" and not first["result"]["cached"]
+    assert second["result"] == {"binary": first["result"]["binary"], "cached": True, "elapsed": 0.0}
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 1)
+    assert stats["time_saved"] > 0
+
+    # The index is shared with later runs
+    assert CompileCache(tmp_path / "cache").stats()["hits"] == 1
+
+
+def test_source_and_flag_changes_miss(tmp_path):
+    cache = CompileCache(tmp_path / "cache")
+    source = write(tmp_path / "a.cpp", 'puts("a");')
+    binary = cache.compile(source, "g++", FLAGS)["result"]["binary"]
+
+    write(source, 'puts("b");')
+    edited = cache.compile(source, "g++", FLAGS)["result"]
+    assert not edited["cached"] and edited["binary"] != binary
+
+    optimized = cache.compile(source, "g++", ["-O1"])["result"]
+    assert not optimized["cached"] and optimized["binary"] != edited["binary"]
+    assert cache.stats()["entries"] == 3
+
+
+def test_least_recently_used_binaries_are_evicted(tmp_path):
+    cache = CompileCache(tmp_path / "cache")
+    sources = [write(tmp_path / f"{name}.cpp", f'puts("{name}");') for name in "abc"]
+    binaries = [cache.compile(source, "g++", FLAGS)["result"]["binary"] for source in sources[:2]]
+    cache.compile(sources[0], "g++", FLAGS)  # a is now more recent than b
+
+    size = Path(binaries[0]).stat().st_size
+    cache.max_bytes = int(size * 2.5)
+    cache.compile(sources[2], "g++", FLAGS)
+
+    assert Path(binaries[0]).exists() and not Path(binaries[1]).exists()
+    assert cache.stats()["entries"] == 2
+    assert not cache.compile(sources[1], "g++", FLAGS)["result"]["cached"]
+
+
+def test_failed_compile_is_not_cached(tmp_path):
+    cache = CompileCache(tmp_path / "cache")
+    result = cache.compile(write(tmp_path / "bad.cpp", "return missing;"), "g++", FLAGS)
+    assert result["status"] == "FAILED" and "missing" in result["comment"]
+    assert cache.stats()["entries"] == 0
+    assert not list((tmp_path / "cache" / "bin").iterdir())
+
+
+def test_missing_compiler(tmp_path):
+    result = CompileCache(tmp_path / "cache").compile(write(tmp_path / "a.cpp", ""), "no-such-g++")
+    assert result == {"status": "FAILED", "comment": "Compiler 'no-such-g++' not found"}
+
+
+def test_clear_removes_everything(tmp_path):
+    cache = CompileCache(tmp_path / "cache")
+    cache.compile(write(tmp_path / "a.cpp", ""), "g++", FLAGS)
+    assert cache.clear() == 1
+    assert not (tmp_path / "cache").exists() and cache.stats()["entries"] == 0
+
+
+def test_template_includes_are_precompiled_once(tmp_path):
+    template = tmp_path / "template.cpp"
+    template.write_text("#include <cstdio>\n#include <vector>\nint main() {}\n")
+    cache = CompileCache(tmp_path / "cache", template_file=template)
+    for name in "ab":
+        assert cache.compile(write(tmp_path / f"{name}.cpp", ""), "g++", FLAGS)["status"] == "OK"
+
+    headers = list((tmp_path / "cache" / "pch").glob("*/prelude.h.gch"))
+    assert len(headers) == 1
+    assert headers[0].with_suffix("").read_text() == "#include <cstdio>\n#include <vector>\n"
@@ -0,0 +1,102 @@
+import io
+import sys
+import threading
+import time
+
+import pytest
+
+from cfcli.utils import daemon
+from cfcli.utils.daemon import Daemon, _ThreadStream, forward, forwardable, request
+
+
+@pytest.mark.parametrize("argv, expected", [
+    (["fetch", "upcoming"], True),
+    (["cache", "stats"], True),
+    (["status", "--contest-id", "1900"], True),
+    ([], False),
+    (["daemon", "status"], False),
+    (["fetch", "--help"], False),
+    (["status", "--watch"], False),
+    (["standings", "1900", "--live"], False),
+    (["submit", "Contest1900_A.cpp"], False),
+])
+def test_forwardable(argv, expected):
+    assert forwardable(argv) == expected
+
+
+def test_thread_stream_routes_each_thread():
+    default, bound = io.StringIO(), io.StringIO()
+    stream = _ThreadStream(default)
+    stream.bind(bound)
+    stream.write("command\n")
+
+    worker = threading.Thread(target=lambda: stream.write("worker\n"))
+    worker.start()
+    worker.join()
+    stream.unbind()
+    stream.write("after\n")
+
+    assert bound.getvalue() == "command\n"
+    assert default.getvalue() == "worker\nafter\n"
+    assert stream.isatty() is False
+
+
+@pytest.fixture
+def running_daemon(tmp_path, monkeypatch):
+    from cfcli.commands import cli as commands
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("CFCLI_SOCKET", str(tmp_path / "d.sock"))
+    monkeypatch.setenv("CFCLI_BASE_URL", "http://127.0.0.1:9/")
+    for name in ("CF_HANDLE", "CF_API_KEY", "CF_API_SECRET", "CFCLI_OFFLINE"):
+        monkeypatch.delenv(name, raising=False)
+    commands._instances.clear()
+
+    # Whatever the daemon writes outside of a command lands in its own log
+    log = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", log)
+    server = Daemon(daemon.socket_path(), idle_timeout=0)
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    for _ in range(100):
+        if request({"command": "ping"}) is not None:
+            break
+        time.sleep(0.05)
+    else:
+        pytest.fail("daemon did not start")
+    server.log = log
+    yield server
+    request({"command": "stop"})
+    thread.join(10)
+    commands._instances.clear()
+
+
+def test_daemon_sends_output_to_the_client_only(running_daemon, capsys):
+    assert forward(["cache", "stats"]) == 0
+    assert "Response Cache" in capsys.readouterr().out
+    assert running_daemon.log.getvalue() == ""
+    assert running_daemon.requests == 1
+
+
+def test_daemon_leaves_live_modes_to_the_client(running_daemon):
+    assert forward(["status", "--watch"]) is None
+    assert request({"command": "run", "argv": ["standings", "1", "--live"],
+                    "env": daemon.env_fingerprint()}) == {"fallback": True}
+    assert running_daemon.requests == 0
+    assert not running_daemon._run_lock.locked()
+
+
+def test_submit_runs_in_process_where_it_can_prompt(running_daemon, tmp_path, monkeypatch):
+    from click.testing import CliRunner
+    from cfcli.commands import cli as commands
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "solution.cpp").write_text("int main() {}\n")
+    assert forward(["submit", "solution.cpp"]) is None
+    assert request({"command": "run", "argv": ["submit", "solution.cpp"], "cwd": str(tmp_path),
+                    "env": daemon.env_fingerprint()}) == {"fallback": True}
+    assert running_daemon.requests == 0
+
+    # In-process, the filename that names no problem is answered at the prompt
+    result = CliRunner().invoke(commands.cli, ["submit", "solution.cpp"], input="1900\nA\n")
+    assert "Enter problem index" in result.output and "Aborted" not in result.output
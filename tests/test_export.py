@@ -0,0 +1,144 @@
+import gzip
+import json
+import sys
+
+import pytest
+
+from cfcli.utils.export import ExportWriter, INT, STR
+
+COLUMNS = [("id", INT), ("name", STR)]
+
+
+def records(start, count):
+    return [{"id": i, "name": f"row{i}"} for i in range(start, start + count)]
+
+
+def test_jsonl_writes_and_checkpoints(tmp_path):
+    path = tmp_path / "out.jsonl"
+    writer = ExportWriter(path, "jsonl", COLUMNS)
+    writer.write(records(0, 3), last_id=2)
+    assert ExportWriter.load_state(path)["rows"] == 3
+    assert ExportWriter.load_state(path)["last_id"] == 2
+    writer.finish()
+    assert ExportWriter.load_state(path) is None
+    assert [json.loads(line)["id"] for line in path.read_text().splitlines()] == [0, 1, 2]
+
+
+@pytest.mark.parametrize("fmt, compression", [("jsonl", None), ("csv", None), ("jsonl", "gzip"), ("csv", "none")])
+def test_resume_truncates_partial_page(tmp_path, fmt, compression):
+    path = tmp_path / f"out.{fmt}"
+    writer = ExportWriter(path, fmt, COLUMNS, compression)
+    writer.write(records(0, 2))
+    # A page that was being written when the export was interrupted
+    with open(path, "ab") as f:
+        f.write(b"garbage after the last checkpoint")
+
+    state = ExportWriter.load_state(path)
+    writer = ExportWriter(path, fmt, COLUMNS, state["compression"], state)
+    writer.write(records(2, 2))
+    writer.finish()
+
+    data = path.read_bytes()
+    if compression == "gzip":
+        data = gzip.decompress(data)
+    lines = data.decode().splitlines()
+    if fmt == "csv":
+        assert lines == ["id,name", "0,row0", "1,row1", "2,row2", "3,row3"]
+    else:
+        assert [json.loads(line)["id"] for line in lines] == [0, 1, 2, 3]
+
+
+def test_resume_rejects_changed_columns(tmp_path):
+    path = tmp_path / "out.csv"
+    ExportWriter(path, "csv", COLUMNS).write(records(0, 1))
+    with pytest.raises(ValueError, match="columns"):
+        ExportWriter(path, "csv", COLUMNS + [("extra", INT)], state=ExportWriter.load_state(path))
+
+
+@pytest.mark.parametrize("compression, codec", [(None, "SNAPPY"), ("none", "UNCOMPRESSED"), ("gzip", "GZIP")])
+def test_parquet_compression(tmp_path, compression, codec):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "out.parquet"
+    writer = ExportWriter(path, "parquet", COLUMNS, compression)
+    writer.write(records(0, 3))
+    writer.write(records(3, 2))
+    writer.finish()
+
+    parts = sorted(path.glob("part-*.parquet"))
+    assert len(parts) == 2
+    assert pq.ParquetFile(parts[0]).metadata.row_group(0).column(0).compression == codec
+    assert pq.read_table(path).num_rows == 5
+
+
+class FailingSession:
+    offline = False
+
+    def __init__(self, error):
+        self.error = error
+
+    def call_api(self, *args, **kwargs):
+        raise self.error
+
+
+def test_export_reports_missing_pyarrow(tmp_path, monkeypatch):
+    from cfcli.api.contest import ContestAPI
+
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    result = ContestAPI(FailingSession(AssertionError())).export_contest(1, "status", "parquet",
+                                                                        output=tmp_path / "out")
+    assert result == {"status": "FAILED", "comment": "Parquet export needs pyarrow (pip install pyarrow)"}
+
+
+def test_export_keeps_other_import_errors(tmp_path):
+    from cfcli.api.contest import ContestAPI
+
+    result = ContestAPI(FailingSession(ImportError("No module named 'lzma'"))).export_contest(
+        1, "status", "jsonl", output=tmp_path / "out.jsonl")
+    assert result == {"status": "FAILED", "comment": "No module named 'lzma'"}
+
+
+class StandingsSession:
+    """Serves four standings rows; fails the requests listed in fail_at (1-based)"""
+    offline = False
+
+    def __init__(self, fail_at=()):
+        self.fail_at = set(fail_at)
+        self.calls = 0
+
+    def call_api(self, method, params=None, **kwargs):
+        self.calls += 1
+        if self.calls in self.fail_at:
+            raise Exception("Call limit exceeded")
+        rows = [{"rank": i, "party": {"members": [{"handle": f"user{i}"}]}, "problemResults": []}
+                for i in range(1, 5)]
+        start = params["from"] - 1
+        return {"status": "OK", "result": {"contest": {"id": 1}, "problems": [],
+                                           "rows": rows[start:start + params["count"]]}}
+
+
+def test_resuming_a_standings_export_that_only_lacks_its_end(tmp_path):
+    from cfcli.api.contest import ContestAPI
+
+    path = tmp_path / "out.jsonl"
+    # Both pages are written, then the request that would find the end fails
+    failed = ContestAPI(StandingsSession(fail_at={3})).export_contest(1, "standings", "jsonl", output=path,
+                                                                      page_size=2)
+    assert failed["status"] == "FAILED"
+    assert ExportWriter.load_state(path)["rows"] == 4
+
+    result = ContestAPI(StandingsSession()).export_contest(1, "standings", "jsonl", output=path, page_size=2)
+    assert result["status"] == "OK", result.get("comment")
+    assert result["result"]["rows"] == result["result"]["resumed"] == 4
+    assert ExportWriter.load_state(path) is None
+    assert [json.loads(line)["rank"] for line in path.read_text().splitlines()] == [1, 2, 3, 4]
+
+
+def test_fresh_standings_export_without_rows_fails(tmp_path):
+    from cfcli.api.contest import ContestAPI
+
+    class Empty(StandingsSession):
+        def call_api(self, method, params=None, **kwargs):
+            return {"status": "OK", "result": {"contest": {}, "problems": [], "rows": []}}
+
+    result = ContestAPI(Empty()).export_contest(7, "standings", "csv", output=tmp_path / "out.csv")
+    assert result == {"status": "FAILED", "comment": "No standings found for contest 7"}
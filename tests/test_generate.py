@@ -0,0 +1,50 @@
+import pytest
+
+from cfcli.api.problem import DEFAULT_TEMPLATE, ProblemAPI
+
+
+class FakeSession:
+    offline = False
+
+    def __init__(self, indexes):
+        self.indexes = indexes
+        self.calls = []
+
+    def call_api(self, method, params=None, **kwargs):
+        self.calls.append((method, dict(params or {})))
+        return {"status": "OK", "result": {
+            "contest": {"id": params["contestId"]},
+            "problems": [{"contestId": params["contestId"], "index": index} for index in self.indexes],
+            "rows": []
+        }}
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_generate_contest_files_uses_one_call(tmp_path, monkeypatch, jobs):
+    monkeypatch.chdir(tmp_path)
+    session = FakeSession(["A", "B1", "B2", "C"])
+    result = ProblemAPI(session).generate_contest_files(1900, template_dir=tmp_path / "templates", jobs=jobs)
+
+    assert result["status"] == "OK", result.get("comment")
+    assert [f["filename"] for f in result["result"]["files"]] == [
+        "Contest1900_A.cpp", "Contest1900_B1.cpp", "Contest1900_B2.cpp", "Contest1900_C.cpp"]
+    assert session.calls == [("contest.standings", {"contestId": 1900, "from": 1, "count": 1})]
+
+    text = (tmp_path / "Contest1900_B2.cpp").read_text()
+    assert "Codeforces 1900B2" in text and text.endswith(DEFAULT_TEMPLATE)
+    assert (tmp_path / "templates" / "template.cpp").read_text() == DEFAULT_TEMPLATE
+
+
+def test_generate_contest_files_uses_the_template(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "template.cpp").write_text("// mine\n")
+    result = ProblemAPI(FakeSession(["A"])).generate_contest_files(5, template_dir=tmp_path)
+    assert result["status"] == "OK"
+    assert (tmp_path / "Contest5_A.cpp").read_text().endswith("\n// mine\n")
+
+
+def test_generate_contest_files_without_problems(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    result = ProblemAPI(FakeSession([])).generate_contest_files(5, template_dir=tmp_path)
+    assert result == {"status": "FAILED", "comment": "No problems found for contest 5"}
+    assert not list(tmp_path.glob("*.cpp"))
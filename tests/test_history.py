@@ -0,0 +1,97 @@
+from cfcli.api.submission import SubmissionAPI
+from cfcli.utils.history import SubmissionHistory
+
+
+def sub(sid, problem="A", verdict="OK", when=None, tags=("math",), rating=800):
+    return {"id": sid, "creationTimeSeconds": when or sid * 100, "verdict": verdict,
+            "programmingLanguage": "C++17", "passedTestCount": 3, "timeConsumedMillis": 15,
+            "memoryConsumedBytes": 2048,
+            "problem": {"contestId": 1, "index": problem, "name": f"Problem {problem}",
+                        "rating": rating, "tags": list(tags)}}
+
+
+class UserStatusSession:
+    """Serves user.status newest first from a list that tests can change between syncs"""
+    offline = False
+
+    def __init__(self, submissions):
+        self.submissions = submissions
+        self.calls = []
+
+    def call_api(self, method, params=None, cache=True, **kwargs):
+        assert method == "user.status" and cache is False
+        self.calls.append(dict(params))
+        ordered = sorted(self.submissions, key=lambda s: -s["id"])
+        start = params["from"] - 1
+        return {"status": "OK", "result": ordered[start:start + params["count"]]}
+
+
+def test_sync_fetches_only_new_submissions(tmp_path):
+    session = UserStatusSession([sub(i) for i in range(1, 6)])
+    api = SubmissionAPI(session)
+
+    history = SubmissionHistory(tmp_path, "Alice")
+    assert api.sync_history(history)["result"] == {"added": 5, "total": 5}
+    assert list(history.columns["id"]) == [1, 2, 3, 4, 5]
+
+    session.submissions.append(sub(6, "B", "WRONG_ANSWER"))
+    session.calls.clear()
+    reloaded = SubmissionHistory(tmp_path, "alice")
+    assert len(reloaded) == 5 and reloaded.synced_at > 0
+    assert api.sync_history(reloaded)["result"] == {"added": 1, "total": 6}
+    assert len(session.calls) == 1
+    assert reloaded.verdicts[reloaded.columns["verdict"][-1]] == "WRONG_ANSWER"
+
+
+def test_user_status_pages_stop_at_the_first_known_submission():
+    session = UserStatusSession([sub(i) for i in range(1, 8)])
+    pages = list(SubmissionAPI(session).iter_user_status("alice", since=2, page_size=2))
+    assert [[s["id"] for s in page] for page in pages] == [[7, 6], [5, 4], [3]]
+    assert [call["from"] for call in session.calls] == [1, 3, 5]
+
+
+def test_pending_submissions_are_refetched(tmp_path):
+    session = UserStatusSession([sub(1), sub(2, "B", "TESTING"), sub(3, "C", None)])
+    api = SubmissionAPI(session)
+    history = SubmissionHistory(tmp_path, "alice")
+    api.sync_history(history)
+    assert len(history) == 3
+
+    session.submissions[1:] = [sub(2, "B", "WRONG_ANSWER"), sub(3, "C", "OK")]
+    assert api.sync_history(history)["result"] == {"added": 2, "total": 3}
+    assert [history.verdicts[code] for code in history.columns["verdict"]] == ["OK", "WRONG_ANSWER", "OK"]
+
+
+def test_drop_pending_only_trims_the_tail(tmp_path):
+    history = SubmissionHistory(tmp_path, "alice")
+    history.append([sub(1), sub(2, verdict="TESTING"), sub(3)])
+    history.drop_pending()
+    assert list(history.columns["id"]) == [1]
+    assert all(len(column) == 1 for column in history.columns.values())
+
+    # Without pending submissions nothing is dropped
+    finished = SubmissionHistory(tmp_path, "bob")
+    finished.append([sub(1), sub(2)])
+    finished.drop_pending()
+    assert len(finished) == 2
+
+
+def test_append_skips_known_submissions(tmp_path):
+    history = SubmissionHistory(tmp_path, "alice")
+    assert history.append([sub(1), sub(2)]) == 2
+    assert history.append([sub(2), sub(3)]) == 1
+    assert history.last_id == 3
+
+
+def test_analytics(tmp_path):
+    history = SubmissionHistory(tmp_path, "alice")
+    history.append([
+        sub(1, "A", "WRONG_ANSWER", when=100),
+        sub(2, "A", "OK", when=400),
+        sub(3, "B", "TIME_LIMIT_EXCEEDED", when=500, tags=("dp",), rating=None),
+    ])
+    assert history.verdicts_by("tag") == {"math": {"WRONG_ANSWER": 1, "OK": 1}, "dp": {"TIME_LIMIT_EXCEEDED": 1}}
+    assert history.verdicts_by("rating") == {"800": {"WRONG_ANSWER": 1, "OK": 1}, "unrated": {"TIME_LIMIT_EXCEEDED": 1}}
+    assert [(r["problem"], r["seconds"]) for r in history.solve_times()] == [("1/A", 300)]
+    assert [(r["problem"], r["attempts"]) for r in history.unsolved()] == [("1/B", 1)]
+    assert history.solved_problems() == ["1/A"]
@@ -0,0 +1,73 @@
+import shutil
+
+import pytest
+
+from cfcli.utils.judge import compile_source, outputs_match, run_test, run_tests
+
+
+@pytest.mark.parametrize("expected, actual", [
+    ("1 2 3", "1 2 3"),
+    ("1 2 3\n", "1  2\n3"),
+    ("0.5", "0.5000001"),
+    ("1e9", "1000000000.5"),
+    ("3.0", "3"),
+    (b"1000000000000", b"1000000000000\n"),
+])
+def test_outputs_match(expected, actual):
+    assert outputs_match(expected, actual)
+
+
+@pytest.mark.parametrize("expected, actual", [
+    ("1 2 3", "1 2"),
+    ("YES", "NO"),
+    ("1000000000", "1000000001"),
+    ("123456789012345678", "123456789012345679"),
+    ("-1000000000", "-999999999"),
+    ("7", "+7"),
+    ("0.5", "0.51"),
+    ("nan", "1"),
+    (b"1000000000", b"1000000001"),
+])
+def test_outputs_mismatch(expected, actual):
+    assert not outputs_match(expected, actual)
+
+
+ECHO_SOURCE = """
+#include <iostream>
+#include <vector>
+int main() {
+    long long n;
+    std::cin >> n;
+    std::vector<char> block(n * 1024 * 1024, 1);
+    std::cout << n + block[0] - 1 << std::endl;
+}
+"""
+
+
+@pytest.fixture(scope="module")
+def binary(tmp_path_factory):
+    if shutil.which("g++") is None:
+        pytest.skip("g++ is not installed")
+    folder = tmp_path_factory.mktemp("judge")
+    source = folder / "echo.cpp"
+    source.write_text(ECHO_SOURCE)
+    compiled = compile_source(source, folder / "echo")
+    assert compiled["status"] == "OK", compiled.get("comment")
+    return compiled["result"]["binary"]
+
+
+def test_run_test_verdicts(binary):
+    assert run_test(binary, "8\n", "8")["verdict"] == "OK"
+    assert run_test(binary, "8\n", "9")["verdict"] == "WRONG_ANSWER"
+
+
+def test_memory_limit_applies(binary):
+    result = run_test(binary, "512\n", "512", memory_limit=64)
+    assert result["verdict"] == "MEMORY_LIMIT_EXCEEDED"
+
+
+def test_run_tests_keeps_order(binary):
+    tests = [{"input": f"{n}\n", "output": str(n)} for n in range(1, 17)]
+    results = run_tests(binary, tests, memory_limit=256, jobs=8)
+    assert [r["verdict"] for r in results] == ["OK"] * len(tests)
+    assert [r["output"].strip() for r in results] == [str(n) for n in range(1, 17)]
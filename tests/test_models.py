@@ -0,0 +1,67 @@
+import pytest
+
+from cfcli.api.models import Contest, Problem, StandingsRow, Submission, SubmissionBatch
+
+
+def submission_json(sid, verdict="OK", handle="alice", index="A", contest_id=1):
+    return {"id": sid, "contestId": contest_id, "creationTimeSeconds": 1000 + sid,
+            "problem": {"contestId": contest_id, "index": index, "name": f"Problem {index}"},
+            "author": {"members": [{"handle": handle}]}, "programmingLanguage": "GNU C++17",
+            "verdict": verdict, "passedTestCount": 4, "timeConsumedMillis": 31, "memoryConsumedBytes": 1 << 20}
+
+
+@pytest.mark.parametrize("model, data", [
+    (Problem, {"contestId": 1, "index": "A", "tags": ["math"]}),
+    (Contest, {"id": 1, "name": "Round", "phase": "FINISHED"}),
+    (Submission, submission_json(1)),
+    (StandingsRow, {"rank": 1, "party": {"members": [{"handle": "alice"}]}}),
+])
+def test_models_use_slots(model, data):
+    instance = model.from_json(data)
+    assert not hasattr(instance, "__dict__")
+    with pytest.raises(AttributeError):
+        instance.unexpected = 1
+
+
+def test_models_share_interned_strings():
+    first = Submission.from_json(submission_json(1, verdict="WRONG" + "_ANSWER"))
+    second = Submission.from_json(submission_json(2, verdict="".join(["WRONG_", "ANSWER"])))
+    assert first.verdict is second.verdict
+    assert first.author is second.author and first.language is second.language
+
+
+def test_submission_from_json_keeps_displayed_fields():
+    s = Submission.from_json(submission_json(7, handle="bob"))
+    assert (s.id, s.contest_id, s.problem_index, s.problem_name, s.author, s.verdict) == (
+        7, 1, "A", "Problem A", "bob", "OK")
+    assert (s.passed, s.time_ms, s.memory_bytes) == (4, 31, 1 << 20)
+
+
+def test_batch_round_trips_submissions():
+    rows = [submission_json(1), submission_json(2, verdict=None, handle="bob", index="B"),
+            submission_json(3, verdict="WRONG_ANSWER", contest_id=None)]
+    batch = SubmissionBatch.from_json(rows)
+
+    assert len(batch) == 3
+    for row, submission in zip(rows, batch):
+        expected = Submission.from_json(row)
+        assert [getattr(submission, name) for name in Submission.__slots__] == [
+            getattr(expected, name) for name in Submission.__slots__]
+    assert list(batch.verdicts()) == ["OK", None, "WRONG_ANSWER"]
+    assert batch[2].contest_id is None
+
+
+def test_batch_encodes_each_string_once():
+    batch = SubmissionBatch.from_json([submission_json(i, handle=f"user{i % 3}") for i in range(300)])
+    # None plus the index, name, language, verdict and three handles
+    assert len(batch._strings) == 8
+    assert not hasattr(batch, "__dict__")
+    assert batch.ids.itemsize == 8 and batch.ids.tolist() == list(range(300))
+
+
+def test_batch_extend_appends():
+    batch = SubmissionBatch()
+    batch.extend([submission_json(1)])
+    batch.extend([submission_json(2, verdict="TIME_LIMIT_EXCEEDED")])
+    assert [s.id for s in batch] == [1, 2]
+    assert batch[1].verdict == "TIME_LIMIT_EXCEEDED"
@@ -0,0 +1,67 @@
+import pytest
+
+from cfcli.utils.problemset import ProblemsetIndex
+
+
+def problem(contest_id, index, rating=None, tags=(), name=None):
+    return {"contestId": contest_id, "index": index, "name": name or f"{contest_id}{index}",
+            "rating": rating, "tags": list(tags)}
+
+
+def stats(contest_id, index, solved):
+    return {"contestId": contest_id, "index": index, "solvedCount": solved}
+
+
+PROBLEMS = [
+    problem(1, "A", 800, ["math", "greedy"]),
+    problem(1, "B", 1400, ["dp", "greedy"]),
+    problem(2, "A", 1200, ["math"]),
+    problem(2, "B", None, ["dp", "math", "greedy"]),
+]
+STATS = [stats(1, "A", 5000), stats(1, "B", 900), stats(2, "A", 3000), stats(2, "B", 10)]
+
+
+@pytest.fixture
+def index(tmp_path):
+    problemset = ProblemsetIndex(tmp_path / "problemset.db")
+    problemset.merge(PROBLEMS, STATS)
+    return problemset
+
+
+def keys(problems):
+    return [f"{p['contestId']}/{p['index']}" for p in problems]
+
+
+def test_merge_writes_only_changes(index):
+    assert len(index) == 4 and not index.needs_refresh()
+    assert index.merge(PROBLEMS, STATS) == {"added": 0, "updated": 0}
+
+    retagged = PROBLEMS[:3] + [problem(2, "B", 2000, ["dp"])]
+    assert index.merge(retagged + [problem(3, "A")], STATS) == {"added": 1, "updated": 1}
+    assert keys(index.search(tags=["math", "greedy"])) == ["1/A"]
+    assert dict(index.tags()) == {"dp": 2, "greedy": 2, "math": 2}
+
+
+def test_search_intersects_tags_and_ranges(index):
+    assert keys(index.search(tags=["greedy", "math"])) == ["1/A", "2/B"]
+    assert keys(index.search(tags=["dp"], rating_min=1000)) == ["1/B"]
+    assert keys(index.search(rating_max=1200, min_solved=3000)) == ["1/A", "2/A"]
+    assert keys(index.search(contest_min=2, contest_max=2, sort="contest")) == ["2/A", "2/B"]
+    assert index.search(tags=["no-such-tag"]) == []
+
+
+def test_search_sorts_excludes_and_limits(index):
+    assert keys(index.search()) == ["1/A", "2/A", "1/B", "2/B"]
+    # Unrated problems come last
+    assert keys(index.search(sort="rating")) == ["1/A", "2/A", "1/B", "2/B"]
+    assert keys(index.search(exclude={"1/A", "2/A"})) == ["1/B", "2/B"]
+    assert keys(index.search(exclude={"1/A"}, limit=2)) == ["2/A", "1/B"]
+    first = index.search(limit=1)[0]
+    assert first == {"contestId": 1, "index": "A", "name": "1A", "rating": 800, "solvedCount": 5000,
+                     "tags": ["greedy", "math"]}
+
+
+def test_index_survives_reopening(index, tmp_path):
+    reopened = ProblemsetIndex(tmp_path / "problemset.db")
+    assert len(reopened) == 4
+    assert reopened.refreshed_at == pytest.approx(index.refreshed_at)
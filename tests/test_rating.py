@@ -0,0 +1,82 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from cfcli.utils.rating import predict_deltas, tie_ranks  # noqa: E402
+
+
+def load_benchmark():
+    path = Path(__file__).resolve().parent.parent / "benchmarks" / "predict.py"
+    spec = importlib.util.spec_from_file_location("predict_benchmark", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+benchmark = load_benchmark()
+
+
+def test_tie_ranks_share_the_worst_place():
+    assert tie_ranks([1, 2, 2, 4, 5, 5, 5]).tolist() == [1, 3, 3, 4, 7, 7, 7]
+
+
+@pytest.mark.parametrize("n, seed", [(2, 1), (25, 2), (150, 3)])
+def test_predict_deltas_matches_naive_implementation(n, seed):
+    ratings, standing_ranks = benchmark.synthetic_contest(n, seed)
+    ranks = tie_ranks(standing_ranks)
+    assert predict_deltas(ratings, ranks).tolist() == benchmark.naive_deltas(ratings, list(ranks))
+
+
+def standings_row(handle, rank, participant_type="CONTESTANT"):
+    return {"rank": rank, "party": {"participantType": participant_type, "members": [{"handle": handle}]}}
+
+
+class FakeSession:
+    offline = False
+
+    def __init__(self, rows, phase="CODING"):
+        self.rows = rows
+        self.phase = phase
+        self.calls = []
+
+    def call_api(self, method, params=None, cache=True, refresh=False, **kwargs):
+        self.calls.append((method, dict(params or {}), cache, refresh))
+        if method == "contest.standings":
+            start = params["from"] - 1
+            return {"status": "OK", "result": {
+                "contest": {"id": params["contestId"], "name": "Round", "phase": self.phase},
+                "problems": [],
+                "rows": self.rows[start:start + params["count"]]
+            }}
+        if method == "user.ratedList":
+            return {"status": "OK", "result": [{"handle": f"user{i}", "rating": 1500 + i} for i in range(0, 12000, 7)]}
+        return {"status": "FAILED", "comment": "unexpected"}
+
+
+@pytest.mark.parametrize("live", [False, True])
+def test_predict_pages_through_cached_standings(live):
+    from cfcli.api.contest import ContestAPI, EXPORT_PAGE_SIZE
+
+    rows = [standings_row(f"user{i}", i + 1) for i in range(12000)]
+    rows.append(standings_row("virtual", 12001, participant_type="VIRTUAL"))
+    session = FakeSession(rows)
+
+    result = ContestAPI(session).predict_rating_changes(1900, live=live)
+    assert result["status"] == "OK", result.get("comment")
+    predictions = result["result"]["predictions"]
+    assert len(predictions) == 12000
+    assert predictions[0]["handle"] == "user0" and predictions[-1]["rank"] == 12000
+
+    pages = [call for call in session.calls if call[0] == "contest.standings"]
+    assert [params["from"] for _, params, _, _ in pages] == [1, 1 + EXPORT_PAGE_SIZE, 1 + 2 * EXPORT_PAGE_SIZE]
+    assert all(cache and refresh == live for _, _, cache, refresh in pages)
+
+
+def test_predict_without_standings_fails():
+    from cfcli.api.contest import ContestAPI
+
+    result = ContestAPI(FakeSession([])).predict_rating_changes(1900)
+    assert result["status"] == "FAILED"
@@ -0,0 +1,110 @@
+import time
+import threading
+
+import pytest
+
+from cfcli.utils.scheduler import (TokenBucket, RequestScheduler, TransientError, PRIORITY_INTERACTIVE,
+                                   PRIORITY_BACKGROUND)
+
+
+def test_burst_is_immediate_then_rate_limited():
+    bucket = TokenBucket(rate=20, capacity=2)
+    started = time.monotonic()
+    bucket.acquire()
+    bucket.acquire()
+    assert time.monotonic() - started < 0.03
+    bucket.acquire()
+    assert time.monotonic() - started >= 0.04
+
+
+def test_sustained_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+    started = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    # The first token is free, the other five come at 50 per second
+    assert 0.09 <= time.monotonic() - started < 0.5
+
+
+def test_tokens_do_not_exceed_capacity():
+    bucket = TokenBucket(rate=1000, capacity=3)
+    time.sleep(0.05)
+    bucket._refill()
+    assert bucket.tokens == 3
+
+
+def test_penalize_holds_back_callers():
+    bucket = TokenBucket(rate=100, capacity=1)
+    bucket.penalize(0.1)
+    started = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - started >= 0.09
+
+
+def test_interactive_callers_go_first():
+    bucket = TokenBucket(rate=20, capacity=1)
+    bucket.acquire()  # Drain the burst so everyone below waits
+    order = []
+
+    def take(name, priority):
+        bucket.acquire(priority)
+        order.append(name)
+
+    background = [threading.Thread(target=take, args=(f"bg{i}", PRIORITY_BACKGROUND)) for i in range(2)]
+    for thread in background:
+        thread.start()
+    time.sleep(0.01)
+    interactive = threading.Thread(target=take, args=("interactive", PRIORITY_INTERACTIVE))
+    interactive.start()
+    for thread in background + [interactive]:
+        thread.join(2)
+    assert order[0] == "interactive"
+    assert sorted(order[1:]) == ["bg0", "bg1"]
+
+
+def test_scheduler_coalesces_identical_calls():
+    scheduler = RequestScheduler(rate=1000, capacity=10)
+    calls = []
+    release = threading.Event()
+
+    def func():
+        calls.append(1)
+        release.wait(2)
+        return "result"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(scheduler.run("key", func))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+    assert results == ["result"] * 3
+    assert len(calls) == 1
+    assert scheduler.coalesced == 2
+
+
+def test_scheduler_retries_transient_errors():
+    scheduler = RequestScheduler(rate=1000, capacity=10, backoff_base=0.001)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise TransientError("Call limit exceeded")
+        return "ok"
+
+    info = {}
+    assert scheduler.run("key", flaky, info=info) == "ok"
+    assert info["retries"] == 2
+
+
+def test_scheduler_gives_up_after_max_retries():
+    scheduler = RequestScheduler(rate=1000, capacity=10, max_retries=1, backoff_base=0.001)
+
+    def failing():
+        raise TransientError("503")
+
+    with pytest.raises(TransientError):
+        scheduler.run("key", failing)
@@ -0,0 +1,124 @@
+import os
+import threading
+
+import pytest
+
+from cfcli.api.session import CFSession
+
+
+@pytest.fixture(autouse=True)
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    for name in ("CF_HANDLE", "CF_API_KEY", "CF_API_SECRET", "CFCLI_OFFLINE"):
+        monkeypatch.delenv(name, raising=False)
+
+
+@pytest.mark.parametrize("base", ["http://127.0.0.1:8000/mirror", "http://127.0.0.1:8000/mirror/"])
+def test_base_url_keeps_its_last_segment(monkeypatch, base):
+    monkeypatch.setenv("CFCLI_BASE_URL", base)
+    session = CFSession()
+    assert session.CF_BASE_URL == "http://127.0.0.1:8000/mirror/"
+    assert session.CF_API_BASE == "http://127.0.0.1:8000/mirror/api/"
+
+
+def test_default_base_url(monkeypatch):
+    monkeypatch.delenv("CFCLI_BASE_URL", raising=False)
+    assert CFSession().CF_API_BASE == "https://codeforces.com/api/"
+
+
+def test_offline_flag_and_environment(monkeypatch):
+    assert not CFSession().offline
+    assert CFSession(offline=True).offline
+    monkeypatch.setenv("CFCLI_OFFLINE", "1")
+    session = CFSession()
+    session.set_offline(False)
+    assert session.offline
+
+
+def test_offline_call_without_cache_fails():
+    with pytest.raises(Exception, match="Offline"):
+        CFSession(offline=True).call_api("contest.list")
+
+
+def test_revalidate_runs_on_a_daemon_thread(monkeypatch):
+    session = CFSession()
+    started, release = threading.Event(), threading.Event()
+    threads = []
+
+    def call_api(*args, **kwargs):
+        threads.append(threading.current_thread())
+        started.set()
+        release.wait(5)
+        return {"status": "OK", "result": []}
+
+    monkeypatch.setattr(session, "call_api", call_api)
+    session.revalidate("contest.list")
+    session.revalidate("contest.list")  # Already in flight
+    assert started.wait(5)
+    assert len(threads) == 1 and threads[0].daemon
+    release.set()
+    threads[0].join(5)
+    assert session._executor is None
+
+
+def test_finish_refreshes_waits_for_pending_refreshes(monkeypatch):
+    session = CFSession()
+    release = threading.Event()
+    monkeypatch.setattr(session, "call_api", lambda *args, **kwargs: release.wait(5) and {"status": "OK"})
+    session.revalidate("contest.list")
+    assert not session.finish_refreshes(timeout=0.05)
+    release.set()
+    assert session.finish_refreshes(timeout=5)
+
+
+def test_one_shot_run_refreshes_stale_data_before_exiting(tmp_path):
+    import importlib.util
+    import sqlite3
+    import subprocess
+    import sys
+    import time
+    from pathlib import Path
+
+    root = Path(__file__).resolve().parent.parent
+    spec = importlib.util.spec_from_file_location("mock_server", root / "benchmarks" / "mock_server.py")
+    mock_server = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mock_server)
+    server = mock_server.start_server()
+    env = dict(os.environ, CFCLI_BASE_URL=f"http://127.0.0.1:{server.server_address[1]}/",
+               CFCLI_SOCKET=str(tmp_path / "no-daemon.sock"), PYTHONPATH=str(root))
+
+    def run():
+        return subprocess.run([sys.executable, "-m", "cfcli", "--no-pager", "standings", "1990", "--count", "3"],
+                              env=env, capture_output=True, text=True, timeout=60)
+
+    def expires():
+        with sqlite3.connect(tmp_path / ".cfcli" / "cache" / "cache.db") as conn:
+            return conn.execute("SELECT expires FROM entries WHERE method = 'contest.standings'").fetchone()[0]
+
+    try:
+        assert run().returncode == 0
+        with sqlite3.connect(tmp_path / ".cfcli" / "cache" / "cache.db") as conn:
+            conn.execute("UPDATE entries SET created = created - 120, expires = ?", (time.time() - 60,))
+
+        result = run()
+        assert "Showing cached contest.standings data from 2m ago (refreshing the cache before exiting)" in result.stderr
+        assert expires() > time.time()
+        assert server.RequestHandlerClass.state.snapshot()["api_requests"] == 2
+    finally:
+        server.shutdown()
+
+
+def test_offline_option_does_not_leak_into_later_commands():
+    from click.testing import CliRunner
+    from cfcli.commands import cli as commands
+
+    commands._instances.clear()
+    runner = CliRunner()
+    try:
+        assert runner.invoke(commands.cli, ["--offline", "cache", "stats"]).exit_code == 0
+        assert commands.get_session().offline
+        assert runner.invoke(commands.cli, ["cache", "stats"]).exit_code == 0
+        assert not commands.get_session().offline
+        assert "CFCLI_OFFLINE" not in os.environ
+    finally:
+        commands._instances.clear()
@@ -0,0 +1,83 @@
+import pytest
+from colorama import Cursor
+from colorama.ansi import clear_line
+
+from cfcli.api.contest import ContestAPI
+from cfcli.commands.cli import format_standings_cell, redraw_lines, render_standings
+
+
+def row(rank, handle, points, results, team=None):
+    party = {"members": [{"handle": h} for h in handle.split(",")]}
+    if team:
+        party["teamName"] = team
+    return {"rank": rank, "party": party, "points": points, "penalty": 10 * rank,
+            "problemResults": [{"points": p, "rejectedAttemptCount": r} for p, r in results]}
+
+
+class StandingsSession:
+    offline = False
+
+    def __init__(self):
+        self.calls = []
+
+    def call_api(self, method, params=None, cache=True, **kwargs):
+        self.calls.append((method, dict(params), cache))
+        return {"status": "OK", "result": {
+            "contest": {"id": params["contestId"], "name": "Round 1", "type": "ICPC", "phase": "CODING"},
+            "problems": [{"index": "A"}, {"index": "B"}],
+            "rows": [row(1, "alice", 2, [(1, 0), (1, 2)]), row(2, "bob,carol", 1, [(0, 3), (1, 0)], team="bc")],
+        }}
+
+
+def test_get_standings_builds_compact_rows():
+    session = StandingsSession()
+    result = ContestAPI(session).get_standings(1900, start=51, count=50)["result"]
+
+    assert result["contest"].name == "Round 1" and result["problems"] == ["A", "B"]
+    first, second = result["rows"]
+    assert (first.rank, first.party, first.points, first.penalty) == (1, "alice", 2, 10)
+    assert first.results == ((1, 0), (1, 2))
+    assert second.party == "bc"
+    assert session.calls == [("contest.standings", {"contestId": 1900, "from": 51, "count": 50}, True)]
+
+
+def test_get_standings_filters_and_live_bypass_the_cache():
+    session = StandingsSession()
+    ContestAPI(session).get_standings(1900, handles=["alice", "bob"], unofficial=True, live=True)
+    _, params, cache = session.calls[0]
+    assert params["handles"] == "alice;bob" and params["showUnofficial"] == "true"
+    assert cache is False
+
+
+@pytest.mark.parametrize("points, rejected, scored, cell", [
+    (1, 0, False, "+"),
+    (1, 2, False, "+2"),
+    (0, 3, False, "-3"),
+    (0, 0, False, ""),
+    (500, 1, True, "500"),
+])
+def test_format_standings_cell(points, rejected, scored, cell):
+    assert format_standings_cell(points, rejected, scored) == cell
+
+
+def test_render_standings_lines():
+    standings = ContestAPI(StandingsSession()).get_standings(1)["result"]
+    header, lines = render_standings(standings)
+    assert "Round 1" in header[0]
+    assert lines[0].startswith("     1 alice") and "+2" in lines[0]
+    assert "-3" in lines[1]
+
+
+def test_redraw_rewrites_only_changed_lines(capsys):
+    redraw_lines(["a", "b", "c"], ["a", "B", "c"])
+    assert capsys.readouterr().out == f"{Cursor.UP(2)}\r{clear_line()}B{Cursor.DOWN(2)}\r"
+
+    redraw_lines(["a", "b"], ["a", "b"])
+    assert capsys.readouterr().out == ""
+
+
+def test_redraw_blanks_lines_when_rows_disappear(capsys):
+    redraw_lines(["a", "b", "c"], ["x"])
+    out = capsys.readouterr().out
+    assert out.startswith(Cursor.UP(3) + f"\r{clear_line()}x\n")
+    assert out.endswith(f"{clear_line()}\n" * 2 + Cursor.UP(2))
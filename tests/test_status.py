@@ -0,0 +1,74 @@
+import pytest
+
+from cfcli.api.contest import ContestAPI
+
+
+def submission(sid, handle="alice"):
+    return {"id": sid, "contestId": 1, "author": {"members": [{"handle": handle}]},
+            "problem": {"index": "A", "name": "Sum"}, "verdict": "OK"}
+
+
+class StatusSession:
+    """Serves contest.status newest first; arrivals are pushed in before a given page"""
+    offline = False
+
+    def __init__(self, ids, arrivals=None):
+        self.ids = sorted(ids, reverse=True)
+        self.arrivals = arrivals or {}
+        self.calls = []
+
+    def call_api(self, method, params=None, cache=True, **kwargs):
+        assert method == "contest.status" and cache is False
+        self.calls.append(dict(params))
+        for sid in self.arrivals.pop(len(self.calls), []):
+            self.ids.insert(0, sid)
+        start = params["from"] - 1
+        return {"status": "OK", "result": [submission(sid) for sid in self.ids[start:start + params["count"]]]}
+
+
+def collect(pages):
+    return [s["id"] for page in pages for s in page]
+
+
+def test_pages_hold_one_request_each():
+    session = StatusSession(range(1, 8))
+    pages = list(ContestAPI(session).iter_contest_status(1, page_size=3, raw=True))
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert collect(pages) == [7, 6, 5, 4, 3, 2, 1]
+    assert [call["from"] for call in session.calls] == [1, 4, 7]
+
+
+def test_rows_shifted_by_new_submissions_are_not_repeated():
+    # Two new submissions arrive before the second page is fetched
+    session = StatusSession(range(1, 8), arrivals={2: [8, 9]})
+    ids = collect(ContestAPI(session).iter_contest_status(1, page_size=3, raw=True))
+    assert ids == [7, 6, 5, 4, 3, 2, 1]
+
+
+def test_since_stops_at_the_first_old_submission():
+    session = StatusSession(range(1, 11))
+    ids = collect(ContestAPI(session).iter_contest_status(1, page_size=3, since=5, raw=True))
+    assert ids == [10, 9, 8, 7, 6]
+    assert len(session.calls) == 2
+
+
+def test_resume_skips_submissions_not_older_than_before():
+    session = StatusSession(range(1, 11), arrivals={1: [11]})
+    ids = collect(ContestAPI(session).iter_contest_status(1, page_size=3, start=4, before=8, raw=True))
+    assert ids == [7, 6, 5, 4, 3, 2, 1]
+
+
+def test_pages_are_submission_batches_and_handle_is_forwarded():
+    session = StatusSession(range(1, 3))
+    batch = next(ContestAPI(session).iter_contest_status(1, handle="alice"))
+    assert len(batch) == 2 and batch[0].id == 2
+    assert session.calls[0]["handle"] == "alice"
+
+
+def test_failed_page_raises():
+    class Failing:
+        def call_api(self, *args, **kwargs):
+            return {"status": "FAILED", "comment": "contestId: Contest with id 1 not found"}
+
+    with pytest.raises(Exception, match="not found"):
+        list(ContestAPI(Failing()).iter_contest_status(1))
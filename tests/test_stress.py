@@ -0,0 +1,124 @@
+import sys
+
+import pytest
+
+from cfcli.utils.stress import shrink_input, stress_test
+
+GENERATOR = """
+import random, sys
+rng = random.Random(int(sys.argv[1]))
+values = [rng.randint(1, 200) for _ in range(20)]
+print(len(values))
+print(*values)
+"""
+
+# Largest value, except that it breaks once a value reaches 90
+SOLUTION = """
+import sys
+values = list(map(int, sys.stdin.read().split()))
+print(-1 if max(values) >= 90 else max(values))
+"""
+
+BRUTE = """
+import sys
+print(max(map(int, sys.stdin.read().split())))
+"""
+
+
+def test_shrink_drops_lines_and_tokens():
+    data = b"5\n1 2 3 4 5\n6 7 8\n"
+    # Fails while some token is 7
+    shrunk = shrink_input(data, lambda candidate: b"7" in candidate.split())
+    assert shrunk == b"7\n"
+
+
+def test_shrink_halves_integers():
+    shrunk = shrink_input(b"3\n1000 5 2\n", lambda candidate: any(int(t) >= 100 for t in candidate.split()))
+    assert shrunk.split() == [b"125"]
+
+
+def test_shrink_keeps_input_that_does_not_reproduce():
+    data = b"1 2\n"
+    assert shrink_input(data, lambda candidate: False) == data
+
+
+def test_shrink_respects_check_budget():
+    calls = []
+
+    def fails(candidate):
+        calls.append(candidate)
+        return True
+
+    shrink_input(b"\n".join(b"%d" % n for n in range(100)) + b"\n", fails, max_checks=5)
+    assert len(calls) == 5
+
+
+@pytest.fixture
+def programs(tmp_path):
+    commands = []
+    for name, source in (("gen.py", GENERATOR), ("sol.py", SOLUTION), ("brute.py", BRUTE)):
+        path = tmp_path / name
+        path.write_text(source)
+        commands.append([sys.executable, str(path)])
+    return commands
+
+
+def test_stress_finds_and_shrinks_failure(programs):
+    generator, solution, brute = programs
+    result = stress_test(generator, solution, brute, iterations=10, jobs=2, shrink=True)
+    failure = result["failure"]
+    assert failure["verdict"] == "WRONG_ANSWER"
+    assert len(failure["input"].split()) == 21
+    shrunk = failure["shrunk"]
+    assert shrunk["verdict"] == "WRONG_ANSWER"
+    value = int(shrunk["input"])
+    assert 90 <= value < 180
+    assert shrunk["expected"].strip() == str(value).encode()
+    assert shrunk["actual"].strip() == b"-1"
+
+
+def test_stress_does_not_shrink_by_default(programs):
+    generator, solution, brute = programs
+    failure = stress_test(generator, solution, brute, iterations=10, jobs=1)["failure"]
+    assert "shrunk" not in failure
+    assert len(failure["input"].split()) == 21
+
+
+# Rejects inputs whose first line does not give the number of values
+CHECKED_BRUTE = """
+import sys
+lines = sys.stdin.read().splitlines()
+values = lines[1].split()
+assert len(lines) == 2 and int(lines[0]) == len(values) > 0
+print(max(map(int, values)))
+"""
+
+
+def test_shrunk_input_keeps_the_brute_force_format(programs, tmp_path):
+    _, solution, _ = programs
+    generator, brute = tmp_path / "small_gen.py", tmp_path / "checked.py"
+    generator.write_text(GENERATOR.replace("range(20)", "range(4)"))
+    brute.write_text(CHECKED_BRUTE)
+    failure = stress_test([sys.executable, str(generator)], solution, [sys.executable, str(brute)],
+                          iterations=10, jobs=1, shrink=True)["failure"]
+
+    shrunk = failure["shrunk"]
+    assert len(shrunk["input"]) < len(failure["input"])
+    count, values = shrunk["input"].decode().splitlines()
+    assert int(count) == len(values.split())
+    assert max(map(int, values.split())) >= 90
+
+
+def test_stress_command_saves_the_original_and_shrunk_inputs(programs, tmp_path):
+    from click.testing import CliRunner
+    from cfcli.commands import cli as commands
+
+    names = [command[1] for command in programs]
+    result = CliRunner().invoke(commands.cli, ["stress", names[1], names[2], names[0],
+                                               "--iterations", "10", "--jobs", "1", "--shrink"])
+    assert result.exit_code == 0, result.output
+    original = (tmp_path / "sol_fail.in").read_bytes()
+    shrunk = (tmp_path / "sol_fail.min.in").read_bytes()
+    assert len(original.split()) == 21
+    assert len(shrunk) < len(original) and int(shrunk) >= 90
+    assert "sol_fail.min.in" in result.output
@@ -0,0 +1,111 @@
+import json
+import os
+import stat
+from types import SimpleNamespace
+
+import pytest
+from requests.cookies import RequestsCookieJar
+
+from cfcli.api.session import CFSession
+from cfcli.api.submission import SubmissionAPI
+
+LOGIN_PAGE = '<meta name="X-Csrf-Token" content="login-token"/>'
+LOGGED_IN_PAGE = '<meta name="X-Csrf-Token" content="fresh-token"/><a href="/logout">Logout</a>'
+
+
+@pytest.fixture(autouse=True)
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("CFCLI_BASE_URL", "https://cf.test/")
+    monkeypatch.setenv("CF_HANDLE", "alice")
+    monkeypatch.setenv("CF_PASSWORD", "secret")
+
+
+class FakeSite:
+    """Stands in for requests.Session; only the 'valid' cookie passes the submit form"""
+
+    def __init__(self):
+        self.cookies = RequestsCookieJar()
+        self.requests = []
+
+    def response(self, url, text="", status_code=200):
+        return SimpleNamespace(url=url, text=text, status_code=status_code)
+
+    def get(self, url, **kwargs):
+        self.requests.append(("GET", url))
+        return self.response(url, LOGIN_PAGE)
+
+    def post(self, url, data=None, **kwargs):
+        self.requests.append(("POST", url))
+        if url.endswith("/enter"):
+            self.cookies.set("JSESSIONID", "valid", domain="cf.test")
+            return self.response("https://cf.test/", LOGGED_IN_PAGE)
+        if self.cookies.get("JSESSIONID") != "valid":
+            return self.response("https://cf.test/enter?back=submit")
+        return self.response("https://cf.test/contest/1/my", 'submissionId="4242"')
+
+
+def make_session(site):
+    session = CFSession()
+    session._session = site
+    return session
+
+
+def saved_state(session):
+    with open(session.WEB_SESSION_FILE) as f:
+        return json.load(f)
+
+
+def test_login_is_saved_and_reused():
+    site = FakeSite()
+    session = make_session(site)
+    assert SubmissionAPI(session).submit_solution(1, "A", "int main() {}") == {
+        "status": "OK", "result": {"submission_id": "4242"}}
+    assert stat.S_IMODE(os.stat(session.WEB_SESSION_FILE).st_mode) == 0o600
+    assert saved_state(session)["csrf_token"] == "fresh-token"
+
+    # The next run restores the cookies and submits without logging in
+    restored = CFSession()
+    assert restored.logged_in and restored.csrf_token == "fresh-token"
+    assert restored.session.cookies.get("JSESSIONID") == "valid"
+    site = FakeSite()
+    site.cookies = restored.session.cookies
+    restored._session = site
+    assert SubmissionAPI(restored).submit_solution(1, "A", "int main() {}")["status"] == "OK"
+    assert site.requests == [("POST", "https://cf.test/contest/1/submit")]
+
+
+def test_session_of_another_handle_is_ignored(monkeypatch):
+    session = make_session(FakeSite())
+    assert session.web_login()
+    monkeypatch.setenv("CF_HANDLE", "bob")
+    other = CFSession()
+    assert not other.logged_in and other.csrf_token is None
+
+
+def test_rejected_session_logs_in_again_once():
+    site = FakeSite()
+    site.cookies.set("JSESSIONID", "expired", domain="cf.test")
+    session = make_session(site)
+    session.logged_in, session.csrf_token = True, "old-token"
+
+    result = SubmissionAPI(session).submit_solution(1, "A", "int main() {}")
+    assert result["status"] == "OK"
+    assert site.requests == [
+        ("POST", "https://cf.test/contest/1/submit"),
+        ("GET", "https://cf.test/enter"),
+        ("POST", "https://cf.test/enter"),
+        ("POST", "https://cf.test/contest/1/submit"),
+    ]
+    assert saved_state(session)["cookies"][0]["value"] == "valid"
+
+
+def test_second_rejection_gives_up(monkeypatch):
+    site = FakeSite()
+    monkeypatch.setattr(site, "post", lambda url, data=None, **kwargs: site.response(
+        "https://cf.test/" if url.endswith("/enter") else "https://cf.test/enter", LOGGED_IN_PAGE))
+    session = make_session(site)
+
+    result = SubmissionAPI(session).submit_solution(1, "A", "int main() {}")
+    assert result == {"status": "FAILED", "comment": "Codeforces rejected the web session"}
+    assert not session.logged_in and not session.WEB_SESSION_FILE.exists()
@@ -0,0 +1,124 @@
+import os
+
+import pytest
+from colorama import Fore, Style
+
+from cfcli.commands import table as table_module
+from cfcli.commands.table import Column, Table
+
+
+def make_table(rows=(), **kwargs):
+    return Table([
+        Column("ID", lambda r: r["id"]),
+        Column("Name", lambda r: r.get("name"), max_width=8),
+        Column("Score", lambda r: r.get("score"), fmt=lambda v: f"{v:.1f}", align=">"),
+        Column("Verdict", lambda r: r["verdict"], color=lambda v: Fore.GREEN if v == "OK" else Fore.RED),
+    ], rows, **kwargs)
+
+
+ROWS = [
+    {"id": 1, "name": "alice", "score": 12.5, "verdict": "OK"},
+    {"id": 22, "name": "a_very_long_name", "score": None, "verdict": "WRONG_ANSWER"},
+    {"id": 333, "score": 7.0, "verdict": "OK"},
+]
+
+
+def test_render_aligns_columns():
+    text = "".join(make_table(ROWS).render())
+    assert text.splitlines() == [
+        "ID  Name     Score Verdict",
+        "--------------------------",
+        "1   alice     12.5 OK",
+        "22  a_ver...     - WRONG_ANSWER",
+        "333 -          7.0 OK",
+    ]
+
+
+def test_render_title_footer_and_color():
+    text = "".join(make_table(ROWS[:1], title="Results", footer="1 row").render(color=True))
+    lines = text.splitlines()
+    assert lines[0] == ""
+    assert lines[1] == f"{Fore.CYAN}== Results =={Style.RESET_ALL}"
+    assert lines[4] == f"1  alice  12.5 {Fore.GREEN}OK{Style.RESET_ALL}"
+    assert lines[5] == f"{Fore.CYAN}1 row{Style.RESET_ALL}"
+    assert "\x1b" not in "".join(make_table(ROWS[:1], title="Results").render(color=False))
+
+
+def test_render_chunks_long_tables(monkeypatch):
+    monkeypatch.setattr(table_module, "CHUNK_ROWS", 2)
+    rows = [{"id": i, "verdict": "OK"} for i in range(5)]
+    chunks = list(make_table(rows).render())
+    assert [chunk.count("\n") for chunk in chunks] == [2, 2, 2, 1]
+
+
+def test_empty_table_renders_header_only():
+    assert "".join(make_table().render()).splitlines() == ["ID Name Score Verdict", "-" * 21]
+
+
+def test_sort_puts_missing_values_last_and_filter():
+    table = make_table(ROWS).sort("score", reverse=True)
+    assert [r["id"] for r in table.rows] == [1, 333, 22]
+    table.filter(lambda r: r["verdict"] == "OK")
+    assert [r["id"] for r in table.rows] == [1, 333]
+    assert [r["id"] for r in make_table(ROWS).sort("Name").rows] == [22, 1, 333]
+
+
+def test_stream_sizes_columns_from_first_page():
+    table = make_table()
+    table.column("Name").min_width = 6
+    pages = [ROWS[:1], [], [{"id": 4444, "name": "bob", "score": 1.0, "verdict": "OK"}]]
+    assert "".join(table.stream(pages)).splitlines() == [
+        "ID Name   Score Verdict",
+        "-----------------------",
+        "1  alice   12.5 OK",
+        "4444 bob      1.0 OK",
+    ]
+    assert table.streamed == 2
+
+
+def test_stream_applies_filters_and_holds_one_page():
+    table = make_table().filter(lambda r: r["verdict"] == "OK")
+    fetched = []
+
+    def pages():
+        for row in ROWS:
+            fetched.append(row["id"])
+            yield [row]
+
+    chunks = table.stream(pages())
+    assert next(chunks).startswith("ID")
+    assert fetched == [1]
+    assert [line.split()[0] for line in "".join(chunks).splitlines()] == ["1", "333"]
+    assert table.streamed == 2
+
+
+def test_stream_without_rows_yields_nothing():
+    table = make_table(footer="done").filter(lambda r: False)
+    assert list(table.stream([ROWS])) == []
+    assert table.streamed == 0
+
+
+def test_show_pages_writes_when_not_interactive(capsys):
+    table = make_table()
+    assert table.show_pages([ROWS[:2], ROWS[2:]]) == 3
+    out = capsys.readouterr().out
+    assert out.splitlines()[0].startswith("ID")
+    assert len(out.splitlines()) == 5
+
+
+
+@pytest.mark.skipif(os.name == "nt", reason="colorama wraps stdout on Windows")
+def test_cli_leaves_stdout_unwrapped_outside_windows(monkeypatch, tmp_path):
+    import colorama
+    from click.testing import CliRunner
+    from cfcli.commands import cli as commands
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    calls = []
+    monkeypatch.setattr(colorama, "init", lambda *args, **kwargs: calls.append(args))
+    commands._instances.clear()
+    try:
+        assert CliRunner().invoke(commands.cli, ["cache", "stats"]).exit_code == 0
+        assert calls == []
+    finally:
+        commands._instances.clear()
@@ -0,0 +1,110 @@
+import pytest
+
+from cfcli.api import user as user_module
+from cfcli.api.user import UserAPI, chunk_handles
+from cfcli.utils.cache import ResponseCache, make_cache_key
+
+
+def test_chunk_handles_respects_count_limit():
+    assert chunk_handles(["a", "b", "c", "d", "e"], max_handles=2) == [["a", "b"], ["c", "d"], ["e"]]
+
+
+def test_chunk_handles_respects_length_limit():
+    handles = ["aaaa", "bbbb", "cccc"]
+    # Each handle takes its length plus a separator
+    assert chunk_handles(handles, max_chars=10) == [["aaaa", "bbbb"], ["cccc"]]
+    assert chunk_handles(handles, max_chars=9) == [["aaaa"], ["bbbb"], ["cccc"]]
+
+
+def test_chunk_handles_edge_cases():
+    assert chunk_handles([]) == []
+    # A handle longer than the limit still gets a batch of its own
+    assert chunk_handles(["x" * 20, "y"], max_chars=5) == [["x" * 20], ["y"]]
+    handles = [f"user{i}" for i in range(25000)]
+    batches = chunk_handles(handles)
+    assert sum(batches, []) == handles
+    assert all(len(";".join(batch)) < user_module.USER_INFO_MAX_CHARS for batch in batches)
+
+
+class FakeSession:
+    offline = False
+
+    def __init__(self, tmp_path, known, broken=()):
+        self.cache = ResponseCache(tmp_path)
+        self.known = known
+        self.broken = set(broken)
+        self.stale_served = {}
+        self.batches = []
+        self.histories = []
+
+    def mark_stale(self, method, age):
+        self.stale_served[method] = age
+
+    def call_many(self, calls, **kwargs):
+        responses = []
+        for method, params in calls:
+            if method == "user.rating":
+                self.histories.append(params["handle"])
+                responses.append({"status": "OK", "result": [
+                    {"ratingUpdateTimeSeconds": 1000, "oldRating": 1450, "newRating": 1500}]})
+                continue
+            handles = params["handles"].split(";")
+            self.batches.append(handles)
+            unknown = [h for h in handles if h not in self.known]
+            if self.broken.intersection(handles):
+                responses.append({"status": "FAILED", "comment": "Call limit exceeded"})
+            elif unknown:
+                responses.append({"status": "FAILED", "comment": f"handles: User with handle {unknown[0]} not found"})
+            else:
+                responses.append({"status": "OK", "result": [{"handle": h, "rating": 1500} for h in handles]})
+        return responses
+
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    monkeypatch.setattr(user_module, "chunk_handles", lambda handles: [handles[i:i + 2] for i in range(0, len(handles), 2)])
+
+
+def test_get_users_drops_unknown_handles_and_retries(tmp_path):
+    session = FakeSession(tmp_path, known={"a", "b", "c"})
+    result = UserAPI(session).get_users(["a", "ghost", "b", "c"], history=False)["result"]
+    assert [u["handle"] for u in result["users"]] == ["a", "b", "c"]
+    assert result["missing"] == ["ghost"] and result["failed"] == []
+    assert session.batches == [["a", "ghost"], ["b", "c"], ["a"]]
+
+
+def test_get_users_reports_failed_batches(tmp_path):
+    session = FakeSession(tmp_path, known={"a", "b", "c", "d"}, broken={"c"})
+    result = UserAPI(session).get_users(["a", "b", "c", "d"], history=False)
+    assert result["status"] == "OK"
+    info = result["result"]
+    assert [u["handle"] for u in info["users"]] == ["a", "b"]
+    assert info["failed"] == ["c", "d"]
+    assert info["error"] == "Call limit exceeded"
+
+
+def test_get_users_uses_expired_copies_for_failed_batches(tmp_path):
+    session = FakeSession(tmp_path, known={"a", "b"}, broken={"b"})
+    session.cache.put(make_cache_key("user.info", {"handles": "b"}), "user.info",
+                      {"status": "OK", "result": [{"handle": "b", "rating": 1200}]}, ttl=-1)
+    info = UserAPI(session).get_users(["a", "b"], history=False)["result"]
+    # Both handles shared the failed batch; only b had a copy to fall back to
+    assert [(u["handle"], u["rating"]) for u in info["users"]] == [("b", 1200)]
+    assert info["failed"] == ["a"]
+    assert "user.info" in session.stale_served
+
+
+def test_get_users_fails_when_nothing_could_be_fetched(tmp_path):
+    session = FakeSession(tmp_path, known={"a"}, broken={"a"})
+    assert UserAPI(session).get_users(["a"], history=False) == {"status": "FAILED", "comment": "Call limit exceeded"}
+
+
+def test_get_users_fetches_histories_only_when_asked(tmp_path):
+    session = FakeSession(tmp_path, known={"a", "b", "c"})
+    info = UserAPI(session).get_users(["a", "b", "c"])["result"]
+    assert session.histories == [] and info["requests"] == 2
+    assert all(u["contests"] is None for u in info["users"])
+
+    info = UserAPI(session).get_users(["a", "b", "c"], history=True)["result"]
+    assert session.histories == ["a", "b", "c"] and info["requests"] == 3
+    assert [(u["contests"], u["lastDelta"]) for u in info["users"]] == [(1, 50)] * 3
@@ -0,0 +1,78 @@
+import pytest
+
+from cfcli.api import submission as submission_module
+from cfcli.api.submission import SubmissionAPI, WATCH_MAX_INTERVAL, WATCH_MIN_INTERVAL
+
+
+def sub(sid, verdict="TESTING", passed=0):
+    return {"id": sid, "verdict": verdict, "passedTestCount": passed}
+
+
+class PollingSession:
+    """Answers each poll with the next prepared list of recent submissions"""
+    offline = False
+
+    def __init__(self, polls):
+        self.polls = list(polls)
+        self.calls = []
+
+    def call_api(self, method, params=None, cache=True, **kwargs):
+        self.calls.append((method, dict(params), cache))
+        return {"status": "OK", "result": self.polls.pop(0)}
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(submission_module.time, "sleep", slept.append)
+    return slept
+
+
+def test_watch_backs_off_while_nothing_changes(sleeps):
+    polls = [[sub(1)]] * 4 + [[sub(1, passed=3)], [sub(1, passed=3)], [sub(1, "OK", 5)]]
+    session = PollingSession(polls)
+    frames = list(SubmissionAPI(session).watch_submissions("alice"))
+
+    assert len(frames) == 7 and frames[-1] == [sub(1, "OK", 5)]
+    assert sleeps == [WATCH_MIN_INTERVAL, WATCH_MIN_INTERVAL * 1.5, WATCH_MIN_INTERVAL * 2.25,
+                      WATCH_MIN_INTERVAL * 3.375, WATCH_MIN_INTERVAL, WATCH_MIN_INTERVAL * 1.5]
+    assert all(method == "user.status" and not cache for method, _, cache in session.calls)
+
+
+def test_watch_backoff_is_capped(sleeps):
+    session = PollingSession([[sub(1)]] * 12 + [[sub(1, "OK")]])
+    list(SubmissionAPI(session).watch_submissions("alice"))
+    assert max(sleeps) == WATCH_MAX_INTERVAL
+
+
+def test_watch_tracks_pending_submissions_until_all_are_final(sleeps):
+    polls = [
+        [sub(3), sub(2), sub(1, "OK")],
+        [sub(4), sub(3, "OK"), sub(2), sub(1, "OK")],
+        [sub(4), sub(3, "OK"), sub(2, "WRONG_ANSWER"), sub(1, "OK")],
+    ]
+    frames = list(SubmissionAPI(PollingSession(polls)).watch_submissions("alice"))
+    # Submission 4 arrived after the first poll and is not tracked
+    assert [[s["id"] for s in frame] for frame in frames] == [[3, 2], [3, 2], [3, 2]]
+
+
+def test_watch_stops_when_the_id_is_not_recent(sleeps):
+    session = PollingSession([[sub(5), sub(4)]])
+    frames = list(SubmissionAPI(session).watch_submissions("alice", contest_id=1900, submission_ids=[1]))
+    assert frames == [[]]
+    assert session.calls[0][0] == "contest.status" and session.calls[0][1]["contestId"] == 1900
+    assert sleeps == []
+
+
+def test_watch_stops_immediately_without_pending_submissions(sleeps):
+    frames = list(SubmissionAPI(PollingSession([[sub(1, "OK")]])).watch_submissions("alice"))
+    assert frames == [[]]
+
+
+def test_status_rejects_a_non_numeric_id():
+    from click.testing import CliRunner
+    from cfcli.commands import cli as commands
+
+    result = CliRunner().invoke(commands.cli, ["status", "12x", "--watch", "--handle", "alice"])
+    assert result.exit_code == 2
+    assert "'12x' is not a valid integer" in result.output